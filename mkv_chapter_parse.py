@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
-"""Read Matroska/WebM embedded chapters from bytes or Kodi VFS (NFS-safe header scan)."""
+"""Read Matroska/WebM embedded chapters from bytes or Kodi VFS (NFS-safe header scan).
+
+The EBML walker works on ``memoryview`` slices: element payloads are views into
+the one read buffer, so nested atoms never copy their bytes. Only leaf values
+(chapter strings, integers) are materialized.
+"""
 
 from __future__ import annotations
 
@@ -23,8 +28,20 @@ _ID_STRING = 0x85
 _ID_FLAG_HIDDEN = 0x98
 
 _UNKNOWN_SIZE = object()
+_NOT_CACHED = object()
 _MAX_HEADER_BYTES = 8 * 1024 * 1024
 _MAX_CHAPTERS_BYTES = 512 * 1024
+# First read: EBML header, Segment header and (usually) the SeekHead.
+_HEAD_PROBE_BYTES = 64 * 1024
+# Longest element header: 4-byte ID + 8-byte size.
+_ELEMENT_HEADER_BYTES = 12
+_MAX_TOP_LEVEL_ELEMENTS = 256
+
+# Resolved Chapters offsets per file (profile JSON, keyed by path; size+mtime checked).
+_OFFSET_CACHE_FILENAME = "mkv_chapter_offsets.json"
+_OFFSET_CACHE_SCHEMA = "skippy_mkv_chapter_offsets_v1"
+_OFFSET_CACHE_MAX_ENTRIES = 500
+_offset_cache = None
 
 
 def _vint_len(first: int) -> int:
@@ -38,27 +55,29 @@ def _vint_len(first: int) -> int:
     return length if length <= 8 else 0
 
 
-def _read_vint(buf: bytes, offset: int, keep_descriptor: bool):
+def _as_view(buf) -> memoryview:
+    """Zero-copy view over ``bytes`` / ``bytearray`` / ``memoryview``."""
+    return buf if isinstance(buf, memoryview) else memoryview(buf)
+
+
+def _read_vint(buf: memoryview, offset: int, keep_descriptor: bool):
     if offset >= len(buf):
         return None, offset
     length = _vint_len(buf[offset])
     if length < 1 or offset + length > len(buf):
         return None, offset
-    raw = buf[offset : offset + length]
-    value = int.from_bytes(raw, "big")
+    value = int.from_bytes(buf[offset : offset + length], "big")
     if not keep_descriptor:
-        length_bit = 0x80 >> (length - 1)
-        data_bits = length_bit - 1
-        unknown = ((raw[0] & data_bits) == data_bits) and all(
-            b == 0xFF for b in raw[1:]
-        )
-        if unknown:
+        data_mask = (1 << (7 * length)) - 1
+        value &= data_mask
+        # All data bits set marks an unknown-size element.
+        if value == data_mask:
             return _UNKNOWN_SIZE, offset + length
-        value &= (1 << (7 * length)) - 1
     return value, offset + length
 
 
-def _read_element(buf: bytes, offset: int):
+def _read_element(buf: memoryview, offset: int):
+    """``(id, size, payload_view, next_offset)``; the payload is a view, not a copy."""
     elem_id, mid = _read_vint(buf, offset, True)
     if elem_id is None:
         return None, None, None, offset
@@ -73,7 +92,7 @@ def _read_element(buf: bytes, offset: int):
     return elem_id, int(size), buf[end:payload_end], payload_end
 
 
-def _uint_from_bytes(payload: bytes) -> int:
+def _uint_from_bytes(payload: memoryview) -> int:
     if not payload:
         return 0
     return int.from_bytes(payload, "big")
@@ -83,7 +102,7 @@ def _ns_to_seconds(ns: int) -> float:
     return float(ns) / 1e9
 
 
-def _walk_atoms(payload: bytes, out: list) -> None:
+def _walk_atoms(payload: memoryview, out: list) -> None:
     offset = 0
     while offset < len(payload):
         elem_id, _size, data, nxt = _read_element(payload, offset)
@@ -96,7 +115,7 @@ def _walk_atoms(payload: bytes, out: list) -> None:
             _walk_atoms(data, out)
 
 
-def _parse_atom(payload: bytes, out: list) -> None:
+def _parse_atom(payload: memoryview, out: list) -> None:
     start_ns = None
     end_ns = None
     label = ""
@@ -122,7 +141,7 @@ def _parse_atom(payload: bytes, out: list) -> None:
                 d_off = dnxt
                 if did == _ID_STRING and not label:
                     try:
-                        label = dpay.decode("utf-8", errors="replace").strip()
+                        label = str(dpay, "utf-8", errors="replace").strip()
                     except Exception:
                         label = ""
         elif elem_id == _ID_ATOM:
@@ -138,15 +157,16 @@ def _parse_atom(payload: bytes, out: list) -> None:
     )
 
 
-def _parse_chapters_payload(payload: bytes) -> list:
+def _parse_chapters_payload(payload) -> list:
     rows = []
-    _walk_atoms(payload, rows)
+    _walk_atoms(_as_view(payload), rows)
     rows.sort(key=lambda item: item["start"])
     return rows
 
 
-def _seekhead_chapter_offset(payload: bytes) -> Optional[int]:
+def _seekhead_chapter_offset(payload) -> Optional[int]:
     """Return Segment-relative offset of Chapters from SeekHead, if listed."""
+    payload = _as_view(payload)
     offset = 0
     while offset < len(payload):
         elem_id, _size, data, nxt = _read_element(payload, offset)
@@ -172,10 +192,11 @@ def _seekhead_chapter_offset(payload: bytes) -> Optional[int]:
     return None
 
 
-def parse_matroska_chapters_from_bytes(buf: bytes) -> list:
+def parse_matroska_chapters_from_bytes(buf) -> list:
     """Return chapter dicts ``{name, start, end}`` from a Matroska header buffer."""
     if not buf:
         return []
+    buf = _as_view(buf)
     offset = 0
     segment_data_start = None
     while offset < len(buf):
@@ -201,7 +222,7 @@ def parse_matroska_chapters_from_bytes(buf: bytes) -> list:
     return []
 
 
-def _parse_segment(segment: bytes, whole: bytes, segment_data_start: int) -> list:
+def _parse_segment(segment: memoryview, whole: memoryview, segment_data_start: int) -> list:
     offset = 0
     seek_chapter_rel = None
     while offset < len(segment):
@@ -226,8 +247,189 @@ def _parse_segment(segment: bytes, whole: bytes, segment_data_start: int) -> lis
     return _parse_chapters_payload(payload)
 
 
+def _file_identity(xbmcvfs, video_path):
+    """``(size, mtime)`` for offset-cache validation, or None when Stat fails."""
+    try:
+        stat_obj = xbmcvfs.Stat(video_path)
+        size = stat_obj.st_size()
+        mtime = stat_obj.st_mtime()
+    except Exception:
+        return None
+    if not size:
+        return None
+    return [int(size), int(mtime or 0)]
+
+
+def _load_offset_cache() -> dict:
+    global _offset_cache
+    if _offset_cache is None:
+        entries = {}
+        try:
+            from skippy_profile_store import profile_path, read_json
+
+            data = read_json(profile_path(_OFFSET_CACHE_FILENAME), default=None)
+            if isinstance(data, dict) and isinstance(data.get("entries"), dict):
+                entries = data["entries"]
+        except Exception:
+            entries = {}
+        _offset_cache = entries
+    return _offset_cache
+
+
+def _cached_chapters_offset(video_path, identity):
+    """Remembered Chapters offset (int), None for "no chapters", or ``_NOT_CACHED``."""
+    if identity is None:
+        return _NOT_CACHED
+    entry = _load_offset_cache().get(video_path)
+    if not isinstance(entry, dict) or entry.get("id") != identity:
+        return _NOT_CACHED
+    offset = entry.get("offset")
+    return int(offset) if offset is not None else None
+
+
+def _remember_chapters_offset(video_path, identity, offset) -> None:
+    if identity is None:
+        return
+    entries = _load_offset_cache()
+    entry = {"id": identity, "offset": offset}
+    if entries.get(video_path) == entry:
+        return
+    entries.pop(video_path, None)
+    entries[video_path] = entry
+    while len(entries) > _OFFSET_CACHE_MAX_ENTRIES:
+        entries.pop(next(iter(entries)))
+    try:
+        from skippy_profile_store import profile_path, write_json
+
+        write_json(
+            profile_path(_OFFSET_CACHE_FILENAME),
+            {"schema": _OFFSET_CACHE_SCHEMA, "entries": entries},
+        )
+    except Exception:
+        pass
+
+
+def clear_chapters_offset_cache() -> None:
+    global _offset_cache
+    _offset_cache = None
+
+
+class _RangeReader:
+    """Positional reads on an ``xbmcvfs.File``; served from the head buffer when it covers them."""
+
+    def __init__(self, handle, head=b""):
+        self._handle = handle
+        self.head = _as_view(head)
+        self.bytes_read = len(head)
+
+    def read_at(self, offset: int, nbytes: int) -> memoryview:
+        end = offset + nbytes
+        if end <= len(self.head):
+            return self.head[offset:end]
+        self._handle.seek(offset, 0)
+        data = _vfs_read(self._handle, nbytes)
+        self.bytes_read += len(data)
+        return _as_view(data)
+
+
+def _element_header_at(reader: _RangeReader, offset: int):
+    """``(id, size or None, header_len)`` of the element at ``offset``, or None."""
+    raw = reader.read_at(offset, _ELEMENT_HEADER_BYTES)
+    elem_id, mid = _read_vint(raw, 0, True)
+    if elem_id is None:
+        return None
+    size, end = _read_vint(raw, mid, False)
+    if size is None:
+        return None
+    return elem_id, (None if size is _UNKNOWN_SIZE else int(size)), end
+
+
+def _locate_chapters_offset(reader: _RangeReader):
+    """
+    Walk EBML header and top-level Segment children by element headers only.
+
+    Returns ``(absolute Chapters offset or None, definitive)``. ``definitive`` is
+    False when the layout could not be walked (caller falls back to a bounded read).
+    """
+    hdr = _element_header_at(reader, 0)
+    if hdr is None or hdr[0] != _ID_EBML or hdr[1] is None:
+        return None, False
+    offset = hdr[2] + hdr[1]
+    hdr = _element_header_at(reader, offset)
+    if hdr is None or hdr[0] != _ID_SEGMENT:
+        return None, False
+    seg_start = offset + hdr[2]
+    seg_end = seg_start + hdr[1] if hdr[1] is not None else None
+    offset = seg_start
+    for _ in range(_MAX_TOP_LEVEL_ELEMENTS):
+        if seg_end is not None and offset >= seg_end:
+            return None, True
+        hdr = _element_header_at(reader, offset)
+        if hdr is None:
+            return None, False
+        elem_id, size, header_len = hdr
+        if elem_id == _ID_CHAPTERS:
+            return offset, True
+        if elem_id == _ID_CLUSTER:
+            return None, True
+        if elem_id == _ID_SEEKHEAD and size is not None:
+            rel = _seekhead_chapter_offset(reader.read_at(offset + header_len, size))
+            if rel is not None:
+                return seg_start + rel, True
+        if size is None:
+            return None, False
+        offset += header_len + size
+    return None, False
+
+
+def _read_chapters_at(reader: _RangeReader, abs_off: int):
+    """Chapter rows from the Chapters element at ``abs_off``; None when it is not there."""
+    hdr = _element_header_at(reader, abs_off)
+    if hdr is None:
+        return None
+    elem_id, size, header_len = hdr
+    if elem_id != _ID_CHAPTERS or size is None or size > _MAX_CHAPTERS_BYTES:
+        return None
+    payload = reader.read_at(abs_off + header_len, size)
+    if len(payload) < size:
+        return None
+    return _parse_chapters_payload(payload)
+
+
+def _parse_bounded_head(handle, max_bytes: int) -> list:
+    """Legacy path: read up to ``max_bytes`` from the start and scan for Chapters."""
+    chunk = _vfs_read(handle, max_bytes)
+    if not chunk:
+        return []
+    chunk = _as_view(chunk)
+    rows = parse_matroska_chapters_from_bytes(chunk)
+    if rows:
+        return rows
+    # SeekHead may point past the first chunk; retry a targeted read.
+    seek_rel, seg_start = _chapters_seek_location(chunk)
+    if seek_rel is None:
+        return []
+    abs_off = seg_start + seek_rel
+    if hasattr(handle, "seek"):
+        handle.seek(abs_off, 0)
+        extra = _vfs_read(handle, _MAX_CHAPTERS_BYTES)
+        if extra:
+            extra = _as_view(extra)
+            eid, _sz, payload, _n = _read_element(extra, 0)
+            if eid == _ID_CHAPTERS and payload is not None:
+                return _parse_chapters_payload(payload)
+            return parse_matroska_chapters_from_bytes(extra)
+    return []
+
+
 def parse_matroska_chapters_via_vfs(video_path: str, max_bytes: int = _MAX_HEADER_BYTES) -> list:
-    """Read the start of a Matroska file through xbmcvfs and parse chapter atoms."""
+    """Read Matroska chapter atoms through xbmcvfs with targeted range reads.
+
+    Reads the EBML header and SeekHead first (a few KiB), then seeks straight to
+    Chapters. The resolved offset (or "no chapters") is remembered per file, keyed
+    by size and mtime, in the add-on profile. Only layouts the header walk cannot
+    resolve fall back to scanning up to ``max_bytes`` from the start.
+    """
     if not video_path:
         return []
     ext = video_path.rsplit(".", 1)[-1].lower() if "." in video_path else ""
@@ -240,26 +442,31 @@ def parse_matroska_chapters_via_vfs(video_path: str, max_bytes: int = _MAX_HEADE
     handle = None
     try:
         handle = xbmcvfs.File(video_path)
-        chunk = _vfs_read(handle, max_bytes)
-        if not chunk:
+        if not hasattr(handle, "seek"):
+            return _parse_bounded_head(handle, max_bytes)
+        identity = _file_identity(xbmcvfs, video_path)
+        cached = _cached_chapters_offset(video_path, identity)
+        if cached is None:
             return []
-        rows = parse_matroska_chapters_from_bytes(chunk)
-        if rows:
-            return rows
-        # SeekHead may point past the first chunk; retry a targeted read.
-        seek_rel, seg_start = _chapters_seek_location(chunk)
-        if seek_rel is None:
+        if cached is not _NOT_CACHED:
+            rows = _read_chapters_at(_RangeReader(handle), cached)
+            if rows is not None:
+                return rows
+        head = _vfs_read(handle, _HEAD_PROBE_BYTES)
+        if not head:
             return []
-        abs_off = seg_start + seek_rel
-        if hasattr(handle, "seek"):
-            handle.seek(abs_off, 0)
-            extra = _vfs_read(handle, _MAX_CHAPTERS_BYTES)
-            if extra:
-                eid, _sz, payload, _n = _read_element(extra, 0)
-                if eid == _ID_CHAPTERS and payload is not None:
-                    return _parse_chapters_payload(payload)
-                return parse_matroska_chapters_from_bytes(extra)
-        return []
+        reader = _RangeReader(handle, head)
+        abs_off, definitive = _locate_chapters_offset(reader)
+        if abs_off is not None:
+            rows = _read_chapters_at(reader, abs_off)
+            if rows is not None:
+                _remember_chapters_offset(video_path, identity, abs_off)
+                return rows
+        elif definitive:
+            _remember_chapters_offset(video_path, identity, None)
+            return []
+        handle.seek(0, 0)
+        return _parse_bounded_head(handle, max_bytes)
     except Exception:
         return []
     finally:
@@ -270,7 +477,8 @@ def parse_matroska_chapters_via_vfs(video_path: str, max_bytes: int = _MAX_HEADE
                 pass
 
 
-def _chapters_seek_location(buf: bytes):
+def _chapters_seek_location(buf):
+    buf = _as_view(buf)
     offset = 0
     while offset < len(buf):
         elem_id, size, data, nxt = _read_element(buf, offset)
@@ -298,22 +506,21 @@ def _chapters_seek_location(buf: bytes):
     return None, 0
 
 
-def _vfs_read(handle, nbytes: int) -> bytes:
+def _vfs_read(handle, nbytes: int):
+    """Up to ``nbytes`` as ``bytes`` / ``bytearray`` (``readBytes`` result is not copied)."""
     data = b""
     if hasattr(handle, "readBytes"):
         try:
             raw = handle.readBytes(nbytes)
             if raw:
-                data = bytes(raw)
+                data = raw if isinstance(raw, (bytes, bytearray)) else bytes(raw)
         except Exception:
             data = b""
     if not data and hasattr(handle, "read"):
         try:
             raw = handle.read(nbytes)
-            if isinstance(raw, bytes):
+            if isinstance(raw, (bytes, bytearray)):
                 data = raw
-            elif isinstance(raw, bytearray):
-                data = bytes(raw)
             elif isinstance(raw, str):
                 data = raw.encode("latin-1", errors="replace")
         except Exception:
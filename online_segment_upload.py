@@ -6,15 +6,16 @@ import hashlib
 import json
 import os
 import re
+import threading
 import unicodedata
-from contextlib import closing
+from contextlib import closing, contextmanager
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
 
 import xbmc
 import xbmcaddon
 import xbmcvfs
 
+from remote_http_pool import http_open
 from remote_segments import (
     ADDON_ID,
     build_upload_context,
@@ -24,7 +25,8 @@ from remote_segments import (
 )
 from segment_editor_parser import seconds_to_hms
 from skippy_editor_modal_skin import show_editor_ok
-from skippy_stats import record_online_segment_uploaded
+from skippy_profile_store import write_json
+from skippy_stats import flush_statistics, record_online_segment_uploaded
 
 THEINTRODB_SUBMIT_URL = "https://api.theintrodb.org/v3/submit"
 INTRODB_SUBMIT_URL = "https://api.introdb.app/submit"
@@ -120,15 +122,18 @@ def _addon_version():
 def _http_post_json(url: str, headers: dict, payload: dict) -> tuple[int, dict | None, str | None]:
     """POST JSON; returns (http_code, parsed_json_or_none, error_text)."""
     data = json.dumps(payload).encode("utf-8")
-    req = Request(url, data=data)
-    req.add_header("Content-Type", "application/json")
-    req.add_header("User-Agent", "%s/%s" % (ADDON_ID, _addon_version()))
-    req.add_header("Accept", "application/json")
+    req_headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "%s/%s" % (ADDON_ID, _addon_version()),
+        "Accept": "application/json",
+    }
     for k, v in headers.items():
         if v is not None and str(v).strip():
-            req.add_header(k, str(v).strip())
+            req_headers[k] = str(v).strip()
     try:
-        with closing(urlopen(req, timeout=_POST_TIMEOUT)) as response:
+        with closing(
+            http_open(url, method="POST", headers=req_headers, data=data, timeout=_POST_TIMEOUT)
+        ) as response:
             body = response.read().decode("utf-8", errors="replace")
             code = getattr(response, "status", None) or getattr(response, "code", 200)
             try:
@@ -232,6 +237,16 @@ def _fp_short(fp: str) -> str:
     return (fp or "")[:12]
 
 
+_HISTORY_BUCKETS = ("theintrodb", "introdb")
+
+# In-memory index of the history file: ordered fingerprint lists (the file format) plus a
+# set per bucket for membership. Reloaded when the file's (mtime, size) changes, so a
+# restore run from another script invocation is picked up.
+_history_lock = threading.RLock()
+_history_index: dict | None = None
+_history_defer_depth = 0
+
+
 def _history_path():
     try:
         prof = xbmcaddon.Addon(ADDON_ID).getAddonInfo("profile")
@@ -240,96 +255,167 @@ def _history_path():
         return None
 
 
-def _load_history() -> dict:
-    path = _history_path()
+def _empty_history() -> dict:
+    return {"v": _HISTORY_VERSION, "theintrodb": [], "introdb": []}
+
+
+def _history_stamp(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_history(path) -> dict:
     if not path or not os.path.isfile(path):
-        return {"v": _HISTORY_VERSION, "theintrodb": [], "introdb": []}
+        return _empty_history()
     try:
         with open(path, encoding="utf-8") as f:
             data = json.load(f)
         if not isinstance(data, dict):
-            return {"v": _HISTORY_VERSION, "theintrodb": [], "introdb": []}
+            return _empty_history()
         data.setdefault("v", _HISTORY_VERSION)
-        data.setdefault("theintrodb", [])
-        data.setdefault("introdb", [])
-        if not isinstance(data["theintrodb"], list):
-            data["theintrodb"] = []
-        if not isinstance(data["introdb"], list):
-            data["introdb"] = []
+        for bucket in _HISTORY_BUCKETS:
+            if not isinstance(data.get(bucket), list):
+                data[bucket] = []
         return data
     except (OSError, TypeError, ValueError, json.JSONDecodeError):
-        return {"v": _HISTORY_VERSION, "theintrodb": [], "introdb": []}
+        return _empty_history()
 
 
-def _save_history(data: dict) -> None:
+def _history_state() -> dict:
+    """Current index (caller holds ``_history_lock``); reloads when the file changed."""
+    global _history_index
     path = _history_path()
+    state = _history_index
+    if state is not None and state["path"] == path:
+        if state["dirty"] or state["stamp"] == _history_stamp(path):
+            return state
+    data = _load_history(path)
+    _history_index = state = {
+        "path": path,
+        "stamp": _history_stamp(path),
+        "data": data,
+        "sets": {bucket: set(data[bucket]) for bucket in _HISTORY_BUCKETS},
+        "dirty": False,
+    }
+    return state
+
+
+def _save_history(state: dict) -> None:
+    path = state["path"]
     if not path:
+        state["dirty"] = False
         return
-    try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-    except OSError:
-        pass
-    for key in ("theintrodb", "introdb"):
-        lst = data.get(key) or []
+    data = state["data"]
+    for bucket in _HISTORY_BUCKETS:
+        lst = data.get(bucket) or []
         if len(lst) > _MAX_HISTORY_ENTRIES_PER_API:
-            data[key] = lst[-_MAX_HISTORY_ENTRIES_PER_API :]
+            data[bucket] = lst[-_MAX_HISTORY_ENTRIES_PER_API :]
+            state["sets"][bucket] = set(data[bucket])
+    if write_json(path, data, compact=True):
+        state["stamp"] = _history_stamp(path)
+        state["dirty"] = False
+    else:
+        _up_log_err("online upload: could not save history: %s" % path)
+
+
+def _history_changed(state: dict) -> None:
+    """Persist now, or at the end of the enclosing ``_deferred_history_writes`` block."""
+    state["dirty"] = True
+    if _history_defer_depth == 0:
+        _save_history(state)
+
+
+@contextmanager
+def _deferred_history_writes():
+    """
+    Batch history writes made inside the block into one file write. Upload counters are
+    written at the end too: the editor uploads from a RunScript process that may exit
+    before the statistics write-behind timer fires.
+    """
+    global _history_defer_depth
+    with _history_lock:
+        _history_defer_depth += 1
     try:
-        with open(path, "w", encoding="utf-8", newline="\n") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.write("\n")
-    except OSError as exc:
-        _up_log_err("online upload: could not save history: %s" % exc)
+        yield
+    finally:
+        with _history_lock:
+            _history_defer_depth -= 1
+            outermost = _history_defer_depth == 0
+            state = _history_index
+            if outermost and state is not None and state["dirty"]:
+                _save_history(state)
+        if outermost:
+            flush_statistics()
+
+
+def clear_history_cache() -> None:
+    """Forget the in-memory index; the next access re-reads the file."""
+    global _history_index
+    with _history_lock:
+        _history_index = None
 
 
 def load_upload_submission_history() -> dict:
     """Return upload dedupe history from the addon profile (empty buckets if missing)."""
-    return _load_history()
+    with _history_lock:
+        data = _history_state()["data"]
+        out = dict(data)
+        for bucket in _HISTORY_BUCKETS:
+            out[bucket] = list(data[bucket])
+        return out
 
 
 def merge_upload_submission_history(incoming: dict) -> tuple[int, int]:
     """Union fingerprint lists into profile history. Returns (added, already_present)."""
-    data = _load_history()
     added = 0
     already = 0
-    for bucket in ("theintrodb", "introdb"):
-        inc = (incoming or {}).get(bucket) or []
-        if not isinstance(inc, list):
-            continue
-        lst = data.setdefault(bucket, [])
-        if not isinstance(lst, list):
-            lst = []
-            data[bucket] = lst
-        seen = set(lst)
-        for fp in inc:
-            if not isinstance(fp, str):
-                continue
-            fp = fp.strip()
-            if not fp:
+    with _history_lock:
+        state = _history_state()
+        data = state["data"]
+        for bucket in _HISTORY_BUCKETS:
+            inc = (incoming or {}).get(bucket) or []
+            if not isinstance(inc, list):
                 continue
-            if fp in seen:
-                already += 1
-                continue
-            lst.append(fp)
-            seen.add(fp)
-            added += 1
-    _save_history(data)
+            lst = data[bucket]
+            seen = state["sets"][bucket]
+            for fp in inc:
+                if not isinstance(fp, str):
+                    continue
+                fp = fp.strip()
+                if not fp:
+                    continue
+                if fp in seen:
+                    already += 1
+                    continue
+                lst.append(fp)
+                seen.add(fp)
+                added += 1
+        _history_changed(state)
     return added, already
 
 
 def _history_contains(api_bucket: str, fp: str) -> bool:
-    data = _load_history()
-    lst = data.get(api_bucket) or []
-    return fp in lst
+    with _history_lock:
+        seen = _history_state()["sets"].get(api_bucket)
+        return bool(seen) and fp in seen
 
 
 def _history_record(api_bucket: str, fp: str) -> None:
-    data = _load_history()
-    lst = data.setdefault(api_bucket, [])
-    if fp in lst:
-        return
-    lst.append(fp)
-    _save_history(data)
+    with _history_lock:
+        state = _history_state()
+        seen = state["sets"].get(api_bucket)
+        if seen is None or fp in seen:
+            return
+        state["data"][api_bucket].append(fp)
+        seen.add(fp)
+        _history_changed(state)
+        deferred = _history_defer_depth > 0
     record_online_segment_uploaded()
+    if not deferred:
+        flush_statistics()
 
 
 def _validate_theintrodb_times(
@@ -843,95 +929,97 @@ def upload_segments_subset(
     if not (lbl_idb or "").strip():
         lbl_idb = "IntroDB.app"
 
-    for seg in segments:
-        label_norm = getattr(seg, "segment_type_label", "") or ""
-        mapped = classify_segment_label_normalized(label_norm)
-        tr = _upload_time_range(seg.start_seconds, seg.end_seconds)
-        if mapped is None:
-            raw = getattr(seg, "raw_label", label_norm)
-            lines_skip.append(
-                "%s — %s — %s"
-                % (raw, tr, _translate(39020))
-            )
-            _up_log_info(
-                "skip (not uploaded: label not mapped to online types): raw=%r norm=%r %s"
-                % (raw, label_norm, media_key)
-            )
-            continue
-        tidb_seg, idb_seg = mapped
-        start = float(seg.start_seconds)
-        end = float(seg.end_seconds)
-        raw = getattr(seg, "raw_label", label_norm)
-
-        if do_tidb:
-            fp = _fingerprint("theintrodb", media_key, tidb_seg, start, end)
-            if _history_contains("theintrodb", fp):
+    # One history write for the whole batch; the block still saves if a POST raises.
+    with _deferred_history_writes():
+        for seg in segments:
+            label_norm = getattr(seg, "segment_type_label", "") or ""
+            mapped = classify_segment_label_normalized(label_norm)
+            tr = _upload_time_range(seg.start_seconds, seg.end_seconds)
+            if mapped is None:
+                raw = getattr(seg, "raw_label", label_norm)
                 lines_skip.append(
-                    "%s — %s (%s) — %s — %s"
-                    % (lbl_tidb, raw, tidb_seg, tr, _translate(39021))
+                    "%s — %s — %s"
+                    % (raw, tr, _translate(39020))
                 )
                 _up_log_info(
-                    "skip TheIntroDB (already in local submit history): %r segment=%s %.3f-%.3f fp=%s %s"
-                    % (raw, tidb_seg, start, end, _fp_short(fp), media_key)
+                    "skip (not uploaded: label not mapped to online types): raw=%r norm=%r %s"
+                    % (raw, label_norm, media_key)
                 )
-            else:
-                ok, err = _submit_theintrodb(ctx, tidb_seg, start, end, t_db_key)
-                if ok:
-                    _history_record("theintrodb", fp)
-                    lines_ok.append(
-                        "%s — %s (%s) — %s"
-                        % (lbl_tidb, raw, tidb_seg, tr)
-                    )
-                    _up_log_info(
-                        "ok TheIntroDB: %r segment=%s %.3f-%.3f fp=%s %s"
-                        % (raw, tidb_seg, start, end, _fp_short(fp), media_key)
-                    )
-                else:
-                    lines_err.append(
-                        "%s — %s (%s) — %s — %s"
-                        % (lbl_tidb, raw, tidb_seg, tr, err)
-                    )
-            xbmc.sleep(200)
+                continue
+            tidb_seg, idb_seg = mapped
+            start = float(seg.start_seconds)
+            end = float(seg.end_seconds)
+            raw = getattr(seg, "raw_label", label_norm)
 
-        if do_idb:
-            if idb_seg is None:
-                lines_skip.append(
-                    "%s — %s (%s) — %s — %s"
-                    % (lbl_idb, raw, tidb_seg, tr, _translate(39056))
-                )
-                _up_log_info(
-                    "skip IntroDB.app (segment type not accepted): %r tidb=%s %s"
-                    % (raw, tidb_seg, media_key)
-                )
-            else:
-                fp_i = _fingerprint("introdb", media_key, idb_seg, start, end)
-                if _history_contains("introdb", fp_i):
+            if do_tidb:
+                fp = _fingerprint("theintrodb", media_key, tidb_seg, start, end)
+                if _history_contains("theintrodb", fp):
                     lines_skip.append(
                         "%s — %s (%s) — %s — %s"
-                        % (lbl_idb, raw, idb_seg, tr, _translate(39021))
+                        % (lbl_tidb, raw, tidb_seg, tr, _translate(39021))
                     )
                     _up_log_info(
-                        "skip IntroDB.app (already in local submit history): %r segment_type=%s %.3f-%.3f fp=%s %s"
-                        % (raw, idb_seg, start, end, _fp_short(fp_i), media_key)
+                        "skip TheIntroDB (already in local submit history): %r segment=%s %.3f-%.3f fp=%s %s"
+                        % (raw, tidb_seg, start, end, _fp_short(fp), media_key)
                     )
                 else:
-                    ok, err = _submit_introdb_app(ctx, idb_seg, start, end, idb_key)
+                    ok, err = _submit_theintrodb(ctx, tidb_seg, start, end, t_db_key)
                     if ok:
-                        _history_record("introdb", fp_i)
+                        _history_record("theintrodb", fp)
                         lines_ok.append(
                             "%s — %s (%s) — %s"
-                            % (lbl_idb, raw, idb_seg, tr)
+                            % (lbl_tidb, raw, tidb_seg, tr)
                         )
                         _up_log_info(
-                            "ok IntroDB.app: %r segment_type=%s %.3f-%.3f fp=%s %s"
-                            % (raw, idb_seg, start, end, _fp_short(fp_i), media_key)
+                            "ok TheIntroDB: %r segment=%s %.3f-%.3f fp=%s %s"
+                            % (raw, tidb_seg, start, end, _fp_short(fp), media_key)
                         )
                     else:
                         lines_err.append(
                             "%s — %s (%s) — %s — %s"
-                            % (lbl_idb, raw, idb_seg, tr, err)
+                            % (lbl_tidb, raw, tidb_seg, tr, err)
                         )
-            xbmc.sleep(200)
+                xbmc.sleep(200)
+
+            if do_idb:
+                if idb_seg is None:
+                    lines_skip.append(
+                        "%s — %s (%s) — %s — %s"
+                        % (lbl_idb, raw, tidb_seg, tr, _translate(39056))
+                    )
+                    _up_log_info(
+                        "skip IntroDB.app (segment type not accepted): %r tidb=%s %s"
+                        % (raw, tidb_seg, media_key)
+                    )
+                else:
+                    fp_i = _fingerprint("introdb", media_key, idb_seg, start, end)
+                    if _history_contains("introdb", fp_i):
+                        lines_skip.append(
+                            "%s — %s (%s) — %s — %s"
+                            % (lbl_idb, raw, idb_seg, tr, _translate(39021))
+                        )
+                        _up_log_info(
+                            "skip IntroDB.app (already in local submit history): %r segment_type=%s %.3f-%.3f fp=%s %s"
+                            % (raw, idb_seg, start, end, _fp_short(fp_i), media_key)
+                        )
+                    else:
+                        ok, err = _submit_introdb_app(ctx, idb_seg, start, end, idb_key)
+                        if ok:
+                            _history_record("introdb", fp_i)
+                            lines_ok.append(
+                                "%s — %s (%s) — %s"
+                                % (lbl_idb, raw, idb_seg, tr)
+                            )
+                            _up_log_info(
+                                "ok IntroDB.app: %r segment_type=%s %.3f-%.3f fp=%s %s"
+                                % (raw, idb_seg, start, end, _fp_short(fp_i), media_key)
+                            )
+                        else:
+                            lines_err.append(
+                                "%s — %s (%s) — %s — %s"
+                                % (lbl_idb, raw, idb_seg, tr, err)
+                            )
+                xbmc.sleep(200)
 
     if not show_result:
         _up_log_info(
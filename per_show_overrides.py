@@ -1,27 +1,44 @@
 # -*- coding: utf-8 -*-
 """Per-title autoskip overrides ("always skip Intro for this show").
 
-Overrides are stored under ``addon_data/service.skippy/show_overrides/`` in one JSON
-file per title, named after the title's TMDB id (IMDb id as fallback). Keying on the
-library id rather than the file path means the choice survives re-encodes, renames,
-and different versions of the same movie or episode.
+All titles live in one file, ``addon_data/service.skippy/show_overrides.json``, keyed by
+the title's TMDB id (IMDb id as fallback). Keying on the library id rather than the file
+path means the choice survives re-encodes, renames, and different versions of the same
+movie or episode.
+
+The file is loaded once per process and the in-memory copy is authoritative: every write
+builds the new state, writes it atomically, and only then replaces the in-memory copy.
+The service re-reads the file when its mtime changes (the manage modal, clear and restore
+actions run as separate RunScript processes). Profiles from before the single file kept
+one ``show_overrides/<key>.json`` per title; those are migrated on first load.
 """
 
 from __future__ import annotations
 
 import os
+import threading
+import time
 
 from settings_utils import addon_get_bool, log, log_service_detail, normalize_label
 from skippy_profile_store import profile_path, read_json, write_json
 
-OVERRIDES_DIRNAME = "show_overrides"
+STORE_FILENAME = "show_overrides.json"
+STORE_SCHEMA = "skippy_show_overrides_store_v1"
+# Per-title payload schema (backups and the legacy one-file-per-title layout).
 SCHEMA = "skippy_show_overrides_v1"
+LEGACY_DIRNAME = "show_overrides"
+# Minimum gap between checks for a rewrite of the store by another process.
+STORE_CHECK_INTERVAL_S = 2.0
 
 MODE_AUTO = "auto"
 MODE_DECLINED = "declined"
 
-# key -> overrides dict; the skip path reads this on every active segment.
-_cache: dict[str, dict] = {}
+_lock = threading.RLock()
+# key -> {"segments": {normalized_label: mode}, "title": str}; the skip path reads this on
+# every active segment. Entries are replaced, never mutated, so readers need no copy.
+_titles: dict[str, dict] | None = None
+_stamp = None
+_checked_at = 0.0
 
 
 def per_show_override_enabled(addon) -> bool:
@@ -42,29 +59,162 @@ def override_key_for_identity(identity) -> str | None:
     return None
 
 
-def _store_path(key: str) -> str | None:
-    if not key or any(ch in key for ch in "/\\:"):
+def _valid_key(key) -> bool:
+    return isinstance(key, str) and bool(key) and not any(ch in key for ch in "/\\:")
+
+
+def _store_path() -> str | None:
+    return profile_path(STORE_FILENAME)
+
+
+def _file_stamp(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
         return None
-    return profile_path(OVERRIDES_DIRNAME, "%s.json" % key)
+    return st.st_mtime_ns, st.st_size
+
+
+def _normalized_segments(raw) -> dict:
+    segments = {}
+    if isinstance(raw, dict):
+        for label, mode in raw.items():
+            if mode in (MODE_AUTO, MODE_DECLINED):
+                normalized = normalize_label(label)
+                if normalized:
+                    segments[normalized] = mode
+    return segments
+
+
+def _entry_from_payload(payload) -> dict | None:
+    if not isinstance(payload, dict) or not isinstance(payload.get("segments"), dict):
+        return None
+    title = payload.get("title")
+    return {
+        "segments": _normalized_segments(payload["segments"]),
+        "title": title.strip() if isinstance(title, str) else "",
+    }
+
+
+def _read_store(path) -> dict[str, dict] | None:
+    data = read_json(path, default=None)
+    if not isinstance(data, dict) or data.get("schema") != STORE_SCHEMA:
+        return None
+    titles = {}
+    raw = data.get("titles")
+    if isinstance(raw, dict):
+        for key, payload in raw.items():
+            entry = _entry_from_payload(payload)
+            if entry is not None and _valid_key(key):
+                titles[key] = entry
+    return titles
+
+
+def _write_store(path, titles) -> bool:
+    rows = {}
+    for key, entry in titles.items():
+        row = {"segments": entry["segments"]}
+        if entry.get("title"):
+            row["title"] = entry["title"]
+        rows[key] = row
+    return write_json(path, {"schema": STORE_SCHEMA, "titles": rows}, compact=True)
+
+
+def _key_from_filename(name: str) -> str | None:
+    if not name.endswith(".json"):
+        return None
+    key = name[:-5]
+    return key if _valid_key(key) else None
+
+
+def _legacy_files() -> list[str]:
+    directory = profile_path(LEGACY_DIRNAME)
+    if not directory or not os.path.isdir(directory):
+        return []
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    return [
+        os.path.join(directory, name) for name in names if name.endswith(".json")
+    ]
+
+
+def _migrate_legacy(path) -> dict[str, dict]:
+    """Fold ``show_overrides/<key>.json`` files into the store, then remove them."""
+    files = _legacy_files()
+    titles = {}
+    for legacy in files:
+        key = _key_from_filename(os.path.basename(legacy))
+        entry = _entry_from_payload(read_json(legacy, default=None))
+        if key and entry is not None and entry["segments"]:
+            titles[key] = entry
+    if not files:
+        return titles
+    if not _write_store(path, titles):
+        log("⚠️ Per-show override: could not migrate %d title file(s)" % len(files))
+        return titles
+    for legacy in files:
+        try:
+            os.remove(legacy)
+        except OSError as exc:
+            log_service_detail(
+                "per-show override: could not delete %s (%s)" % (legacy, exc),
+                tag="overrides",
+            )
+    try:
+        os.rmdir(os.path.dirname(files[0]))
+    except OSError:
+        pass
+    log("📦 Per-show overrides: migrated %d title file(s) into %s" % (len(titles), STORE_FILENAME))
+    return titles
+
+
+def _state() -> dict[str, dict]:
+    """Loaded titles (caller holds ``_lock``); re-read when another process rewrote them."""
+    global _titles, _stamp, _checked_at
+    path = _store_path()
+    now = time.monotonic()
+    if _titles is not None:
+        if now - _checked_at < STORE_CHECK_INTERVAL_S:
+            return _titles
+        _checked_at = now
+        if _file_stamp(path) == _stamp:
+            return _titles
+    titles = _read_store(path) if path and os.path.isfile(path) else None
+    if titles is None:
+        titles = _migrate_legacy(path) if path else {}
+    _titles = titles
+    _stamp = _file_stamp(path)
+    _checked_at = now
+    return _titles
+
+
+def _commit(titles: dict[str, dict]) -> bool:
+    """Write ``titles`` and adopt it in memory only when the write succeeded."""
+    global _titles, _stamp, _checked_at
+    path = _store_path()
+    if not path or not _write_store(path, titles):
+        return False
+    _titles = titles
+    _stamp = _file_stamp(path)
+    _checked_at = time.monotonic()
+    return True
+
+
+def load_override_store() -> int:
+    """Load (and if needed migrate) the store; returns the number of titles. Service start."""
+    with _lock:
+        return len(_state())
 
 
 def load_overrides(key: str) -> dict:
-    """``{normalized_label: mode}`` for one title (cached; empty when nothing saved)."""
+    """``{normalized_label: mode}`` for one title (empty when nothing saved); do not mutate."""
     if not key:
         return {}
-    cached = _cache.get(key)
-    if cached is not None:
-        return cached
-    data = read_json(_store_path(key), default=None)
-    segments = {}
-    if isinstance(data, dict):
-        raw = data.get("segments")
-        if isinstance(raw, dict):
-            for label, mode in raw.items():
-                if mode in (MODE_AUTO, MODE_DECLINED):
-                    segments[normalize_label(label)] = mode
-    _cache[key] = segments
-    return segments
+    with _lock:
+        entry = _state().get(key)
+    return entry["segments"] if entry else {}
 
 
 def lookup_override(key: str, segment_label) -> str | None:
@@ -76,61 +226,40 @@ def lookup_override(key: str, segment_label) -> str | None:
 
 def save_override(key: str, segment_label, mode: str, title: str = "") -> bool:
     """Persist one title + segment type decision. Returns True when written."""
-    if not key or mode not in (MODE_AUTO, MODE_DECLINED):
-        return False
-    path = _store_path(key)
-    if not path:
-        return False
-    existing = read_json(path, default=None)
-    payload = existing if isinstance(existing, dict) else {}
-    segments = payload.get("segments")
-    if not isinstance(segments, dict):
-        segments = {}
-    segments[normalize_label(segment_label)] = mode
-    payload["schema"] = SCHEMA
-    payload["key"] = key
-    payload["segments"] = segments
-    if title:
-        payload["title"] = title
-    if not write_json(path, payload):
-        log("⚠️ Per-show override: could not write %s" % path)
+    if not _valid_key(key) or mode not in (MODE_AUTO, MODE_DECLINED):
         return False
-    _cache.pop(key, None)
-    log(
-        "💾 Per-show override saved: %s → %s = %s"
-        % (key, normalize_label(segment_label), mode)
-    )
+    label = normalize_label(segment_label)
+    with _lock:
+        titles = dict(_state())
+        previous = titles.get(key) or {"segments": {}, "title": ""}
+        segments = dict(previous["segments"])
+        segments[label] = mode
+        titles[key] = {"segments": segments, "title": title or previous["title"]}
+        if not _commit(titles):
+            log("⚠️ Per-show override: could not write %s" % _store_path())
+            return False
+    log("💾 Per-show override saved: %s → %s = %s" % (key, label, mode))
     return True
 
 
 def delete_override(key: str) -> bool:
-    """Delete one title's override file. Returns True when the file was removed."""
-    path = _store_path(key)
-    if not path or not os.path.isfile(path):
-        _cache.pop(key, None)
-        return False
-    try:
-        os.remove(path)
-    except OSError as exc:
-        log_service_detail(
-            "per-show override: could not delete %s (%s)" % (path, exc),
-            tag="overrides",
-        )
+    """Forget one title's overrides. Returns True when the title was removed."""
+    if not _valid_key(key):
         return False
-    _cache.pop(key, None)
+    with _lock:
+        titles = dict(_state())
+        if titles.pop(key, None) is None:
+            return False
+        if not _commit(titles):
+            log_service_detail(
+                "per-show override: could not write %s" % _store_path(),
+                tag="overrides",
+            )
+            return False
     log("🗑️ Per-show override deleted: %s" % key)
     return True
 
 
-def _key_from_filename(name: str) -> str | None:
-    if not name.endswith(".json"):
-        return None
-    key = name[:-5]
-    if not key or any(ch in key for ch in "/\\:"):
-        return None
-    return key
-
-
 def _display_title_for_payload(key: str, payload: dict) -> str:
     title = (payload.get("title") or "").strip()
     if title:
@@ -150,35 +279,21 @@ def list_title_entries(*, auto_only: bool = True) -> list[dict]:
     Each item: ``key``, ``title``, ``path``, ``auto_labels``, ``declined_labels``.
     When ``auto_only`` is True (default), only titles with at least one auto-skip remain.
     """
+    path = _store_path()
+    with _lock:
+        titles = _state()
     entries = []
-    for path in stored_override_files():
-        key = _key_from_filename(os.path.basename(path))
-        if not key:
-            continue
-        payload = read_json(path, default=None)
-        if not isinstance(payload, dict):
-            continue
-        raw = payload.get("segments")
-        if not isinstance(raw, dict):
-            continue
-        auto_labels = []
-        declined_labels = []
-        for label, mode in raw.items():
-            normalized = normalize_label(label)
-            if not normalized:
-                continue
-            if mode == MODE_AUTO:
-                auto_labels.append(normalized)
-            elif mode == MODE_DECLINED:
-                declined_labels.append(normalized)
-        auto_labels.sort()
-        declined_labels.sort()
+    for key, entry in titles.items():
+        auto_labels = sorted(l for l, m in entry["segments"].items() if m == MODE_AUTO)
+        declined_labels = sorted(
+            l for l, m in entry["segments"].items() if m == MODE_DECLINED
+        )
         if auto_only and not auto_labels:
             continue
         entries.append(
             {
                 "key": key,
-                "title": _display_title_for_payload(key, payload),
+                "title": _display_title_for_payload(key, entry),
                 "path": path,
                 "auto_labels": auto_labels,
                 "declined_labels": declined_labels,
@@ -195,40 +310,23 @@ def export_all_overrides() -> dict[str, dict]:
     Returns ``{key: payload}`` where payload includes ``schema``, ``key``,
     ``segments``, and optional ``title``.
     """
+    with _lock:
+        titles = _state()
     out: dict[str, dict] = {}
-    for path in stored_override_files():
-        key = _key_from_filename(os.path.basename(path))
-        if not key:
-            continue
-        payload = read_json(path, default=None)
-        if not isinstance(payload, dict):
-            continue
-        raw = payload.get("segments")
-        if not isinstance(raw, dict):
-            continue
-        segments = {}
-        for label, mode in raw.items():
-            if mode in (MODE_AUTO, MODE_DECLINED):
-                normalized = normalize_label(label)
-                if normalized:
-                    segments[normalized] = mode
-        if not segments:
+    for key in sorted(titles):
+        entry = titles[key]
+        if not entry["segments"]:
             continue
-        entry = {
-            "schema": SCHEMA,
-            "key": key,
-            "segments": segments,
-        }
-        title = (payload.get("title") or "").strip()
-        if title:
-            entry["title"] = title
-        out[key] = entry
+        payload = {"schema": SCHEMA, "key": key, "segments": dict(entry["segments"])}
+        if entry["title"]:
+            payload["title"] = entry["title"]
+        out[key] = payload
     return out
 
 
 def merge_overrides_from_backup(incoming) -> tuple[int, int, int]:
     """
-    Merge title override payloads from a backup into the local profile.
+    Merge title override payloads from a backup into the local profile (one write).
 
     Returns ``(titles_written, segments_added, segments_updated)``.
     Backup values overwrite the same label on conflict; other local labels stay.
@@ -238,99 +336,72 @@ def merge_overrides_from_backup(incoming) -> tuple[int, int, int]:
     titles_written = 0
     segments_added = 0
     segments_updated = 0
-    for key, payload in incoming.items():
-        if not isinstance(key, str) or not isinstance(payload, dict):
-            continue
-        store_key = key.strip()
-        if not store_key or any(ch in store_key for ch in "/\\:"):
-            continue
-        path = _store_path(store_key)
-        if not path:
-            continue
-        raw_segments = payload.get("segments")
-        if not isinstance(raw_segments, dict):
-            continue
-        incoming_segments = {}
-        for label, mode in raw_segments.items():
-            if mode in (MODE_AUTO, MODE_DECLINED):
-                normalized = normalize_label(label)
-                if normalized:
-                    incoming_segments[normalized] = mode
-        if not incoming_segments:
-            continue
-
-        existing = read_json(path, default=None)
-        local = existing if isinstance(existing, dict) else {}
-        segments = local.get("segments")
-        if not isinstance(segments, dict):
-            segments = {}
-        local_normalized = {}
-        for label, mode in segments.items():
-            if mode in (MODE_AUTO, MODE_DECLINED):
-                normalized = normalize_label(label)
-                if normalized:
-                    local_normalized[normalized] = mode
-
-        changed = False
-        for label, mode in incoming_segments.items():
-            previous = local_normalized.get(label)
-            if previous is None:
-                local_normalized[label] = mode
-                segments_added += 1
-                changed = True
-            elif previous != mode:
-                local_normalized[label] = mode
-                segments_updated += 1
-                changed = True
-
-        title = (payload.get("title") or local.get("title") or "").strip()
-        title_changed = bool(title) and title != (local.get("title") or "").strip()
-        if not changed and not title_changed and os.path.isfile(path):
-            continue
+    with _lock:
+        titles = dict(_state())
+        for key, payload in incoming.items():
+            if not isinstance(key, str) or not isinstance(payload, dict):
+                continue
+            store_key = key.strip()
+            if not _valid_key(store_key):
+                continue
+            incoming_segments = _normalized_segments(payload.get("segments"))
+            if not incoming_segments:
+                continue
 
-        out_payload = {
-            "schema": SCHEMA,
-            "key": store_key,
-            "segments": local_normalized,
-        }
-        if title:
-            out_payload["title"] = title
-        if not write_json(path, out_payload):
-            log("⚠️ Per-show override: could not merge backup for %s" % store_key)
-            continue
-        _cache.pop(store_key, None)
-        titles_written += 1
+            local = titles.get(store_key) or {"segments": {}, "title": ""}
+            merged = dict(local["segments"])
+            changed = False
+            for label, mode in incoming_segments.items():
+                previous = merged.get(label)
+                if previous is None:
+                    merged[label] = mode
+                    segments_added += 1
+                    changed = True
+                elif previous != mode:
+                    merged[label] = mode
+                    segments_updated += 1
+                    changed = True
+
+            title = (payload.get("title") or local["title"] or "").strip()
+            title_changed = bool(title) and title != local["title"]
+            if not changed and not title_changed:
+                continue
+            titles[store_key] = {"segments": merged, "title": title}
+            titles_written += 1
+        if titles_written and not _commit(titles):
+            log("⚠️ Per-show override: could not merge backup into %s" % _store_path())
+            return 0, 0, 0
     return titles_written, segments_added, segments_updated
 
 
 def clear_cache() -> None:
-    _cache.clear()
+    global _titles, _stamp, _checked_at
+    with _lock:
+        _titles = None
+        _stamp = None
+        _checked_at = 0.0
 
 
 def stored_override_files() -> list[str]:
-    directory = profile_path(OVERRIDES_DIRNAME)
-    if not directory or not os.path.isdir(directory):
-        return []
-    try:
-        names = sorted(os.listdir(directory))
-    except OSError:
-        return []
-    return [
-        os.path.join(directory, name) for name in names if name.endswith(".json")
-    ]
+    """Files holding overrides: the store, plus legacy per-title files not yet migrated."""
+    path = _store_path()
+    files = [path] if path and os.path.isfile(path) else []
+    return files + _legacy_files()
 
 
 def clear_all_overrides() -> int:
-    """Delete every stored override file. Returns the number removed."""
-    removed = 0
-    for path in stored_override_files():
-        try:
-            os.remove(path)
-            removed += 1
-        except OSError as exc:
-            log_service_detail(
-                "per-show override: could not delete %s (%s)" % (path, exc),
-                tag="overrides",
-            )
-    clear_cache()
+    """Forget every stored override. Returns the number of titles removed."""
+    with _lock:
+        removed = len(_state())
+        for path in stored_override_files():
+            try:
+                os.remove(path)
+            except OSError as exc:
+                log_service_detail(
+                    "per-show override: could not delete %s (%s)" % (path, exc),
+                    tag="overrides",
+                )
+        clear_cache()
+        if stored_override_files() and not _commit({}):
+            return 0
     return removed
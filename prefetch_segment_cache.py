@@ -1,20 +1,29 @@
 # -*- coding: utf-8 -*-
-"""TV successor online-segment prefetch (separate from ``remote_segment_cache``).
+"""TV lookahead online-segment prefetch (separate from ``remote_segment_cache``).
 
-Handoff: only after path match **and** ``build_tv_cache_key`` matches the playing
-library episode. Cleared at service start; replaced when scheduling a new prefetch.
+Holds up to ``MAX_ENTRIES`` prefetched episodes keyed by ``build_tv_cache_key``, least
+recently stored or handed off evicted first. Handoff: only after path match **and** the
+cache key matches the playing library episode. A handed-off entry stays in the store, so
+skipping an episode ahead or going back one still finds its segments. Cleared at service
+start and when prefetch is turned off.
 """
 import copy
 import os
+import threading
+from collections import OrderedDict
 
 import xbmcvfs
 
-_entry = None
+# Lookahead window (up to 5) + the playing episode + one to go back to.
+MAX_ENTRIES = 7
+
+_lock = threading.Lock()
+_entries = OrderedDict()
 
 
 def clear_prefetch_segment_cache():
-    global _entry
-    _entry = None
+    with _lock:
+        _entries.clear()
 
 
 def _paths_refer_to_same_video(path_a, path_b):
@@ -33,28 +42,50 @@ def _paths_refer_to_same_video(path_a, path_b):
 
 
 def set_tv_segment_prefetch(target_path, segments, cache_key):
-    """Store online segments for the successor episode file (replaces any prior entry)."""
-    global _entry
+    """Store online segments for a lookahead episode file (replaces an entry with that key)."""
     if not target_path or not cache_key:
-        _entry = None
         return
-    _entry = {
+    entry = {
         "target_path": str(target_path).strip(),
         "segments": [copy.copy(s) for s in (segments or [])],
         "cache_key": cache_key,
     }
+    with _lock:
+        _entries.pop(cache_key, None)
+        _entries[cache_key] = entry
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def has_tv_prefetch(cache_key):
+    """True when segments for ``cache_key`` are already stored."""
+    with _lock:
+        return cache_key in _entries
+
+
+def prefetched_cache_keys():
+    """Stored cache keys, least recently used first."""
+    with _lock:
+        return list(_entries)
 
 
 def peek_tv_prefetch_for_playing_path(playing_path):
-    """Return the live prefetch entry if ``playing_path`` is the prefetched file; else None."""
-    if not _entry or not playing_path:
-        return None
-    if not _paths_refer_to_same_video(_entry["target_path"], playing_path):
+    """Return the stored entry whose file is ``playing_path``; else None."""
+    if not playing_path:
         return None
-    return _entry
+    with _lock:
+        entries = list(_entries.values())
+    for entry in reversed(entries):
+        if _paths_refer_to_same_video(entry["target_path"], playing_path):
+            return entry
+    return None
 
 
-def consume_tv_prefetch_entry():
-    """Drop prefetch storage after successful or rejected handoff."""
-    global _entry
-    _entry = None
+def consume_tv_prefetch_entry(cache_key):
+    """
+    Mark the entry for ``cache_key`` as just handed off (most recently used). The entry is
+    kept so going back to that episode hands off again; the store's bound evicts it later.
+    """
+    with _lock:
+        if cache_key in _entries:
+            _entries.move_to_end(cache_key)
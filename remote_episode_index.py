@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""Per-show index of library episodes in (season, episode) order.
+
+Finding the episode after (or before) the playing one used to dump whole seasons through
+``VideoLibrary.GetEpisodes`` at every episode, often twice (current season, then the next).
+``episode_index`` builds one ``ShowEpisodeIndex`` per ``tvshowid`` from a single
+``GetEpisodes`` call with light properties and answers successor / predecessor / next-N
+queries with ``bisect``.
+
+Indexes are kept in memory and in ``addon_data/service.skippy/library_episode_index.json``
+(so a restart does not rebuild them). They are dropped when Kodi announces a library change
+for the show (``VideoLibrary.OnUpdate`` / ``OnRemove``, see ``note_library_update``) and
+rebuilt after ``INDEX_MAX_AGE_S`` in case a change happened while the service was not running
+or on another client sharing the database.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from remote_http import _rlog, jsonrpc, parse_int
+from skippy_profile_store import profile_path, read_json, write_json
+
+CACHE_FILENAME = "library_episode_index.json"
+SCHEMA = "skippy_library_episode_index_v1"
+INDEX_MAX_AGE_S = 6 * 3600
+# Least recently built shows are evicted beyond this many.
+MAX_SHOWS = 50
+
+_INDEX_PROPERTIES = ["season", "episode", "file"]
+
+_lock = threading.RLock()
+_cache: dict | None = None
+
+
+class ShowEpisodeIndex:
+    """Episode rows of one show sorted by ``(season, episode)``.
+
+    Rows are dicts with ``episodeid``, ``season``, ``episode`` and ``file``. Stepping from a
+    regular season never lands on specials (season 0); stepping out of specials continues
+    with season 1.
+    """
+
+    def __init__(self, tvshow_id, rows, built=None):
+        self.tvshow_id = int(tvshow_id)
+        self.built = time.time() if built is None else float(built)
+        self.rows = sorted(rows, key=lambda r: (r["season"], r["episode"], r["episodeid"]))
+        self.keys = [(r["season"], r["episode"]) for r in self.rows]
+        self._regular_start = bisect_left(self.keys, (1, -1))
+        self._episode_ids = frozenset(r["episodeid"] for r in self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _floor(self, season):
+        return self._regular_start if season > 0 else 0
+
+    def find(self, season, episode):
+        i = bisect_left(self.keys, (season, episode))
+        if i < len(self.keys) and self.keys[i] == (season, episode):
+            return self.rows[i]
+        return None
+
+    def successor(self, season, episode):
+        """First episode after ``season``/``episode``, or None."""
+        rows = self.next_n(season, episode, 1)
+        return rows[0] if rows else None
+
+    def predecessor(self, season, episode):
+        """Last episode before ``season``/``episode``, or None."""
+        i = bisect_left(self.keys, (season, episode)) - 1
+        return self.rows[i] if i >= self._floor(season) else None
+
+    def next_n(self, season, episode, n):
+        """Up to ``n`` episodes after ``season``/``episode``, in order."""
+        if n <= 0:
+            return []
+        i = max(bisect_right(self.keys, (season, episode)), self._floor(season))
+        return self.rows[i : i + n]
+
+    def has_episode_id(self, episode_id):
+        return episode_id in self._episode_ids
+
+    def to_json(self):
+        return {
+            "built": self.built,
+            "rows": [[r["season"], r["episode"], r["episodeid"], r["file"]] for r in self.rows],
+        }
+
+    @classmethod
+    def from_json(cls, tvshow_id, data):
+        rows = []
+        for raw in data.get("rows") or []:
+            try:
+                season, episode, eid, path = raw
+                rows.append(
+                    {
+                        "season": int(season),
+                        "episode": int(episode),
+                        "episodeid": int(eid),
+                        "file": path or "",
+                    }
+                )
+            except (TypeError, ValueError):
+                return None
+        return cls(tvshow_id, rows, built=data.get("built") or 0)
+
+
+def _cache_path() -> str | None:
+    return profile_path(CACHE_FILENAME)
+
+
+def _load() -> dict:
+    global _cache
+    if _cache is None:
+        data = read_json(_cache_path(), default=None)
+        shows = {}
+        if isinstance(data, dict) and data.get("schema") == SCHEMA:
+            raw = data.get("shows")
+            if isinstance(raw, dict):
+                for key, entry in raw.items():
+                    tvshow_id = parse_int(key)
+                    if not tvshow_id or not isinstance(entry, dict):
+                        continue
+                    index = ShowEpisodeIndex.from_json(tvshow_id, entry)
+                    if index is not None:
+                        shows[tvshow_id] = index
+        _cache = shows
+    return _cache
+
+
+def _save(shows) -> bool:
+    return write_json(
+        _cache_path(),
+        {"schema": SCHEMA, "shows": {str(k): v.to_json() for k, v in shows.items()}},
+        compact=True,
+    )
+
+
+def _fetch_rows(tvshow_id):
+    r = jsonrpc(
+        "VideoLibrary.GetEpisodes",
+        {"tvshowid": int(tvshow_id), "properties": _INDEX_PROPERTIES},
+        log_errors=False,
+    )
+    if r.get("error") or "result" not in r:
+        return None
+    rows = []
+    for ep in (r.get("result") or {}).get("episodes") or []:
+        eid = parse_int(ep.get("episodeid"))
+        season = parse_int(ep.get("season"))
+        episode = parse_int(ep.get("episode"))
+        if not eid or season is None or episode is None:
+            continue
+        rows.append(
+            {"episodeid": eid, "season": season, "episode": episode, "file": ep.get("file") or ""}
+        )
+    return rows
+
+
+def episode_index(tvshow_id, *, refresh=False):
+    """``ShowEpisodeIndex`` for ``tvshow_id`` (built on first use), or None when unavailable."""
+    tvshow_id = parse_int(tvshow_id)
+    if not tvshow_id:
+        return None
+    with _lock:
+        shows = _load()
+        index = shows.get(tvshow_id)
+        if (
+            index is not None
+            and not refresh
+            and 0 <= time.time() - index.built <= INDEX_MAX_AGE_S
+        ):
+            return index
+        rows = _fetch_rows(tvshow_id)
+        if rows is None:
+            return None
+        index = ShowEpisodeIndex(tvshow_id, rows)
+        shows[tvshow_id] = index
+        if len(shows) > MAX_SHOWS:
+            by_age = sorted(shows, key=lambda k: shows[k].built)
+            for old in by_age[: len(shows) - MAX_SHOWS]:
+                shows.pop(old, None)
+        _save(shows)
+        _rlog(
+            "Library episode index: tvshowid=%s %d episode(s) in %d season(s)"
+            % (tvshow_id, len(index), len({k[0] for k in index.keys}))
+        )
+        return index
+
+
+def invalidate_show(tvshow_id) -> bool:
+    tvshow_id = parse_int(tvshow_id)
+    with _lock:
+        shows = _load()
+        if shows.pop(tvshow_id, None) is None:
+            return False
+        _save(shows)
+        return True
+
+
+def invalidate_all() -> bool:
+    with _lock:
+        shows = _load()
+        if not shows:
+            return False
+        shows.clear()
+        _save(shows)
+        return True
+
+
+def note_library_update(method, data) -> bool:
+    """
+    Drop indexes a ``VideoLibrary.OnUpdate`` / ``OnRemove`` notification may have changed.
+    Returns True when the notification touched the library's episode layout.
+
+    Only rows the scanner adds or refreshes (``added`` in the data) and removals count.
+    Watched-state and resume-point updates carry no ``added`` key; they fire at every
+    episode end and leave the indexes alone.
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data) if data else {}
+        except ValueError:
+            data = {}
+    if not isinstance(data, dict):
+        data = {}
+    item = data.get("item") if isinstance(data.get("item"), dict) else data
+    kind = str(item.get("type") or "").lower()
+    item_id = parse_int(item.get("id"))
+    removed = method.endswith("OnRemove")
+    added = "added" in data
+    if kind in ("movie", "musicvideo", "set"):
+        return False
+    if kind == "tvshow" and item_id:
+        invalidate_show(item_id)
+        return True
+    if kind != "episode" or not item_id:
+        invalidate_all()
+        return True
+    if not removed and not added:
+        return False
+    with _lock:
+        owner = None
+        for tvshow_id, index in _load().items():
+            if index.has_episode_id(item_id):
+                owner = tvshow_id
+                break
+    if owner is None:
+        # A new episode of some show: its index (if any) cannot be told apart here.
+        invalidate_all()
+    else:
+        invalidate_show(owner)
+    return True
+
+
+def clear_cache() -> None:
+    global _cache
+    with _lock:
+        _cache = None
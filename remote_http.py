@@ -23,6 +23,13 @@ from settings_utils import (
     log_service_detail,
     parse_kodi_jsonrpc_raw,
 )
+from remote_http_pool import http_open
+from remote_response_cache import (
+    conditional_headers,
+    not_modified_response,
+    remember_response,
+)
+
 ADDON_ID = "service.skippy"
 
 # Settings tv_online_merge_priority / movie_online_merge_priority — UI labels them
@@ -58,6 +65,13 @@ _REMOTE_FETCH_COOL_UNTIL = {}
 # Consecutive qualifying failures per bucket (reset on success). Drives exponential backoff.
 _REMOTE_FETCH_FAILURE_STREAK = {}
 
+# Second value of fetch_remote_json_outcome, so provider lookups can tell "404 / no data"
+# from a failure. FETCH_SKIPPED is for providers that made no request (missing ids).
+FETCH_OK = "ok"
+FETCH_NOT_FOUND = "not_found"
+FETCH_FAILED = "failed"
+FETCH_SKIPPED = "skipped"
+
 _SXXEXX = re.compile(r"[Ss](\d{1,2})[Ee](\d{1,2})")
 
 _REMOTE_BACKOFF_CAP_SECONDS = 3600
@@ -121,6 +135,56 @@ def jsonrpc(method, params=None, log_errors=True):
     return data
 
 
+# Set to False once this Kodi build answers a batch array with anything but an array;
+# later batches then go out as single calls for the rest of the session.
+_jsonrpc_batch_supported = None
+
+
+def jsonrpc_batch(calls, log_errors=True):
+    """
+    Send ``calls`` (``(method, params)`` pairs) as one JSON-RPC batch array: one
+    serialization and one trip through Kodi's JSON-RPC lock instead of one per call.
+
+    Returns one response dict per call, in order ({} when Kodi did not answer a call).
+    Falls back to one ``jsonrpc`` per call when the build does not support batches.
+    """
+    global _jsonrpc_batch_supported
+    calls = list(calls or [])
+    if not calls:
+        return []
+    if len(calls) == 1 or _jsonrpc_batch_supported is False:
+        return [jsonrpc(m, p, log_errors=log_errors) for m, p in calls]
+    payload = []
+    for i, (method, params) in enumerate(calls, 1):
+        entry = {"jsonrpc": "2.0", "id": i, "method": method}
+        if params is not None:
+            entry["params"] = params
+        payload.append(entry)
+    names = ", ".join(m for m, _p in calls)
+    try:
+        raw = xbmc.executeJSONRPC(json.dumps(payload))
+        data = json.loads(raw) if isinstance(raw, str) else None
+    except (TypeError, ValueError, AttributeError) as exc:
+        _rlog("JSON-RPC batch failed for %s: %s" % (names, exc))
+        return [{} for _c in calls]
+    if not isinstance(data, list):
+        _jsonrpc_batch_supported = False
+        _rlog("JSON-RPC batch not answered with an array — using single calls this session")
+        return [jsonrpc(m, p, log_errors=log_errors) for m, p in calls]
+    _jsonrpc_batch_supported = True
+    by_id = {}
+    for row in data:
+        if isinstance(row, dict) and isinstance(row.get("id"), int):
+            by_id[row["id"]] = row
+    responses = []
+    for i, (method, _params) in enumerate(calls, 1):
+        row = by_id.get(i) or {}
+        if row.get("error") and log_errors:
+            _rlog("JSON-RPC error for %s: %s" % (method, row.get("error")))
+        responses.append(row)
+    return responses
+
+
 def _addon_version():
     addon = get_addon()
     if not addon:
@@ -258,13 +322,21 @@ def _remote_fetch_mark_success(bucket):
 
 
 def fetch_remote_json(url, source_name, extra_headers=None):
+    return fetch_remote_json_outcome(url, source_name, extra_headers)[0]
+
+
+def fetch_remote_json_outcome(url, source_name, extra_headers=None):
+    """
+    Like ``fetch_remote_json`` but returns ``(data, outcome)``: ``FETCH_OK`` with the parsed
+    JSON, ``FETCH_NOT_FOUND`` for a 404, else ``FETCH_FAILED`` (data None).
+    """
     bucket = _remote_cooldown_bucket(source_name)
     if _remote_fetch_cooldown_active(bucket):
         _rlog(
             "%s: skipping request (%s cooldown active — reduce spam after errors)"
             % (source_name, bucket)
         )
-        return None
+        return None, FETCH_FAILED
 
     _rlog("%s lookup request -> %s" % (source_name, _safe_log_url(url)))
     headers = {
@@ -275,35 +347,55 @@ def fetch_remote_json(url, source_name, extra_headers=None):
         for k, v in extra_headers.items():
             if v is not None and str(v).strip():
                 headers[k] = str(v).strip()
-    request = Request(
-        url,
-        headers=headers,
-    )
+    conditional = conditional_headers(url)
+    not_modified = False
     try:
-        with closing(urlopen(request, timeout=REMOTE_LOOKUP_TIMEOUT)) as response:
-            body = response.read().decode("utf-8")
+        with closing(
+            http_open(url, headers=dict(headers, **conditional), timeout=REMOTE_LOOKUP_TIMEOUT)
+        ) as response:
+            response_headers = response.headers
+            if conditional and getattr(response, "status", 200) == 304:
+                not_modified = True
+                body = ""
+            else:
+                body = response.read().decode("utf-8")
     except HTTPError as exc:
-        if exc.code == 404:
+        if exc.code == 304 and conditional:
+            # urlopen (proxy fallback) reports 304 as an HTTPError.
+            not_modified = True
+            body = ""
+        elif exc.code == 404:
             _rlog(f"{source_name} lookup returned 404 (no metadata match)")
+            return None, FETCH_NOT_FOUND
         else:
             _rlog(f"{source_name} lookup failed with HTTP {exc.code}")
             _remote_fetch_begin_failure_cooldown(bucket, source_name, exc)
-        return None
+            return None, FETCH_FAILED
     except URLError as exc:
         _rlog(f"{source_name} lookup failed: {exc.reason}")
         _remote_fetch_begin_failure_cooldown(bucket, source_name, None)
-        return None
+        return None, FETCH_FAILED
     except Exception as exc:
         _rlog(f"{source_name} lookup failed: {exc}")
         _remote_fetch_begin_failure_cooldown(bucket, source_name, None)
-        return None
+        return None, FETCH_FAILED
+
+    if not_modified:
+        data = not_modified_response(url)
+        if data is None:
+            # Stored body vanished between the request and the 304; ask again unconditionally.
+            return fetch_remote_json_outcome(url, source_name, extra_headers)
+        _rlog(f"{source_name} lookup: 304 Not Modified (reusing stored response)")
+        _remote_fetch_mark_success(bucket)
+        return data, FETCH_OK
 
     try:
         data = json.loads(body)
     except (TypeError, ValueError, json.JSONDecodeError) as exc:
         _rlog(f"{source_name} lookup returned invalid JSON: {exc}")
         _remote_fetch_begin_failure_cooldown(bucket, source_name, None)
-        return None
+        return None, FETCH_FAILED
 
+    remember_response(url, response_headers, data)
     _remote_fetch_mark_success(bucket)
-    return data
+    return data, FETCH_OK
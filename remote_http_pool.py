@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""Per-host keep-alive HTTP(S) connections for the remote lookup / upload APIs.
+
+``urlopen`` opens (and TLS-handshakes) a fresh socket for every request. The online
+providers are a handful of fixed hosts hit several times per episode (lookup, TMDB
+enrichment, successor prefetch, uploads), so idle ``http.client`` connections are kept per
+``(scheme, host, port)`` and reused until they have been idle for ``IDLE_TIMEOUT_S``.
+
+``http_open`` mirrors the parts of ``urlopen`` callers rely on: it returns a response with
+``status`` / ``code`` / ``headers`` / ``read()``, raises ``HTTPError`` for 4xx/5xx (body
+readable via ``exc.read()``) and ``URLError`` for transport failures, and follows a few
+redirects. Requests fall back to ``urlopen`` when a proxy is configured for the scheme.
+"""
+
+import http.client
+import io
+import ssl
+import threading
+import time
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, getproxies, urlopen
+
+# Servers commonly drop idle keep-alive sockets after 60s; stay well below that so a reused
+# connection is rarely already closed on the far side.
+IDLE_TIMEOUT_S = 30.0
+MAX_IDLE_PER_HOST = 2
+MAX_REDIRECTS = 3
+
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+# Errors that mean a reused socket was closed by the server between requests.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+# Only these are resent after a stale keep-alive error. A POST (upload) may already have
+# been accepted by the server, so its error is surfaced instead of submitting twice.
+_RETRYABLE_METHODS = ("GET", "HEAD")
+
+_lock = threading.Lock()
+# (scheme, host, port) -> [(connection, last_used_monotonic), ...]
+_idle = {}
+_ssl_context = None
+
+
+class PooledResponse:
+    """Fully-read response; the socket has already gone back to the pool (or been closed)."""
+
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.code = status
+        self.reason = reason
+        self.headers = headers
+        self._body = io.BytesIO(body)
+
+    def read(self, amt=None):
+        return self._body.read() if amt is None else self._body.read(amt)
+
+    def getcode(self):
+        return self.status
+
+    def close(self):
+        self._body.close()
+
+
+def _default_ssl_context():
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def _pool_key(url):
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "").lower()
+    port = parts.port or (443 if scheme == "https" else 80)
+    return scheme, parts.hostname or "", port
+
+
+def _new_connection(key, timeout):
+    scheme, host, port = key
+    if scheme == "https":
+        return http.client.HTTPSConnection(
+            host, port, timeout=timeout, context=_default_ssl_context()
+        )
+    return http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+def _checkout(key, timeout):
+    """Return ``(connection, reused)``; evicts idle connections past ``IDLE_TIMEOUT_S``."""
+    now = time.monotonic()
+    stale = []
+    conn = None
+    with _lock:
+        bucket = _idle.get(key) or []
+        while bucket:
+            candidate, last_used = bucket.pop()
+            if now - last_used > IDLE_TIMEOUT_S:
+                stale.append(candidate)
+                continue
+            conn = candidate
+            break
+        if not bucket:
+            _idle.pop(key, None)
+    for old in stale:
+        old.close()
+    if conn is None:
+        return _new_connection(key, timeout), False
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn, True
+
+
+def _checkin(key, conn):
+    with _lock:
+        bucket = _idle.setdefault(key, [])
+        if len(bucket) < MAX_IDLE_PER_HOST:
+            bucket.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+
+def close_idle_connections():
+    """Close every pooled connection (service shutdown, tests)."""
+    with _lock:
+        buckets = list(_idle.values())
+        _idle.clear()
+    for bucket in buckets:
+        for conn, _last_used in bucket:
+            conn.close()
+
+
+def idle_connection_count():
+    with _lock:
+        return sum(len(b) for b in _idle.values())
+
+
+def _request_target(parts):
+    target = parts.path or "/"
+    if parts.query:
+        target = "%s?%s" % (target, parts.query)
+    return target
+
+
+def _send_once(url, method, headers, data, timeout):
+    key = _pool_key(url)
+    parts = urlsplit(url)
+    target = _request_target(parts)
+    send_headers = dict(headers or {})
+    send_headers.setdefault("Connection", "keep-alive")
+    conn, reused = _checkout(key, timeout)
+    try:
+        try:
+            conn.request(method, target, body=data, headers=send_headers)
+            response = conn.getresponse()
+        except _STALE_CONNECTION_ERRORS:
+            if not reused or str(method).upper() not in _RETRYABLE_METHODS:
+                raise
+            # Server closed the idle socket; retry once on a fresh connection.
+            conn.close()
+            conn = _new_connection(key, timeout)
+            conn.request(method, target, body=data, headers=send_headers)
+            response = conn.getresponse()
+        body = response.read()
+    except BaseException:
+        conn.close()
+        raise
+    if response.will_close:
+        conn.close()
+    else:
+        _checkin(key, conn)
+    return PooledResponse(url, response.status, response.reason, response.headers, body)
+
+
+def _proxied(scheme):
+    try:
+        return bool(getproxies().get(scheme))
+    except Exception:
+        return False
+
+
+def http_open(url, method="GET", headers=None, data=None, timeout=10):
+    """
+    Send one request over a pooled keep-alive connection and return a ``PooledResponse``.
+
+    Raises ``HTTPError`` for status >= 400 and ``URLError`` for connection / TLS / timeout
+    failures, like ``urlopen``.
+    """
+    scheme = urlsplit(url).scheme.lower()
+    if scheme not in ("http", "https") or _proxied(scheme):
+        return urlopen(Request(url, data=data, headers=dict(headers or {}), method=method), timeout=timeout)
+
+    current_url = url
+    current_method = method
+    current_data = data
+    for _hop in range(MAX_REDIRECTS + 1):
+        try:
+            resp = _send_once(current_url, current_method, headers, current_data, timeout)
+        except (OSError, http.client.HTTPException) as exc:
+            raise URLError(exc) from exc
+        location = resp.headers.get("Location") if resp.status in _REDIRECT_CODES else None
+        if not location:
+            break
+        current_url = urljoin(current_url, location)
+        if resp.status == 303 or (resp.status in (301, 302) and current_method != "GET"):
+            current_method = "GET"
+            current_data = None
+    if resp.status >= 400:
+        raise HTTPError(current_url, resp.status, resp.reason, resp.headers, resp._body)
+    return resp
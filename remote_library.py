@@ -4,6 +4,7 @@
 import json
 import os
 import re
+import threading
 import time
 
 import xbmcaddon
@@ -34,10 +35,12 @@ from remote_http import (
     _addon_version,
     _rlog,
     jsonrpc,
+    jsonrpc_batch,
     normalize_imdb_id,
     normalize_numeric_id,
     parse_int,
 )
+from remote_episode_index import episode_index, invalidate_show
 from remote_tmdb import (
     _get_tmdb_api_key,
     _tmdb_api3_json,
@@ -115,29 +118,93 @@ def _episode_from_get_episodes_path(ep_id, path_hint):
     return None
 
 
-def _fetch_episode_details(ep_id, path_hint=None):
-    """Return (episode row dict or None, jsonrpc error or None). Retries with fewer fields on -32602."""
-    det = jsonrpc(
-        "VideoLibrary.GetEpisodeDetails",
-        {"episodeid": ep_id, "properties": _EPISODE_JSONRPC_FIELDS},
-        log_errors=False,
-    )
+# GetEpisodeDetails field list this Kodi build accepts. Starts with the full list; once
+# Kodi rejects it (-32602) and the minimal list works, the minimal list is used for the
+# rest of the session instead of paying the failed round-trip on every lookup.
+_episode_fields = _EPISODE_JSONRPC_FIELDS
+
+_TVSHOW_ROW_FIELDS = ["imdbnumber", "uniqueid"]
+
+# Library rows (GetEpisodeDetails / GetTVShowDetails) fetched while building a playback
+# context: tvshowid, show/episode uniqueid and show imdb are read several times per
+# context, the rows are fetched once. Keyed by ("episode"|"tvshow", id).
+LIBRARY_ROW_TTL_S = 60.0
+LIBRARY_ROW_MAX_ENTRIES = 64
+_library_rows = {}
+_library_rows_lock = threading.Lock()
+
+
+def _cached_library_row(kind, row_id):
+    with _library_rows_lock:
+        hit = _library_rows.get((kind, row_id))
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] > LIBRARY_ROW_TTL_S:
+            _library_rows.pop((kind, row_id), None)
+            return None
+        return hit[1]
+
+
+def _store_library_row(kind, row_id, row):
+    if not row:
+        return
+    with _library_rows_lock:
+        _library_rows[(kind, row_id)] = (time.monotonic(), row)
+        if len(_library_rows) > LIBRARY_ROW_MAX_ENTRIES:
+            oldest = sorted(_library_rows, key=lambda k: _library_rows[k][0])
+            for key in oldest[: len(_library_rows) - LIBRARY_ROW_MAX_ENTRIES]:
+                _library_rows.pop(key, None)
+
+
+def clear_library_rows():
+    """Forget cached library rows (e.g. after a library update)."""
+    with _library_rows_lock:
+        _library_rows.clear()
+
+
+def _episode_details_params(ep_id, fields=None):
+    return {"episodeid": int(ep_id), "properties": fields or _episode_fields}
+
+
+def _note_episode_fields_rejected():
+    global _episode_fields
+    if _episode_fields is not _EPISODE_JSONRPC_FIELDS_MINIMAL:
+        _episode_fields = _EPISODE_JSONRPC_FIELDS_MINIMAL
+        _rlog(
+            "GetEpisodeDetails: using minimal properties (full list rejected by Kodi) "
+            "for this session"
+        )
+
+
+def _fetch_episode_details(ep_id, path_hint=None, first_response=None):
+    """
+    Return (episode row dict or None, jsonrpc error or None). Retries with fewer fields on
+    -32602. ``first_response`` is an already received GetEpisodeDetails answer (batch).
+    """
+    fields = _episode_fields
+    det = first_response
+    if det is None:
+        det = jsonrpc(
+            "VideoLibrary.GetEpisodeDetails",
+            _episode_details_params(ep_id, fields),
+            log_errors=False,
+        )
     ed = (det.get("result") or {}).get("episodedetails") or {}
     if ed:
+        _store_library_row("episode", ep_id, ed)
         return ed, None
     err = det.get("error")
     last_err = err
-    if err and err.get("code") == -32602:
+    if err and err.get("code") == -32602 and fields is not _EPISODE_JSONRPC_FIELDS_MINIMAL:
         det2 = jsonrpc(
             "VideoLibrary.GetEpisodeDetails",
-            {"episodeid": ep_id, "properties": _EPISODE_JSONRPC_FIELDS_MINIMAL},
+            _episode_details_params(ep_id, _EPISODE_JSONRPC_FIELDS_MINIMAL),
             log_errors=False,
         )
         ed2 = (det2.get("result") or {}).get("episodedetails") or {}
         if ed2:
-            _rlog(
-                "GetEpisodeDetails: using minimal properties (full list rejected by Kodi)"
-            )
+            _note_episode_fields_rejected()
+            _store_library_row("episode", ep_id, ed2)
             return ed2, None
         last_err = det2.get("error") or err
     if path_hint:
@@ -146,6 +213,7 @@ def _fetch_episode_details(ep_id, path_hint=None):
             _rlog(
                 "Episode metadata via VideoLibrary.GetEpisodes (path contains filename)"
             )
+            _store_library_row("episode", ep_id, ep_list)
             return ep_list, None
     return None, last_err
 
@@ -462,8 +530,8 @@ def playback_duration_seconds_for_upload(item, video_path):
 
 def resolve_tv_library_successor_episode_item(item):
     """
-    Library-based successor: same show, episode + 1 in-season if present; else
-    first season with number ``season + 1`` and smallest episode number in that season.
+    Library-based successor: the next episode of the same show in (season, episode) order,
+    from the per-show episode index (``remote_episode_index``).
     """
     if not item or (item.get("type") or "").lower() != "episode":
         return None
@@ -472,72 +540,46 @@ def resolve_tv_library_successor_episode_item(item):
     cur_e = parse_int(item.get("episode"))
     if ts is None or cur_s is None or cur_e is None:
         return None
-    try:
-        ts_i = int(ts)
-        cur_si = int(cur_s)
-        cur_ei = int(cur_e)
-    except (TypeError, ValueError):
+    index = episode_index(ts)
+    target_row = index.successor(cur_s, cur_e) if index is not None else None
+    if not target_row:
         return None
+    return _library_episode_item(ts, target_row)
 
-    r = jsonrpc(
-        "VideoLibrary.GetEpisodes",
-        {
-            "tvshowid": ts_i,
-            "season": cur_si,
-            "properties": _GET_EPISODES_PROPERTIES,
-        },
-        log_errors=False,
-    )
-    if r.get("error"):
-        return None
-    eps = (r.get("result") or {}).get("episodes") or []
-    target_row = None
-    for ep in eps:
-        if parse_int(ep.get("episode")) == cur_ei + 1:
-            target_row = ep
-            break
 
-    if not target_row:
-        r2 = jsonrpc(
-            "VideoLibrary.GetEpisodes",
-            {
-                "tvshowid": ts_i,
-                "season": cur_si + 1,
-                "properties": _GET_EPISODES_PROPERTIES,
-            },
-            log_errors=False,
-        )
-        if r2.get("error"):
-            return None
-        eps2 = (r2.get("result") or {}).get("episodes") or []
-        if not eps2:
-            return None
-        ep_nums = []
-        for e in eps2:
-            en = parse_int(e.get("episode"))
-            if en is not None:
-                ep_nums.append(en)
-        if not ep_nums:
-            return None
-        min_e = min(ep_nums)
-        for e in eps2:
-            if parse_int(e.get("episode")) == min_e:
-                target_row = e
-                break
+def resolve_tv_library_lookahead_episode_items(item, count):
+    """
+    Up to ``count`` library episodes after ``item`` in (season, episode) order, as
+    playback-style items (same shape as the successor). Rows that no longer resolve end
+    the list early.
+    """
+    if not item or (item.get("type") or "").lower() != "episode" or count <= 0:
+        return []
+    ts = _resolve_tvshow_id(item)
+    cur_s = parse_int(item.get("season"))
+    cur_e = parse_int(item.get("episode"))
+    if ts is None or cur_s is None or cur_e is None:
+        return []
+    index = episode_index(ts)
+    if index is None:
+        return []
+    out = []
+    for row in index.next_n(cur_s, cur_e, count):
+        ep_item = _library_episode_item(ts, row)
+        if not ep_item:
+            break
+        out.append(ep_item)
+    return out
 
-    if not target_row:
-        return None
 
-    eid = target_row.get("episodeid")
-    try:
-        eid = int(eid)
-    except (TypeError, ValueError):
-        return None
-    if eid <= 0:
-        return None
-    path_hint = target_row.get("file")
+def _library_episode_item(tvshow_id, row):
+    """Playback-style item for an index row (full GetEpisodeDetails row, cached)."""
+    eid = row["episodeid"]
+    path_hint = row.get("file")
     ed, _ = _fetch_episode_details(eid, path_hint)
     if not ed:
+        # Row vanished since the index was built; rebuild it on the next lookup.
+        invalidate_show(tvshow_id)
         return None
     out = {
         "type": "episode",
@@ -583,12 +625,7 @@ def get_show_imdb_id(item):
     except (TypeError, ValueError):
         tvshowid = None
     if tvshowid and tvshowid > 0:
-        det = jsonrpc(
-            "VideoLibrary.GetTVShowDetails",
-            {"tvshowid": tvshowid, "properties": ["imdbnumber", "uniqueid"]},
-            log_errors=False,
-        )
-        td = (det.get("result") or {}).get("tvshowdetails") or {}
+        td = _tvshow_row(tvshowid)
         tuid = td.get("uniqueid") or {}
         imdb = normalize_imdb_id(tuid.get("imdb") or td.get("imdbnumber"))
         if imdb:
@@ -724,13 +761,7 @@ def _resolve_tvshow_id(item):
         pass
     ep_id = _parse_library_episode_id(item)
     if ep_id:
-        det = jsonrpc(
-            "VideoLibrary.GetEpisodeDetails",
-            {"episodeid": ep_id, "properties": ["tvshowid"]},
-            log_errors=False,
-        )
-        ed = (det.get("result") or {}).get("episodedetails") or {}
-        ts = ed.get("tvshowid")
+        ts = _episode_row(ep_id).get("tvshowid")
         try:
             ts = int(ts)
             if ts > 0:
@@ -742,39 +773,90 @@ def _resolve_tvshow_id(item):
     return ts if ts and ts > 0 else None
 
 
-def _tmdb_from_tvshow_row(tvshow_id):
-    det = jsonrpc(
-        "VideoLibrary.GetTVShowDetails",
-        {"tvshowid": int(tvshow_id), "properties": ["uniqueid"]},
-        log_errors=False,
+def _episode_row(episode_id):
+    """GetEpisodeDetails row for ``episode_id`` (cached per playback); {} when unavailable."""
+    episode_id = int(episode_id)
+    row = _cached_library_row("episode", episode_id)
+    if row is None:
+        row, _err = _fetch_episode_details(episode_id)
+    return row or {}
+
+
+def _tvshow_row(tvshow_id, first_response=None):
+    """GetTVShowDetails row (imdbnumber, uniqueid), cached per playback; {} when unavailable."""
+    tvshow_id = int(tvshow_id)
+    row = _cached_library_row("tvshow", tvshow_id)
+    if row is not None:
+        return row
+    det = first_response
+    if det is None:
+        det = jsonrpc(
+            "VideoLibrary.GetTVShowDetails",
+            {"tvshowid": tvshow_id, "properties": _TVSHOW_ROW_FIELDS},
+            log_errors=False,
+        )
+    row = (det.get("result") or {}).get("tvshowdetails") or {}
+    _store_library_row("tvshow", tvshow_id, row)
+    return row
+
+
+def prime_library_metadata(item):
+    """
+    Fetch the library rows a TV context reads (episode details + the show's uniqueid /
+    imdbnumber) in one JSON-RPC batch, so the id layers below answer from the row cache.
+    A second round-trip is only needed when the show id is known only from the episode row.
+    """
+    if not item or (item.get("type") or "").lower() != "episode":
+        return
+    ep_id = _parse_library_episode_id(item)
+    tvshow_id = parse_int(item.get("tvshowid"))
+    if not tvshow_id or tvshow_id <= 0:
+        tvshow_id = None
+    ep_row = _cached_library_row("episode", ep_id) if ep_id else None
+    want_episode = bool(ep_id) and ep_row is None
+    if tvshow_id is None and ep_row:
+        tvshow_id = parse_int(ep_row.get("tvshowid"))
+    want_show = (
+        bool(tvshow_id) and tvshow_id > 0 and _cached_library_row("tvshow", tvshow_id) is None
     )
-    td = (det.get("result") or {}).get("tvshowdetails") or {}
-    uid = td.get("uniqueid") or {}
+    calls = []
+    if want_episode:
+        calls.append(
+            ("VideoLibrary.GetEpisodeDetails", _episode_details_params(ep_id))
+        )
+    if want_show:
+        calls.append(
+            (
+                "VideoLibrary.GetTVShowDetails",
+                {"tvshowid": tvshow_id, "properties": _TVSHOW_ROW_FIELDS},
+            )
+        )
+    if not calls:
+        return
+    responses = jsonrpc_batch(calls, log_errors=False)
+    if want_episode:
+        ed, _err = _fetch_episode_details(ep_id, first_response=responses.pop(0))
+        if tvshow_id is None and ed:
+            tvshow_id = parse_int(ed.get("tvshowid"))
+            if tvshow_id and tvshow_id > 0:
+                _tvshow_row(tvshow_id)
+    if want_show:
+        _tvshow_row(tvshow_id, first_response=responses.pop(0))
+
+
+def _tmdb_from_tvshow_row(tvshow_id):
+    uid = _tvshow_row(tvshow_id).get("uniqueid") or {}
     return normalize_numeric_id(uid.get("tmdb"))
 
 
 def _tvdb_from_tvshow_row(tvshow_id):
-    det = jsonrpc(
-        "VideoLibrary.GetTVShowDetails",
-        {"tvshowid": int(tvshow_id), "properties": ["uniqueid"]},
-        log_errors=False,
-    )
-    td = (det.get("result") or {}).get("tvshowdetails") or {}
-    uid = td.get("uniqueid") or {}
+    uid = _tvshow_row(tvshow_id).get("uniqueid") or {}
     return normalize_numeric_id(uid.get("tvdb"))
 
 
 def _uniqueid_from_episode_row(episode_id):
-    """Minimal GetEpisodeDetails — uniqueid only (imdbnumber is not a valid Episode field)."""
-    det = jsonrpc(
-        "VideoLibrary.GetEpisodeDetails",
-        {"episodeid": int(episode_id), "properties": ["uniqueid"]},
-        log_errors=False,
-    )
-    if det.get("error"):
-        return {}, None
-    ed = (det.get("result") or {}).get("episodedetails") or {}
-    uid = ed.get("uniqueid") or {}
+    """Episode uniqueid + imdb from the (cached) GetEpisodeDetails row."""
+    uid = _episode_row(episode_id).get("uniqueid") or {}
     if not isinstance(uid, dict):
         uid = {}
     imdb = normalize_imdb_id(uid.get("imdb"))
@@ -981,6 +1063,8 @@ def build_tv_episode_context(item, force_tmdb_enrichment=False):
                 )
             return None
 
+    prime_library_metadata(item)
+
     uid = item.get("uniqueid") or {}
     if not isinstance(uid, dict):
         uid = {}
@@ -4,6 +4,7 @@
 import json
 import os
 import re
+import threading
 import time
 
 import xbmcaddon
@@ -28,14 +29,24 @@ from segment_item import SegmentItem
 from skippy_stats import record_online_segments_downloaded
 from remote_http import (
     ADDON_ID,
+    FETCH_FAILED,
+    FETCH_SKIPPED,
     INTRODB_SEGMENTS_URL,
     ONLINE_MERGE_INTRODB_FIRST,
     ONLINE_MERGE_THEINTRODB_FIRST,
+    REMOTE_LOOKUP_TIMEOUT,
     REMOTE_SEGMENT_PAYLOAD_KEYS,
     THEINTRODB_BASE_URL,
     _rlog,
     _safe_log_url,
-    fetch_remote_json,
+    fetch_remote_json_outcome,
+)
+from remote_segment_disk_cache import (
+    KIND_EMPTY,
+    KIND_ERROR,
+    KIND_HIT,
+    load_remote_segments,
+    store_remote_segments,
 )
 from remote_library import (
     build_movie_context,
@@ -44,6 +55,22 @@ from remote_library import (
     playback_duration_seconds_for_upload,
     _get_playing_file_path,
 )
+
+# Shared wall-clock budget for both provider lookups (they run in parallel). Slightly above
+# the per-request socket timeout so a provider that answers near its timeout still counts.
+REMOTE_PROVIDER_DEADLINE_S = REMOTE_LOOKUP_TIMEOUT + 1.0
+
+# _fetch_provider_segments status: every provider answered (data or 404), at least one
+# request failed (HTTP/transport error, cooldown; or a provider was skipped for missing ids
+# and nothing was found), or the deadline cut a provider off.
+LOOKUP_COMPLETE = "complete"
+LOOKUP_FAILED = "failed"
+LOOKUP_PARTIAL = "partial"
+
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
 def build_tv_cache_key(context):
     return (
         context.get("type"),
@@ -182,6 +209,11 @@ def _theintrodb_lookup_api_key():
 
 
 def fetch_theintrodb_segments(context, total_time):
+    return _lookup_theintrodb(context, total_time)[0]
+
+
+def _lookup_theintrodb(context, total_time):
+    """TheIntroDB segments for ``context`` as ``(segments, FETCH_* outcome)``."""
     query = {}
     tmdb_id = context.get("tmdb_id")
     imdb_id = context.get("imdb_id")
@@ -192,13 +224,13 @@ def fetch_theintrodb_segments(context, total_time):
             query["imdb_id"] = imdb_id
         else:
             _rlog("TheIntroDB movie: need tmdb_id or imdb_id in context")
-            return []
+            return [], FETCH_SKIPPED
     else:
         season = context.get("season")
         episode = context.get("episode")
         if season is None or episode is None:
             _rlog("TheIntroDB TV: need season and episode in context")
-            return []
+            return [], FETCH_SKIPPED
         query["season"] = season
         query["episode"] = episode
         if tmdb_id is not None:
@@ -210,7 +242,7 @@ def fetch_theintrodb_segments(context, total_time):
                 "TheIntroDB skipped: need tmdb_id or episode imdb_id in context "
                 "(show_imdb alone is not enough for this API)"
             )
-            return []
+            return [], FETCH_SKIPPED
 
     if total_time is not None:
         try:
@@ -225,14 +257,14 @@ def fetch_theintrodb_segments(context, total_time):
     if api_key:
         extra_headers["Authorization"] = "Bearer %s" % api_key
 
-    payload = fetch_remote_json(
+    payload, outcome = fetch_remote_json_outcome(
         "%s?%s" % (THEINTRODB_BASE_URL, urlencode(query)),
         "TheIntroDB",
         extra_headers=extra_headers or None,
     )
     if not payload:
         _rlog("TheIntroDB: no JSON payload (HTTP error, timeout, or empty body — see messages above)")
-        return []
+        return [], outcome
     segs = _theintrodb_segment_entries(payload, total_time)
     if segs:
         _rlog("TheIntroDB: using %d segment(s) %s" % (len(segs), [(s.segment_type_label, s.start_seconds, s.end_seconds) for s in segs]))
@@ -242,16 +274,21 @@ def fetch_theintrodb_segments(context, total_time):
             "TheIntroDB: response OK but no usable segment windows after normalization (keys=%s)"
             % keys
         )
-    return segs
+    return segs, outcome
 
 
 def fetch_introdb_segments(context, total_time):
+    return _lookup_introdb(context, total_time)[0]
+
+
+def _lookup_introdb(context, total_time):
+    """IntroDB.app segments for ``context`` as ``(segments, FETCH_* outcome)``."""
     imdb_id = context.get("show_imdb_id")
     if not imdb_id:
         _rlog("IntroDB.app lookup skipped: no show IMDb id")
-        return []
+        return [], FETCH_SKIPPED
 
-    payload = fetch_remote_json(
+    payload, outcome = fetch_remote_json_outcome(
         "%s?%s"
         % (
             INTRODB_SEGMENTS_URL,
@@ -267,7 +304,7 @@ def fetch_introdb_segments(context, total_time):
     )
     if not isinstance(payload, dict):
         _rlog("IntroDB.app: response was not a JSON object (got %s)" % type(payload).__name__)
-        return []
+        return [], outcome
 
     out = []
     for segment_name in REMOTE_SEGMENT_PAYLOAD_KEYS:
@@ -306,7 +343,7 @@ def fetch_introdb_segments(context, total_time):
             "IntroDB.app: no segment windows (payload keys=%s)"
             % (list(payload.keys()),)
         )
-    return out
+    return out, outcome
 
 
 def _segments_overlap(a, b, tol=1.5):
@@ -325,6 +362,146 @@ def merge_remote_segments(primary_segs, secondary_segs):
     return sorted(out, key=lambda s: s.start_seconds)
 
 
+def _fetch_provider_segments(context, total_time, deadline_s=None):
+    """
+    Query TheIntroDB and IntroDB.app in parallel under one shared deadline.
+
+    Returns ``(theintrodb_segs, introdb_segs, status)`` with ``status`` one of
+    ``LOOKUP_COMPLETE`` / ``LOOKUP_FAILED`` / ``LOOKUP_PARTIAL``, derived from the outcome
+    each provider returns. A provider that has not answered when the deadline passes
+    contributes ``[]`` (its worker thread is left to finish in the background; the late
+    result is discarded).
+    """
+    if deadline_s is None:
+        deadline_s = REMOTE_PROVIDER_DEADLINE_S
+    providers = (
+        ("theintrodb", _lookup_theintrodb),
+        ("introdb", _lookup_introdb),
+    )
+    results = {}
+    outcomes = {}
+    lock = threading.Lock()
+
+    def _run(name, fetch):
+        try:
+            segs, outcome = fetch(context, total_time)
+        except Exception as exc:
+            _rlog("%s lookup raised: %s" % (name, exc))
+            segs, outcome = [], FETCH_FAILED
+        with lock:
+            results[name] = list(segs or [])
+            outcomes[name] = outcome
+
+    threads = []
+    for name, fetch in providers:
+        t = threading.Thread(
+            target=_run,
+            args=(name, fetch),
+            daemon=True,
+            name="skippy_remote_%s" % name,
+        )
+        t.start()
+        threads.append((name, t))
+
+    deadline = time.monotonic() + max(0.0, float(deadline_s))
+    for _name, t in threads:
+        t.join(max(0.0, deadline - time.monotonic()))
+
+    with lock:
+        snapshot = dict(results)
+        answered = set(outcomes.values())
+    found = any(snapshot.values())
+    # A provider skipped for missing ids may answer once the ids are known, so an empty
+    # result then is not worth remembering as "no data".
+    any_failed = FETCH_FAILED in answered or (FETCH_SKIPPED in answered and not found)
+    missing = [name for name, _t in providers if name not in snapshot]
+    if missing:
+        _rlog(
+            "remote lookup deadline %.1fs reached; using partial results (no answer from %s)"
+            % (float(deadline_s), ", ".join(missing))
+        )
+        status = LOOKUP_PARTIAL
+    elif any_failed:
+        status = LOOKUP_FAILED
+    else:
+        status = LOOKUP_COMPLETE
+    return (
+        snapshot.get("theintrodb", []),
+        snapshot.get("introdb", []),
+        status,
+    )
+
+
+def _store_lookup_result(key, merged, status):
+    """
+    Persist a lookup. Failures become segment-less error entries (retry after
+    ``ERROR_TTL_S``); partial results are not stored, so the next lookup asks the slow
+    provider again.
+    """
+    if status == LOOKUP_PARTIAL:
+        return
+    if status != LOOKUP_COMPLETE:
+        kind = KIND_ERROR
+        merged = []
+    elif merged:
+        kind = KIND_HIT
+    else:
+        kind = KIND_EMPTY
+    store_remote_segments(key, merged, kind)
+
+
+def _merge_for_kind(the_segs, intro_segs, playback_kind):
+    if _online_merge_introdb_primary(playback_kind):
+        return merge_remote_segments(intro_segs, the_segs)
+    return merge_remote_segments(the_segs, intro_segs)
+
+
+def _revalidate_in_background(key, context, total_time, playback_kind, cache):
+    """Refresh a stale disk-cache entry without blocking playback (one worker per key)."""
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    def _worker():
+        try:
+            the_segs, intro_segs, status = _fetch_provider_segments(context, total_time)
+            if status != LOOKUP_COMPLETE:
+                _rlog("remote revalidation %s; keeping stale entry key=%s" % (status, key))
+                return
+            merged = _merge_for_kind(the_segs, intro_segs, playback_kind)
+            _store_lookup_result(key, merged, status)
+            cache[key] = merged
+            _rlog("remote revalidation: %d segment(s) key=%s" % (len(merged), key))
+        except Exception as exc:
+            _rlog("remote revalidation failed key=%s: %s" % (key, exc))
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    threading.Thread(target=_worker, daemon=True, name="skippy_remote_revalidate").start()
+
+
+def _disk_cached_segments(key, context, total_time, playback_kind, cache):
+    """
+    Segments from the persistent remote cache (seeding ``cache``), or None on a miss.
+
+    A recent failure yields ``[]`` until its entry expires and is never copied into
+    ``cache``, so the providers are asked again once it does.
+    """
+    found = load_remote_segments(key)
+    if found is None:
+        return None
+    segs, kind, fresh = found
+    if kind == KIND_ERROR:
+        _rlog("remote lookup failed recently; retrying after the error entry expires key=%s" % (key,))
+        return []
+    cache[key] = list(segs)
+    if not fresh:
+        _revalidate_in_background(key, context, total_time, playback_kind, cache)
+    return list(segs)
+
+
 def _online_merge_introdb_primary(playback_kind):
     """
     playback_kind: 'tv' or 'movie' — which setting key to read.
@@ -370,8 +547,11 @@ def fetch_remote_movie_segments(total_time, cache, snapshot=None):
         _rlog("Remote movie segments skipped: total time not available yet")
         return []
 
-    the_segs = fetch_theintrodb_segments(context, tt)
-    intro_segs = fetch_introdb_segments(context, tt)
+    cached = _disk_cached_segments(key, context, tt, "movie", cache)
+    if cached is not None:
+        return cached
+
+    the_segs, intro_segs, status = _fetch_provider_segments(context, tt)
     if _online_merge_introdb_primary("movie"):
         merged = merge_remote_segments(intro_segs, the_segs)
         _rlog(
@@ -384,7 +564,9 @@ def fetch_remote_movie_segments(total_time, cache, snapshot=None):
             "Remote movie segments: merge order TheIntroDB primary (TheIntroDB=%d, IntroDB=%d pre-merge)"
             % (len(the_segs), len(intro_segs))
         )
-    cache[key] = merged
+    if status != LOOKUP_PARTIAL:
+        cache[key] = merged
+    _store_lookup_result(key, merged, status)
     if merged:
         _rlog("TheIntroDB/IntroDB merge (movie): using %d segment(s)" % len(merged))
         record_online_segments_downloaded(len(merged))
@@ -419,8 +601,11 @@ def fetch_remote_tv_segments_core(item, total_time, cache):
         _rlog("Remote TV segments skipped: total time not available yet")
         return []
 
-    the_segs = fetch_theintrodb_segments(context, tt)
-    intro_segs = fetch_introdb_segments(context, tt)
+    cached = _disk_cached_segments(key, context, tt, "tv", cache)
+    if cached is not None:
+        return cached
+
+    the_segs, intro_segs, status = _fetch_provider_segments(context, tt)
     if _online_merge_introdb_primary("tv"):
         merged = merge_remote_segments(intro_segs, the_segs)
         _rlog(
@@ -435,7 +620,12 @@ def fetch_remote_tv_segments_core(item, total_time, cache):
             "(TheIntroDB=%d, IntroDB.app=%d pre-merge)"
             % (len(merged), len(the_segs), len(intro_segs))
         )
-    cache[key] = merged
+    # Partial (deadline) results are returned but not kept for the session or on disk, so the
+    # next lookup retries the slow provider instead of pinning a one-sided merge. Failures are
+    # stored on disk as short-lived, segment-less error entries.
+    if status != LOOKUP_PARTIAL:
+        cache[key] = merged
+    _store_lookup_result(key, merged, status)
     if merged:
         record_online_segments_downloaded(len(merged))
     else:
@@ -447,7 +637,7 @@ def fetch_remote_tv_segments_core(item, total_time, cache):
 
 
 def _try_tv_prefetch_handoff(item, cache):
-    """Apply successor prefetch when playing file and cache key match; discard prefetch otherwise."""
+    """Apply lookahead prefetch when playing file and cache key match; the entry is kept either way."""
     from prefetch_segment_cache import (
         consume_tv_prefetch_entry,
         peek_tv_prefetch_for_playing_path,
@@ -467,7 +657,7 @@ def _try_tv_prefetch_handoff(item, cache):
     tags = sorted({getattr(s, "source", "?") for s in segs})
 
     if key and exp_key == key and segs:
-        consume_tv_prefetch_entry()
+        consume_tv_prefetch_entry(key)
         cache[key] = list(segs)
         _rlog(
             "TV prefetch handoff: %d segment(s) for %s key=%s sources=%s"
@@ -480,7 +670,6 @@ def _try_tv_prefetch_handoff(item, cache):
         )
         return list(segs)
 
-    consume_tv_prefetch_entry()
     _rlog(
         "TV prefetch handoff rejected (mismatch or empty): expected_key=%s got_key=%s segs=%d"
         % (exp_key, key, len(segs))
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""HTTP validators (ETag / Last-Modified) for remote API responses.
+
+``fetch_remote_json`` stores the parsed body of every response that carried an ``ETag``
+or ``Last-Modified`` header in ``addon_data/service.skippy/remote_response_cache.json``.
+The next request for the same URL sends ``If-None-Match`` / ``If-Modified-Since``; a
+``304 Not Modified`` answer reuses the stored body without a transfer or ``json.loads``.
+Combined with ``remote_segment_disk_cache`` this makes refreshing an expired lookup cheap.
+
+Entries are keyed by a hash of the full URL so API keys in TMDB query strings are never
+written to the profile.
+
+The store holds up to ``MAX_ENTRIES`` bodies, so it is written behind: a new or changed
+body marks it dirty and a timer persists it ``FLUSH_DELAY_S`` later (the same scheme as
+``skippy_stats``). A 304 only refreshes the in-memory ``validated`` time, which reaches
+disk with the next real change. ``flush_response_cache`` writes pending changes at once;
+the service calls it on shutdown.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+
+from skippy_profile_store import profile_path, read_json, write_json
+
+CACHE_FILENAME = "remote_response_cache.json"
+SCHEMA = "skippy_remote_response_cache_v1"
+# Least recently validated entries are evicted beyond this many URLs.
+MAX_ENTRIES = 1500
+FLUSH_DELAY_S = 30.0
+
+_lock = threading.RLock()
+_cache: dict | None = None
+_dirty = False
+_flush_timer: threading.Timer | None = None
+
+
+def _cache_path() -> str | None:
+    return profile_path(CACHE_FILENAME)
+
+
+def _url_key(url) -> str:
+    return hashlib.sha1(str(url).encode("utf-8")).hexdigest()
+
+
+def _load() -> dict:
+    global _cache
+    if _cache is None:
+        data = read_json(_cache_path(), default=None)
+        entries = {}
+        if isinstance(data, dict) and data.get("schema") == SCHEMA:
+            raw = data.get("entries")
+            if isinstance(raw, dict):
+                entries = {k: v for k, v in raw.items() if isinstance(v, dict)}
+        _cache = entries
+    return _cache
+
+
+def _flush() -> bool:
+    global _dirty
+    if _cache is None:
+        return False
+    if not write_json(_cache_path(), {"schema": SCHEMA, "entries": _cache}):
+        # Stay dirty so the next flush retries.
+        return False
+    _dirty = False
+    return True
+
+
+def _mark_dirty() -> None:
+    """Schedule a write-behind flush (caller holds ``_lock``)."""
+    global _dirty, _flush_timer
+    _dirty = True
+    if _flush_timer is None:
+        timer = threading.Timer(FLUSH_DELAY_S, _flush_from_timer)
+        timer.daemon = True
+        timer.name = "skippy-response-cache-flush"
+        _flush_timer = timer
+        timer.start()
+
+
+def _flush_from_timer() -> None:
+    global _flush_timer
+    with _lock:
+        if _flush_timer is threading.current_thread():
+            _flush_timer = None
+        if _dirty:
+            _flush()
+
+
+def flush_response_cache() -> bool:
+    """Write pending changes now. Returns True when the file was written."""
+    global _flush_timer
+    with _lock:
+        timer, _flush_timer = _flush_timer, None
+        if timer is not None:
+            timer.cancel()
+        if not _dirty:
+            return False
+        return _flush()
+
+
+def conditional_headers(url) -> dict:
+    """``If-None-Match`` / ``If-Modified-Since`` for ``url`` when a validated body is stored."""
+    with _lock:
+        entry = _load().get(_url_key(url))
+        if not entry or "data" not in entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+def remember_response(url, response_headers, data) -> bool:
+    """
+    Store ``data`` for ``url`` when the response carried validators; else forget the URL.
+    Returns True when the store changed (it is written behind).
+    """
+    etag = response_headers.get("ETag") if response_headers is not None else None
+    last_modified = (
+        response_headers.get("Last-Modified") if response_headers is not None else None
+    )
+    key = _url_key(url)
+    with _lock:
+        entries = _load()
+        if not etag and not last_modified:
+            if entries.pop(key, None) is None:
+                return False
+            _mark_dirty()
+            return True
+        old = entries.get(key)
+        if (
+            old
+            and old.get("etag") == (etag or None)
+            and old.get("last_modified") == (last_modified or None)
+            and old.get("data") == data
+        ):
+            # Same answer as stored (server ignored the validators): only the age moves.
+            old["validated"] = time.time()
+            return False
+        entries[key] = {
+            "etag": etag or None,
+            "last_modified": last_modified or None,
+            "data": data,
+            "validated": time.time(),
+        }
+        if len(entries) > MAX_ENTRIES:
+            by_age = sorted(entries, key=lambda k: entries[k].get("validated") or 0)
+            for stale in by_age[: len(entries) - MAX_ENTRIES]:
+                entries.pop(stale, None)
+        _mark_dirty()
+        return True
+
+
+def not_modified_response(url):
+    """
+    Stored body for ``url`` after a 304, marking it freshly validated in memory (not worth
+    a rewrite of the store on its own); None when the entry is gone (the caller then
+    retries without validators).
+    """
+    with _lock:
+        entries = _load()
+        entry = entries.get(_url_key(url))
+        if not entry or "data" not in entry:
+            return None
+        entry["validated"] = time.time()
+        return entry["data"]
+
+
+def clear_cache() -> None:
+    """Drop the in-memory store after writing any pending changes."""
+    global _cache
+    with _lock:
+        flush_response_cache()
+        _cache = None
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Persistent cache of merged TheIntroDB / IntroDB.app lookups.
+
+Entries live in ``addon_data/service.skippy/remote_segment_cache.json`` and are keyed by
+the in-memory cache key (``build_tv_cache_key`` for episodes, ``("movie", tmdb, imdb)``
+for movies). Each entry records what the providers answered:
+
+- ``hit``: at least one segment; trusted for ``HIT_TTL_S``.
+- ``empty``: both providers answered with no data (404 / no windows); ``EMPTY_TTL_S``.
+- ``error``: a provider failed; a segment-less "retry after" marker kept for
+  ``ERROR_TTL_S`` so the next playback soon retries, without re-hitting a failing API on
+  every resume. Results cut short by the lookup deadline are not stored at all.
+
+Expired ``hit`` / ``empty`` entries remain usable as *stale* for ``STALE_MAX_AGE_S`` when
+``remote_cache_stale_while_revalidate`` is on: the caller uses them immediately and
+refreshes in the background.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from service_segment_disk_cache import segments_from_rows, segments_to_rows
+from settings_utils import addon_get_bool, get_addon, log_remote
+from skippy_profile_store import profile_path, read_json, write_json
+
+CACHE_FILENAME = "remote_segment_cache.json"
+SCHEMA = "skippy_remote_segment_cache_v1"
+
+KIND_HIT = "hit"
+KIND_EMPTY = "empty"
+KIND_ERROR = "error"
+
+HIT_TTL_S = 7 * 24 * 3600
+EMPTY_TTL_S = 24 * 3600
+ERROR_TTL_S = 10 * 60
+# How long past expiry a hit / empty answer may still be served while revalidating.
+STALE_MAX_AGE_S = 60 * 24 * 3600
+# Oldest entries are evicted beyond this many titles.
+MAX_ENTRIES = 3000
+
+_TTL_BY_KIND = {
+    KIND_HIT: HIT_TTL_S,
+    KIND_EMPTY: EMPTY_TTL_S,
+    KIND_ERROR: ERROR_TTL_S,
+}
+
+_lock = threading.RLock()
+_cache: dict | None = None
+
+
+def _cache_path() -> str | None:
+    return profile_path(CACHE_FILENAME)
+
+
+def cache_key_text(key) -> str:
+    """Stable JSON text for a cache-key tuple (ints and strings survive the round trip)."""
+    return json.dumps(list(key), separators=(",", ":"))
+
+
+def _load() -> dict:
+    global _cache
+    if _cache is None:
+        data = read_json(_cache_path(), default=None)
+        entries = {}
+        if isinstance(data, dict) and data.get("schema") == SCHEMA:
+            raw = data.get("entries")
+            if isinstance(raw, dict):
+                entries = {k: v for k, v in raw.items() if isinstance(v, dict)}
+        _cache = entries
+    return _cache
+
+
+def _save(entries) -> bool:
+    return write_json(_cache_path(), {"schema": SCHEMA, "entries": entries})
+
+
+def stale_while_revalidate_enabled(addon=None) -> bool:
+    ad = addon or get_addon()
+    if not ad:
+        return True
+    return addon_get_bool(ad, "remote_cache_stale_while_revalidate", True)
+
+
+def load_remote_segments(key, *, allow_stale=None):
+    """
+    Cached lookup for ``key`` as ``(segments, kind, fresh)``, or None on a miss.
+
+    ``fresh`` is False for an expired hit / empty answer served under stale-while-revalidate;
+    the caller should refresh it. Error entries carry no segments; expired ones are a miss.
+    """
+    if allow_stale is None:
+        allow_stale = stale_while_revalidate_enabled()
+    now = time.time()
+    with _lock:
+        entry = _load().get(cache_key_text(key))
+        if not entry:
+            return None
+        kind = entry.get("kind")
+        try:
+            expires = float(entry.get("expires") or 0)
+        except (TypeError, ValueError):
+            return None
+        fresh = now < expires
+        if not fresh:
+            if kind == KIND_ERROR or not allow_stale or now >= expires + STALE_MAX_AGE_S:
+                return None
+        segments = [] if kind == KIND_ERROR else segments_from_rows(entry.get("segments"))
+    if segments is None:
+        return None
+    log_remote(
+        "remote disk cache %s (%s): %d segment(s) key=%s"
+        % ("hit" if fresh else "stale", kind, len(segments), key)
+    )
+    return segments, kind, fresh
+
+
+def store_remote_segments(key, segments, kind) -> bool:
+    """Remember a merged lookup result. Returns True when written."""
+    ttl = _TTL_BY_KIND.get(kind)
+    if ttl is None:
+        return False
+    now = time.time()
+    with _lock:
+        entries = _load()
+        entries[cache_key_text(key)] = {
+            "kind": kind,
+            "segments": [] if kind == KIND_ERROR else segments_to_rows(segments or []),
+            "stored": now,
+            "expires": now + ttl,
+        }
+        _evict(entries, now)
+        ok = _save(entries)
+    if not ok:
+        log_remote("could not write remote segment cache")
+    return ok
+
+
+def _evict(entries, now) -> None:
+    dead = [
+        k
+        for k, v in entries.items()
+        if now >= float(v.get("expires") or 0) + (0 if v.get("kind") == KIND_ERROR else STALE_MAX_AGE_S)
+    ]
+    for k in dead:
+        entries.pop(k, None)
+    if len(entries) > MAX_ENTRIES:
+        by_age = sorted(entries, key=lambda k: entries[k].get("stored") or 0)
+        for k in by_age[: len(entries) - MAX_ENTRIES]:
+            entries.pop(k, None)
+
+
+def clear_cache() -> None:
+    global _cache
+    with _lock:
+        _cache = None
@@ -30,6 +30,7 @@ from remote_library import (  # noqa: F401
     library_title_identity,
     paths_refer_to_same_video,
     playback_duration_seconds_for_upload,
+    resolve_tv_library_lookahead_episode_items,
     resolve_tv_library_successor_episode_item,
 )
 from remote_lookup import (  # noqa: F401
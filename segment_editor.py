@@ -8,7 +8,7 @@ import xbmcgui
 import xbmcvfs
 
 from keymap_utils import install_editor_keymap
-from settings_utils import skippy_notification_icon
+from settings_utils import addon_set_setting, skippy_notification_icon
 from segment_editor_utils import (
     get_addon,
     log,
@@ -193,7 +193,7 @@ def discover_editor_remote_button(addon):
         _skippy_toast(addon, "Editor button discovery cancelled", 2500)
         return
     if remote_tag:
-        addon.setSetting("segment_editor_remote_button", remote_tag)
+        addon_set_setting(addon, "segment_editor_remote_button", remote_tag)
         install_editor_keymap(addon, notify=False)
         _skippy_toast(addon, f"Editor remote set: {remote_tag}", 4500)
         log_always(
@@ -207,7 +207,7 @@ def discover_editor_remote_button(addon):
         return
 
     value = f"key:{button_code}"
-    addon.setSetting("segment_editor_remote_button", value)
+    addon_set_setting(addon, "segment_editor_remote_button", value)
     install_editor_keymap(addon, notify=False)
     _skippy_toast(addon, f"Editor remote set: {value}", 4500)
     log_always(
@@ -1,11 +1,12 @@
 import xbmc
 import unicodedata
 
+from segment_timeline import SegmentTimeline
 from settings_utils import get_addon, log_segment, log_segment_detail
 
 
-def log(msg):
-    log_segment(msg)
+def log(msg, *args):
+    log_segment(msg, *args)
 
 
 def _ascii_log_text(msg):
@@ -22,6 +23,9 @@ def normalize_label(text):
     return unicodedata.normalize("NFKC", text or "").strip().lower()
 
 
+_new_segment = object.__new__
+
+
 # Polling / floating-point slack at boundaries so we do not miss a segment when
 # getTime() falls just outside [start, end]. Strict match is preferred; lenient
 # match picks a single nearest segment when none are strictly active.
@@ -36,38 +40,97 @@ def segment_is_active_lenient(segment, current_time, tol=None):
     return (segment.start_seconds - tol) <= t <= (segment.end_seconds + tol)
 
 
-def segments_active_for_playback(segments, current_time, tol=None):
+# Bisect queries are widened by this much and then re-checked with the exact comparison,
+# so float rounding in ``start - tol`` vs ``t + tol`` cannot drop a boundary match.
+_INDEX_SLACK_S = 1e-6
+
+def build_segment_index(segments):
+    """
+    ``(timeline, positions)`` for ``segments`` in any order: a ``SegmentTimeline`` over the
+    list sorted by start, and each sorted entry's position in ``segments``. Valid for any
+    list with the same windows in the same order (e.g. a clone); raises on non-numeric
+    bounds.
+    """
+    order = sorted(range(len(segments)), key=lambda i: float(segments[i].start_seconds))
+    return SegmentTimeline([segments[i] for i in order]), tuple(order)
+
+
+def segments_near_time(segments, current_time, tol=None, index=None):
+    """
+    Segments whose window expanded by ``tol`` on both sides contains ``current_time``, in
+    input order. With ``index`` (``build_segment_index`` over the same windows) the lookup
+    is a ``bisect``; without it, a linear scan.
+    """
+    if tol is None:
+        tol = SEGMENT_PLAYBACK_TOLERANCE
+    t = float(current_time)
+    if not segments:
+        return []
+    if index is None or len(index[1]) != len(segments):
+        near = []
+        for s in segments:
+            try:
+                if (float(s.start_seconds) - tol) <= t <= (float(s.end_seconds) + tol):
+                    near.append(s)
+            except (TypeError, ValueError, AttributeError):
+                continue
+        return near
+    timeline, positions = index
+    hits = sorted(
+        positions[i] for i in timeline.active_indices(t, lenient_s=tol + _INDEX_SLACK_S)
+    )
+    return [
+        s
+        for s in (segments[i] for i in hits)
+        if (s.start_seconds - tol) <= t <= (s.end_seconds + tol)
+    ]
+
+
+def segments_active_for_playback(segments, current_time, tol=None, index=None):
     """
     Segments to treat as active for skip/dialog logic. Uses strict [start, end] first;
     if none match, includes at most one lenient match (nearest nominal interval, then
     latest start) so adjacent chapters do not both prompt after a boundary cross.
+    ``index`` is passed through to ``segments_near_time``.
     """
     if tol is None:
         tol = SEGMENT_PLAYBACK_TOLERANCE
     t = float(current_time)
-    if not segments:
+    loose = segments_near_time(segments, t, tol, index)
+    if not loose:
         return []
-    strict = [s for s in segments if s.start_seconds <= t <= s.end_seconds]
+    strict = [s for s in loose if s.start_seconds <= t <= s.end_seconds]
     if strict:
         return strict
-    loose = [
-        s for s in segments if (s.start_seconds - tol) <= t <= (s.end_seconds + tol)
-    ]
-    if not loose:
-        return []
 
     def dist_outside(s):
-        if s.start_seconds <= t <= s.end_seconds:
-            return 0.0
         if t < s.start_seconds:
             return s.start_seconds - t
         return t - s.end_seconds
 
-    loose.sort(key=lambda s: (dist_outside(s), -s.start_seconds))
-    return [loose[0]]
+    return [min(loose, key=lambda s: (dist_outside(s), -s.start_seconds))]
 
 
 class SegmentItem:
+    """
+    One skip window. Slotted: the service clones whole segment lists on every cache hit,
+    so instances carry no ``__dict__`` and copy through ``with_jump`` / ``__copy__``
+    without going through ``copy``'s reduce protocol. Construction does not log; parse
+    sites log what they produced.
+    """
+
+    __slots__ = (
+        "start_seconds",
+        "end_seconds",
+        "source",
+        "segment_type_label",
+        "action_type",
+        "timeout",
+        "allow_input",
+        "next_segment_start",  # jump target for overlapping/nested skips
+        "next_segment_info",  # describes the segment at next_segment_start
+    )
+
     def __init__(self, start_seconds, end_seconds, label="segment", source="edl", action_type=None, timeout=5.0, allow_input=True, next_segment_start=None, next_segment_info=None):
         if end_seconds < start_seconds:
             raise ValueError(f"Segment end time ({end_seconds}) must be after start time ({start_seconds})")
@@ -79,10 +142,25 @@ class SegmentItem:
         self.action_type = normalize_label(action_type) if action_type else None
         self.timeout = timeout
         self.allow_input = allow_input
-        self.next_segment_start = next_segment_start  # New attribute for overlapping/nested skips
-        self.next_segment_info = next_segment_info  # New attribute for describing the next segment
-
-        log_segment(f"🧩 New SegmentItem created: {self}")
+        self.next_segment_start = next_segment_start
+        self.next_segment_info = next_segment_info
+
+    def with_jump(self, next_segment_start=None, next_segment_info=None):
+        """Copy of this segment with the given jump target (labels are not re-normalized)."""
+        clone = _new_segment(SegmentItem)
+        clone.start_seconds = self.start_seconds
+        clone.end_seconds = self.end_seconds
+        clone.source = self.source
+        clone.segment_type_label = self.segment_type_label
+        clone.action_type = self.action_type
+        clone.timeout = self.timeout
+        clone.allow_input = self.allow_input
+        clone.next_segment_start = next_segment_start
+        clone.next_segment_info = next_segment_info
+        return clone
+
+    def __copy__(self):
+        return self.with_jump(self.next_segment_start, self.next_segment_info)
 
     def is_active(self, current_time):
         return self.start_seconds <= current_time <= self.end_seconds
@@ -98,10 +176,9 @@ class SegmentItem:
             "label": self.segment_type_label,
             "source": self.source,
             "action_type": self.action_type,
-            "next_segment_start": self.next_segment_start, # Include new attribute
-            "next_segment_info": self.next_segment_info # Include new attribute
+            "next_segment_start": self.next_segment_start,
+            "next_segment_info": self.next_segment_info,
         }
-        log_segment(f"📦 Converted SegmentItem to dict: {result}")
         return result
 
     def __str__(self):
@@ -112,20 +189,21 @@ class SegmentItem:
 
 # 🔍 Dialog trigger logic — stateless, no caching
 def should_show_skip_dialog(current_time, segments, last_shown_times, debounce_seconds=5):
-    for segment in segments:
-        if segment_is_active_lenient(segment, current_time):
-            segment_id = f"{segment.start_seconds}-{segment.end_seconds}"
-            last_shown = last_shown_times.get(segment_id, 0)
-            time_since_last = abs(current_time - last_shown)
-
-            if time_since_last > debounce_seconds:
-                last_shown_times[segment_id] = current_time
-                log_segment(f"📌 Triggering skip dialog for segment: {segment}")
-                return segment
-            else:
-                log_segment_detail(
-                    f"⏳ Debounce active for segment {segment_id} — last shown {time_since_last:.2f}s ago"
-                )
+    for segment in segments_near_time(segments, current_time):
+        segment_id = f"{segment.start_seconds}-{segment.end_seconds}"
+        last_shown = last_shown_times.get(segment_id, 0)
+        time_since_last = abs(current_time - last_shown)
+
+        if time_since_last > debounce_seconds:
+            last_shown_times[segment_id] = current_time
+            log_segment("📌 Triggering skip dialog for segment: %s", segment)
+            return segment
+        else:
+            log_segment_detail(
+                "⏳ Debounce active for segment %s — last shown %.2fs ago",
+                segment_id,
+                time_since_last,
+            )
     log_segment_detail("🔕 No eligible segment found for skip dialog at current time")
     return None
 
@@ -35,6 +35,7 @@ from segment_editor_utils import (
 from addon_skin_resolution import get_modal_dialog_layout, get_modal_metrics, init_window_xml_dialog
 from settings_utils import (
     addon_get_bool,
+    addon_set_setting,
     get_edl_label_to_action_map,
     normalize_label,
     get_custom_segment_keyword_labels,
@@ -490,7 +491,7 @@ def discover_remote_button(addon):
         return
     if remote_tag:
         value = remote_tag
-        addon.setSetting("segment_marker_remote_button", value)
+        addon_set_setting(addon, "segment_marker_remote_button", value)
         install_marker_keymap(addon, notify=False)
         show_toast(
             get_localized(addon, 44011, "CEC remote marker button set: %s", value),
@@ -505,7 +506,7 @@ def discover_remote_button(addon):
         return
 
     value = f"key:{button_code}"
-    addon.setSetting("segment_marker_remote_button", value)
+    addon_set_setting(addon, "segment_marker_remote_button", value)
     install_marker_keymap(addon, notify=False)
     show_toast(
         get_localized(addon, 44013, "Remote marker button set: %s", value),
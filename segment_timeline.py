@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Sorted index over a start-ordered segment list.
+
+``SegmentTimeline`` keeps the segments' starts, ends and a running maximum of ends
+in parallel arrays, so the questions the linking passes ask answer with ``bisect``
+instead of rescanning the list per segment:
+
+- forward overlaps of segment *i* (later segments starting before it ends);
+- the first earlier segment that contains segment *i* (first prefix max >= its end);
+- segments active at *t* (or anywhere in a window) and the next start/end after *t*.
+
+The arrays reference the same segment objects, so attribute writes made while walking
+the timeline (jump targets) land on the caller's list. Starts/ends are captured at
+build time; rebuild after changing a segment's window.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from segment_relations import (
+    RELATION_NESTED,
+    RELATION_OVERLAPPING,
+    is_nested_segment,
+    is_overlapping_segment,
+)
+
+
+class SegmentTimeline:
+    """Index over ``segments``; expects them sorted by ``start_seconds``."""
+
+    def __init__(self, segments):
+        self.segments = list(segments or [])
+        self.starts = [float(s.start_seconds) for s in self.segments]
+        self.ends = [float(s.end_seconds) for s in self.segments]
+        self._max_end = list(accumulate(self.ends, max))
+        self._edges = sorted(set(self.starts) | set(self.ends))
+
+    def __len__(self):
+        return len(self.segments)
+
+    def forward_overlaps(self, index):
+        """
+        Yield ``(other, relation)`` for later segments starting before ``segments[index]``
+        ends; same contract as ``segment_relations.iter_forward_overlaps``.
+        """
+        current = self.segments[index]
+        stop = bisect_left(self.starts, self.ends[index], index + 1)
+        for j in range(index + 1, stop):
+            candidate = self.segments[j]
+            if is_nested_segment(current, candidate):
+                yield candidate, RELATION_NESTED
+            elif is_overlapping_segment(current, candidate):
+                yield candidate, RELATION_OVERLAPPING
+            else:
+                yield candidate, None
+
+    def first_container(self, index):
+        """Earliest segment before ``index`` that fully contains it, or None."""
+        if index <= 0:
+            return None
+        j = bisect_left(self._max_end, self.ends[index], 0, index)
+        if j >= index:
+            return None
+        parent = self.segments[j]
+        return parent if is_nested_segment(parent, self.segments[index]) else None
+
+    def nested_pairs(self):
+        """Yield ``(parent, child)`` for every nested pair (parent earlier in the list)."""
+        for i in range(len(self.segments)):
+            for child, relation in self.forward_overlaps(i):
+                if relation == RELATION_NESTED:
+                    yield self.segments[i], child
+
+    def active_indices(self, t, *, lenient_s=0.0):
+        """Indices whose window contains ``t`` (``start - lenient_s <= t <= end + lenient_s``)."""
+        return self.active_between(t, t, lenient_s=lenient_s)
+
+    def active_between(self, t0, t1, *, lenient_s=0.0):
+        """Indices whose (lenient) window contains some playhead in ``[t0, t1]``."""
+        hi = bisect_right(self.starts, t1 + lenient_s)
+        lo = bisect_left(self._max_end, t0 - lenient_s, 0, hi)
+        return [i for i in range(lo, hi) if self.ends[i] + lenient_s >= t0]
+
+    def next_boundary(self, t):
+        """Smallest segment start or end strictly after ``t``, or None."""
+        i = bisect_right(self._edges, t)
+        return self._edges[i] if i < len(self._edges) else None
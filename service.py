@@ -10,12 +10,17 @@ import xbmcvfs
 import xbmcaddon
 
 from settings_utils import (
+    SKIPPY_LOG_ALL,
     addon_get_bool,
+    enable_settings_snapshot,
     get_addon,
     get_localized,
+    invalidate_settings_cache,
+    is_enabled,
     log,
     log_always,
     log_service_detail,
+    notify_skippy,
     parse_kodi_jsonrpc_raw,
     skippy_notification_icon,
 )
@@ -44,24 +49,42 @@ from service_segment_processing import (
     should_suppress_segment_dialog,
 )
 from service_main_loop import ServiceLoopBindings, run_service_main_loop
+from service_wake_scheduler import PlaybackWakeScheduler, WakingPlayer
+from remote_http_pool import close_idle_connections
+from remote_response_cache import flush_response_cache
+from remote_episode_index import note_library_update
+from remote_library import clear_library_rows
+from skippy_stats import flush_statistics
+from skippy_log_sink import dump_log_tail, start_log_sink, stop_log_sink
+from per_show_overrides import load_override_store
 from service_skip_dialog_skin import (
     _skip_dialog_layout_suffix,
     warm_skip_dialog_skin_textures,
 )
 
 
-def log_if_changed(key, msg):
-    """Only log if the message is different from the last logged message for this key."""
-    if key not in monitor._last_log_state or monitor._last_log_state[key] != msg:
-        monitor._last_log_state[key] = msg
-        log(msg)
+def log_if_changed(key, msg, *args):
+    """Only log if the message is different from the last logged message for this key.
+
+    Takes ``msg, *args`` like ``log``; the unformatted pair is compared, so unchanged ticks
+    (and every tick while logging is off) do no string formatting.
+    """
+    if not is_enabled():
+        return
+    state = (msg, args)
+    if monitor._last_log_state.get(key) != state:
+        monitor._last_log_state[key] = state
+        log(msg, *args)
 
 
-def log_detail_if_changed(key, msg, *, tag="service"):
+def log_detail_if_changed(key, msg, *args, tag="service"):
     """All-detail equivalent of log_if_changed (same-text ticks stay quiet)."""
-    if key not in monitor._last_log_state or monitor._last_log_state[key] != msg:
-        monitor._last_log_state[key] = msg
-        log_service_detail(msg, tag=tag)
+    if not is_enabled(SKIPPY_LOG_ALL):
+        return
+    state = (msg, args)
+    if monitor._last_log_state.get(key) != state:
+        monitor._last_log_state[key] = state
+        log_service_detail(msg, *args, tag=tag)
 
 CHECK_INTERVAL = 1
 SIDECAR_MTIME_CHECK_INTERVAL = 5
@@ -76,13 +99,13 @@ class PlayerMonitor(xbmc.Monitor):
         super().__init__()
         init_playback_session(self)
         clear_deferred_remote_probe_state(self)
+        self.wake_scheduler = PlaybackWakeScheduler()
 
     def onNotification(self, sender, method, data):
         """Open segment editor when triggered via JSON-RPC NotifyAll (legacy: service.segmenteditor)."""
         try:
             ignored_methods = {
                 "AudioLibrary.OnUpdate",
-                "VideoLibrary.OnUpdate",
                 "GUI.OnScreensaverActivated",
                 "GUI.OnScreensaverDeactivated",
                 "VideoLibrary.OnScanStarted",
@@ -93,6 +116,15 @@ class PlayerMonitor(xbmc.Monitor):
             if method in ignored_methods:
                 return
 
+            if method in ("VideoLibrary.OnUpdate", "VideoLibrary.OnRemove"):
+                if note_library_update(method, data):
+                    clear_library_rows()
+                return
+
+            if method.endswith("dump_log_buffer"):
+                _dump_log_buffer()
+                return
+
             try:
                 if isinstance(data, str):
                     data_lower = data.lower()
@@ -117,6 +149,9 @@ class PlayerMonitor(xbmc.Monitor):
             log(f"onNotification handler error: {exc}")
 
     def onSettingsChanged(self):
+        invalidate_settings_cache()
+        apply_log_sink_setting()
+        self.wake_scheduler.notify("settings")
         try:
             install_marker_keymap(get_addon())
         except Exception as exc:
@@ -137,8 +172,33 @@ class PlayerMonitor(xbmc.Monitor):
         except Exception as exc:
             log(f"⚠️ Failed to refresh skip dialog skin textures after settings change: {exc}")
 
+def apply_log_sink_setting():
+    """Run the buffered log writer while verbose logging and buffered_log_sink are both on."""
+    addon = get_addon()
+    if (
+        addon
+        and addon_get_bool(addon, "enable_verbose_logging", False)
+        and addon_get_bool(addon, "buffered_log_sink", False)
+    ):
+        start_log_sink()
+    else:
+        stop_log_sink()
+
+
+def _dump_log_buffer():
+    addon = get_addon()
+    saved = dump_log_tail()
+    if saved is None:
+        message = get_localized(addon, 34009, "The log buffer is not running.")
+    else:
+        message = get_localized(
+            addon, 34008, "Saved %d recent log line(s) to log_tail.txt.", saved
+        )
+    notify_skippy(addon, message, title=get_localized(addon, 43000, "Skippy"))
+
+
 monitor = PlayerMonitor()
-player = xbmc.Player()
+player = WakingPlayer(monitor.wake_scheduler)
 
 try:
     warm_skip_dialog_skin_textures(get_addon())
@@ -443,8 +503,11 @@ def _process_deferred_remote_probe_for_playback(video, playback_type):
 
 
 log_always('📡 XML-EDL Intro Skipper service started.')
+enable_settings_snapshot()
+apply_log_sink_setting()
 install_marker_keymap(get_addon())
 install_editor_keymap(get_addon())
+load_override_store()
 
 run_service_main_loop(
     ServiceLoopBindings(
@@ -469,3 +532,8 @@ run_service_main_loop(
         clear_deferred_remote_probe_state=clear_deferred_remote_probe_state,
     )
 )
+
+close_idle_connections()
+flush_response_cache()
+flush_statistics()
+stop_log_sink()
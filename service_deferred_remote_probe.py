@@ -172,6 +172,9 @@ def schedule_deferred_remote_probe(
             "deferred probe complete: path=%r segments=%d"
             % (path, len(remote_list or []))
         )
+        scheduler = getattr(segment_monitor, "wake_scheduler", None)
+        if scheduler is not None:
+            scheduler.notify("remote_probe")
 
     threading.Thread(target=_worker, daemon=True, name="skippy_remote_probe").start()
 
@@ -10,7 +10,10 @@ import xbmc
 from segment_item import segments_active_for_playback
 from segment_relations import segment_id
 from settings_utils import addon_get_int, get_addon, log
-from service_segment_processed_cache import clear_segment_processed_cache
+from service_segment_processed_cache import (
+    clear_segment_processed_cache,
+    current_segments_index,
+)
 from service_skip_seek_property import skippy_seek_grace_active
 from service_loop_skip import clear_last_skipped_segment
 
@@ -122,15 +125,16 @@ def _clear_parent_dismissals_when_inside_nested(ctx: Any, current_time: float) -
 
     ctx.log_if_changed(
         "nested_clear_check",
-        "🔍 Checking nested segment clearing: %d segments, %d dismissed, current_time=%.2f"
-        % (
-            len(monitor.current_segments),
-            len(monitor.recently_dismissed),
-            current_time,
-        ),
+        "🔍 Checking nested segment clearing: %d segments, %d dismissed, current_time=%.2f",
+        len(monitor.current_segments),
+        len(monitor.recently_dismissed),
+        current_time,
     )
 
-    for nested_seg in segments_active_for_playback(monitor.current_segments, current_time):
+    active = segments_active_for_playback(
+        monitor.current_segments, current_time, index=current_segments_index(monitor)
+    )
+    for nested_seg in active:
         nested_seg_id = segment_id(nested_seg)
         parent_seg_id_check = parent_map.get(nested_seg_id)
         if not parent_seg_id_check:
@@ -141,15 +145,13 @@ def _clear_parent_dismissals_when_inside_nested(ctx: Any, current_time: float) -
             continue
 
         ctx.log_if_changed(
-            "nested_check_%s" % (nested_seg_id,),
-            "🔍 Nested segment %s (%s): start=%.2f, end=%.2f, current=%.2f, is_inside=True"
-            % (
-                nested_seg_id,
-                nested_seg.segment_type_label,
-                nested_seg.start_seconds,
-                nested_seg.end_seconds,
-                current_time,
-            ),
+            ("nested_check", nested_seg_id),
+            "🔍 Nested segment %s (%s): start=%.2f, end=%.2f, current=%.2f, is_inside=True",
+            nested_seg_id,
+            nested_seg.segment_type_label,
+            nested_seg.start_seconds,
+            nested_seg.end_seconds,
+            current_time,
         )
 
         if parent_seg_id_check not in monitor.recently_dismissed:
@@ -193,23 +195,22 @@ def _cleanup_skipped_to_nested(ctx: Any, current_time: float) -> None:
     if monitor.skipped_to_nested_segment:
         ctx.log_if_changed(
             "checking_nested",
-            "🔍 Checking %d tracked nested segments at time %.2f"
-            % (len(monitor.skipped_to_nested_segment), current_time),
+            "🔍 Checking %d tracked nested segments at time %.2f",
+            len(monitor.skipped_to_nested_segment),
+            current_time,
         )
 
     segments_to_remove = []
     for parent_seg_id, nested_segment in monitor.skipped_to_nested_segment.items():
         is_nested_active = nested_segment.is_active(current_time)
         ctx.log_if_changed(
-            "nested_check_%s" % (parent_seg_id,),
-            "🔍 Nested segment '%s' (%s-%s) active at %.2f: %s"
-            % (
-                nested_segment.segment_type_label,
-                nested_segment.start_seconds,
-                nested_segment.end_seconds,
-                current_time,
-                is_nested_active,
-            ),
+            ("nested_check", parent_seg_id),
+            "🔍 Nested segment '%s' (%s-%s) active at %.2f: %s",
+            nested_segment.segment_type_label,
+            nested_segment.start_seconds,
+            nested_segment.end_seconds,
+            current_time,
+            is_nested_active,
         )
         if is_nested_active:
             continue
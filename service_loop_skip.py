@@ -30,6 +30,7 @@ from settings_utils import (
     log,
     log_service_detail,
 )
+from service_segment_processed_cache import current_segments_index
 from service_skip_seek_property import mark_skippy_skipping
 from skipdialog import SkipDialog
 
@@ -148,15 +149,15 @@ def process_segment_skips(
 
     ctx.log_if_changed(
         "state_summary",
-        "📊 Current state: prompted=%d items, recently_dismissed=%d items, skipped_to_nested=%d items"
-        % (
-            len(monitor.prompted),
-            len(monitor.recently_dismissed),
-            len(monitor.skipped_to_nested_segment),
-        ),
+        "📊 Current state: prompted=%d items, recently_dismissed=%d items, skipped_to_nested=%d items",
+        len(monitor.prompted),
+        len(monitor.recently_dismissed),
+        len(monitor.skipped_to_nested_segment),
     )
 
-    active_for_playback = segments_active_for_playback(monitor.current_segments, current_time)
+    active_for_playback = segments_active_for_playback(
+        monitor.current_segments, current_time, index=current_segments_index(monitor)
+    )
     active_playback_ids = {segment_id(s) for s in active_for_playback}
 
     land_time = None
@@ -166,17 +167,19 @@ def process_segment_skips(
 
         if should_ignore_as_just_skipped(monitor, seg_id, current_time):
             ctx.log_if_changed(
-                "just_skipped_%s" % (seg_id,),
-                "🚫 Segment %s (%s) ignored — still inside just-skipped window"
-                % (seg_id, segment.segment_type_label),
+                ("just_skipped", seg_id),
+                "🚫 Segment %s (%s) ignored — still inside just-skipped window",
+                seg_id,
+                segment.segment_type_label,
             )
             continue
 
         if seg_id in monitor.recently_dismissed:
             ctx.log_if_changed(
-                "dismissed_%s" % (seg_id,),
-                "🚫 Segment %s (%s) was dismissed — skipping ALL processing"
-                % (seg_id, segment.segment_type_label),
+                ("dismissed", seg_id),
+                "🚫 Segment %s (%s) was dismissed — skipping ALL processing",
+                seg_id,
+                segment.segment_type_label,
             )
             monitor.prompted.add(seg_id)
             continue
@@ -194,9 +197,9 @@ def process_segment_skips(
             monitor.recently_dismissed,
         ):
             ctx.log_if_changed(
-                "suppressed_%s" % (seg_id,),
-                "🚫 Segment %s dialog suppressed due to overlapping/nested segment priority"
-                % (seg_id,),
+                ("suppressed", seg_id),
+                "🚫 Segment %s dialog suppressed due to overlapping/nested segment priority",
+                seg_id,
             )
             continue
 
@@ -204,9 +207,10 @@ def process_segment_skips(
             nested_segment = monitor.skipped_to_nested_segment[seg_id]
             if nested_segment.is_active(current_time):
                 ctx.log_if_changed(
-                    "nested_%s" % (seg_id,),
-                    "🚫 Segment %s dialog suppressed — still in nested segment '%s'"
-                    % (seg_id, nested_segment.segment_type_label),
+                    ("nested", seg_id),
+                    "🚫 Segment %s dialog suppressed — still in nested segment '%s'",
+                    seg_id,
+                    nested_segment.segment_type_label,
                 )
                 continue
             nested_seg_id_defensive = segment_id(nested_segment)
@@ -217,13 +221,11 @@ def process_segment_skips(
                 monitor.prompted.remove(seg_id)
 
         ctx.log_if_changed(
-            "active_seg_%s" % (seg_id,),
-            "🔎 Processing active segment: '%s' [%s-%s]"
-            % (
-                segment.segment_type_label,
-                segment.start_seconds,
-                segment.end_seconds,
-            ),
+            ("active_seg", seg_id),
+            "🔎 Processing active segment: '%s' [%s-%s]",
+            segment.segment_type_label,
+            segment.start_seconds,
+            segment.end_seconds,
         )
         behavior = apply_per_show_override(
             monitor,
@@ -232,36 +234,33 @@ def process_segment_skips(
             segment.segment_type_label,
             get_user_skip_mode(segment.segment_type_label),
         )
-        ctx.log_if_changed(
-            "behavior_%s" % (seg_id,),
-            "🧪 Segment behavior: %s" % behavior,
-        )
+        ctx.log_if_changed(("behavior", seg_id), "🧪 Segment behavior: %s", behavior)
 
         if not show_dialogs:
             ctx.log_if_changed(
-                "dialogs_disabled_%s" % (seg_id,),
-                "🚫 Dialogs disabled — suppressing segment %s" % (seg_id,),
+                ("dialogs_disabled", seg_id),
+                "🚫 Dialogs disabled — suppressing segment %s",
+                seg_id,
             )
             monitor.prompted.add(seg_id)
             continue
         if behavior == "never":
             ctx.log_if_changed(
-                "never_%s" % (seg_id,),
-                "🚫 Skipping dialog for '%s' (never)" % segment.segment_type_label,
+                ("never", seg_id),
+                "🚫 Skipping dialog for '%s' (never)",
+                segment.segment_type_label,
             )
             # Mark prompted so we do not re-resolve skip mode every monitor tick.
             monitor.prompted.add(seg_id)
             continue
 
         ctx.log_if_changed(
-            "active_behavior_%s" % (seg_id,),
-            "🕒 Active segment: %s [%s-%s] → %s"
-            % (
-                segment.segment_type_label,
-                segment.start_seconds,
-                segment.end_seconds,
-                behavior,
-            ),
+            ("active_behavior", seg_id),
+            "🕒 Active segment: %s [%s-%s] → %s",
+            segment.segment_type_label,
+            segment.start_seconds,
+            segment.end_seconds,
+            behavior,
         )
 
         if not is_skip_enabled(playback_type):
@@ -411,16 +410,17 @@ def _handle_ask_skip(
     if monitor.skip_dialog_modal_active:
         ctx.log_if_changed(
             "skip_dialog_in_flight",
-            "⏳ Skip dialog already active — skipping duplicate ask for segment %s"
-            % (seg_id,),
+            "⏳ Skip dialog already active — skipping duplicate ask for segment %s",
+            seg_id,
         )
         return None
 
     if ask_same_seg_on_cooldown(monitor, seg_id):
         ctx.log_if_changed(
-            "ask_cooldown_%s" % (seg_id,),
-            "⏳ Ask cooldown — same segment %s refused within %.0fms"
-            % (seg_id, ASK_SAME_SEG_COOLDOWN_S * 1000),
+            ("ask_cooldown", seg_id),
+            "⏳ Ask cooldown — same segment %s refused within %.0fms",
+            seg_id,
+            ASK_SAME_SEG_COOLDOWN_S * 1000,
         )
         return None
 
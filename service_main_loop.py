@@ -11,6 +11,7 @@ import xbmc
 import xbmcgui
 
 from segment_editor_utils import get_home_window
+from segment_item import segments_near_time
 from service_loop_nested import handle_rewind_and_nested_segments
 from service_loop_playback import handle_replay_detection, handle_video_change
 from service_loop_skip import process_segment_skips
@@ -19,17 +20,22 @@ from service_loop_toast import (
     try_show_online_segments_applied_toast,
 )
 from service_playback_context import refresh_playback_context
+from service_segment_processed_cache import current_segments_index
 from service_skip_seek_property import (
     skippy_seek_grace_active,
     tick_skippy_skipping_property,
 )
+from service_wake_scheduler import MAX_IDLE_SLEEP_S, next_wake_delay
 from settings_utils import log, log_service_detail
+from skippy_stats import flush_statistics
 
 # All-detail only: playhead drift during parse is noise unless the parse was slow.
 PARSE_SLOW_LOG_MS = 200
 # Must match service.py SIDECAR_MTIME_CHECK_INTERVAL (avoid importing service).
 SIDECAR_CHECK_S = 5
 PARSE_LOOKAHEAD_S = 3.0
+# Scheduler mode keeps the fixed cadence this long after playback_ready (toasts, probes).
+SCHEDULER_STARTUP_SETTLE_S = 5.0
 
 
 @dataclass(frozen=True)
@@ -68,20 +74,16 @@ def _skip_input_fingerprint(segments):
     )
 
 
-def _near_skip_window(segments, current_time, boundaries, lookahead=PARSE_LOOKAHEAD_S):
+def _near_skip_window(
+    segments, current_time, boundaries, lookahead=PARSE_LOOKAHEAD_S, index=None
+):
     """True when the playhead is inside or within lookahead of a segment or link boundary."""
     try:
         t = float(current_time)
     except (TypeError, ValueError):
         return True
-    for seg in segments or []:
-        try:
-            start = float(seg.start_seconds)
-            end = float(seg.end_seconds)
-        except (TypeError, ValueError):
-            continue
-        if (start - lookahead) <= t <= (end + lookahead):
-            return True
+    if segments_near_time(segments, t, lookahead, index):
+        return True
     for raw in boundaries or ():
         try:
             boundary = float(raw)
@@ -122,7 +124,8 @@ def _should_parse_segments(ctx: ServiceLoopBindings, video, current_time, playba
     if not proc:
         return True
     boundaries = proc.get("link_boundaries") or ()
-    if _near_skip_window(current or source_segs, current_time, boundaries):
+    index = current_segments_index(monitor) if current else None
+    if _near_skip_window(current or source_segs, current_time, boundaries, index=index):
         return True
     return False
 
@@ -152,8 +155,9 @@ def _parse_segments_with_deferred_probe(ctx: ServiceLoopBindings, video, current
     parse_elapsed_ms = int((time.time() - parse_started) * 1000)
     ctx.log_if_changed(
         "parsed_segments",
-        "📦 Parsed %d segments for playback_type: %s"
-        % (len(ctx.monitor.current_segments), playback_type),
+        "📦 Parsed %d segments for playback_type: %s",
+        len(ctx.monitor.current_segments),
+        playback_type,
     )
 
     try:
@@ -168,10 +172,7 @@ def _parse_segments_with_deferred_probe(ctx: ServiceLoopBindings, video, current
                 tag="playback",
             )
         current_time = refreshed_time
-        log_service_detail(
-            "⏱️ Playback time: %ds" % int(current_time),
-            tag="playback",
-        )
+        log_service_detail("⏱️ Playback time: %ds", int(current_time), tag="playback")
     except RuntimeError:
         pass
 
@@ -237,6 +238,48 @@ def _parse_segments_with_deferred_probe(ctx: ServiceLoopBindings, video, current
     return current_time
 
 
+def _scheduled_delay(ctx: ServiceLoopBindings, current_time) -> float:
+    """Sleep before the next full tick; ``check_interval`` unless scheduler mode applies."""
+    monitor = ctx.monitor
+    scheduler = getattr(monitor, "wake_scheduler", None)
+    if scheduler is None or not scheduler.normal_speed:
+        return ctx.check_interval
+    if not monitor.playback_ready or skippy_seek_grace_active(monitor):
+        return ctx.check_interval
+    if getattr(monitor, "skip_dialog_modal_active", False):
+        return ctx.check_interval
+    try:
+        ready_at = float(getattr(monitor, "playback_ready_time", 0) or 0)
+    except (TypeError, ValueError):
+        ready_at = 0.0
+    if (time.time() - ready_at) < SCHEDULER_STARTUP_SETTLE_S:
+        return ctx.check_interval
+    proc = getattr(monitor, "segment_processed_cache", None) or {}
+    return next_wake_delay(
+        monitor.current_segments,
+        current_time,
+        proc.get("link_boundaries") or (),
+        check_interval=ctx.check_interval,
+        lookahead=PARSE_LOOKAHEAD_S,
+    )
+
+
+def _wait_for_next_tick(ctx: ServiceLoopBindings, delay=None) -> bool:
+    """
+    Sleep until the next tick; True when abort was requested.
+
+    Without ``monitor.wake_scheduler`` this is the fixed ``check_interval`` wait.
+    With it, ``delay`` (default: the idle cap) is used and player callbacks end
+    the wait early.
+    """
+    scheduler = getattr(ctx.monitor, "wake_scheduler", None)
+    if scheduler is None:
+        return ctx.monitor.waitForAbort(ctx.check_interval)
+    if delay is None:
+        delay = MAX_IDLE_SLEEP_S if scheduler.normal_speed else ctx.check_interval
+    return scheduler.wait(ctx.monitor, delay)
+
+
 def run_service_main_loop(ctx: ServiceLoopBindings) -> None:
     """Monitor playback and orchestrate segment skip UI."""
 
@@ -261,7 +304,7 @@ def run_service_main_loop(ctx: ServiceLoopBindings) -> None:
                         "skip_dlg_marker_pending",
                         "⏸️ Skip dialog suppressed — segment marker start is pending",
                     )
-                if ctx.monitor.waitForAbort(ctx.check_interval):
+                if _wait_for_next_tick(ctx, ctx.check_interval):
                     log("🛑 Abort requested — exiting monitor loop")
                     break
                 continue
@@ -275,13 +318,14 @@ def run_service_main_loop(ctx: ServiceLoopBindings) -> None:
             )
 
         if not (ctx.player.isPlayingVideo() or xbmc.getCondVisibility("Player.HasVideo")):
-            if ctx.monitor.waitForAbort(ctx.check_interval):
+            flush_statistics()
+            if _wait_for_next_tick(ctx):
                 log("🛑 Abort requested — exiting monitor loop")
             continue
 
         playback = refresh_playback_context(ctx)
         if playback is None:
-            if ctx.monitor.waitForAbort(ctx.check_interval):
+            if _wait_for_next_tick(ctx, ctx.check_interval):
                 log("🛑 Abort requested — exiting monitor loop")
                 break
             continue
@@ -300,16 +344,14 @@ def run_service_main_loop(ctx: ServiceLoopBindings) -> None:
                 ctx.log_if_changed(
                     "paused_all",
                     "⏸️ Video paused or not playing — skipping ALL segment processing "
-                    "(is_playing=%s, is_paused=%s, fast_path=%s)"
-                    % (
-                        playback.is_playing,
-                        playback.is_paused,
-                        playback.used_pause_fast_path,
-                    ),
+                    "(is_playing=%s, is_paused=%s, fast_path=%s)",
+                    playback.is_playing,
+                    playback.is_paused,
+                    playback.used_pause_fast_path,
                 )
                 if ctx.monitor.last_time == 0:
                     ctx.monitor.last_time = current_time
-                if ctx.monitor.waitForAbort(ctx.check_interval):
+                if _wait_for_next_tick(ctx):
                     log("🛑 Abort requested — exiting monitor loop")
                 continue
             ctx.log_if_changed(
@@ -354,8 +396,8 @@ def run_service_main_loop(ctx: ServiceLoopBindings) -> None:
         if not show_dialogs:
             ctx.log_if_changed(
                 "dialogs_disabled_playback",
-                "🚫 Skip dialogs disabled for %s — segments will not trigger prompts"
-                % playback_type,
+                "🚫 Skip dialogs disabled for %s — segments will not trigger prompts",
+                playback_type,
             )
 
         # The early pass already covered this playhead. Redo the work only when the
@@ -403,6 +445,6 @@ def run_service_main_loop(ctx: ServiceLoopBindings) -> None:
         except RuntimeError:
             ctx.monitor.last_time = current_time
 
-        if ctx.monitor.waitForAbort(ctx.check_interval):
+        if _wait_for_next_tick(ctx, _scheduled_delay(ctx, current_time)):
             log("🛑 Abort requested — exiting monitor loop")
             break
@@ -337,3 +337,9 @@ def invalidate_segment_parse_cache_if_path(video_path, segment_monitor):
         clear_sidecar_probe_cache(segment_monitor, video_path)
     except Exception:
         pass
+    try:
+        from service_segment_disk_cache import forget_sidecar_segments
+
+        forget_sidecar_segments(video_path)
+    except Exception:
+        pass
@@ -325,7 +325,7 @@ def refresh_playback_context(
         log_if_changed("no_video", "⚠ get_video_file() returned None — skipping this cycle")
         return None
 
-    log_if_changed("playback_path", "🎯 Kodi playback path: %s" % video)
+    log_if_changed("playback_path", "🎯 Kodi playback path: %s", video)
 
     try:
         current_time = player.getTime()
@@ -367,7 +367,7 @@ def refresh_playback_context(
             set_player_snapshot(monitor, None)
 
     playback_type = infer_playback_type(player_item) if player_item else ""
-    log_if_changed("playback_type", "🔍 Playback type: '%s'" % playback_type)
+    log_if_changed("playback_type", "🔍 Playback type: '%s'", playback_type)
 
     if not playback_type and video:
         synthetic = {
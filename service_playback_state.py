@@ -56,6 +56,7 @@ def init_playback_session(monitor: Any) -> None:
     monitor.prefetch_tv_scheduled_path = None
     monitor.prefetch_tv_lock = threading.Lock()
     monitor.prefetch_tv_result = None
+    monitor.prefetch_tv_cancel = None
     monitor.deferred_remote_probe_lock = threading.Lock()
 
 
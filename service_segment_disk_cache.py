@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Persistent cache of parsed local sidecar segments (chapter XML / EDL).
+
+Entries live in ``addon_data/service.skippy/segment_parse_cache.json`` and are keyed
+by video path. Each entry remembers the ``_sidecar_signature`` (path, mtime, size)
+and ``_source_settings_signature`` it was parsed under, so a playback start whose
+sidecars and settings are unchanged gets ready-made segments without reading the
+sidecar contents over SMB/NFS. Any mismatch is a miss and the caller re-parses.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from segment_item import SegmentItem
+from settings_utils import log_service_detail
+from skippy_profile_store import profile_path, read_json, write_json
+
+CACHE_FILENAME = "segment_parse_cache.json"
+SCHEMA = "skippy_segment_parse_cache_v1"
+# Oldest entries are evicted beyond this many titles.
+MAX_ENTRIES = 400
+
+_lock = threading.RLock()
+_cache: dict | None = None
+
+
+def _log(msg: str) -> None:
+    log_service_detail(msg, tag="segments")
+
+
+def _cache_path() -> str | None:
+    return profile_path(CACHE_FILENAME)
+
+
+def _jsonable(value):
+    """Signatures are nested tuples; JSON round-trips them as lists."""
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def _load() -> dict:
+    global _cache
+    if _cache is None:
+        data = read_json(_cache_path(), default=None)
+        entries = {}
+        if isinstance(data, dict) and data.get("schema") == SCHEMA:
+            raw = data.get("entries")
+            if isinstance(raw, dict):
+                entries = {k: v for k, v in raw.items() if isinstance(v, dict)}
+        _cache = entries
+    return _cache
+
+
+def _signature_cacheable(sidecar_signature) -> bool:
+    """Only trust signatures where every sidecar was stat'ed successfully."""
+    if not sidecar_signature:
+        return False
+    for row in sidecar_signature:
+        if len(row) < 3 or row[1] is None or row[2] is None:
+            return False
+    return True
+
+
+def segments_to_rows(segments) -> list:
+    """JSON rows for ``SegmentItem`` objects (shared with the remote segment cache)."""
+    return [
+        {
+            "start": float(seg.start_seconds),
+            "end": float(seg.end_seconds),
+            "label": getattr(seg, "segment_type_label", "") or "",
+            "source": getattr(seg, "source", "edl") or "edl",
+            "action_type": getattr(seg, "action_type", None),
+        }
+        for seg in segments
+    ]
+
+
+def segments_from_rows(rows):
+    """Inverse of ``segments_to_rows``; None when any row is malformed."""
+    out = []
+    for row in rows or []:
+        try:
+            out.append(
+                SegmentItem(
+                    float(row["start"]),
+                    float(row["end"]),
+                    row.get("label") or "segment",
+                    source=row.get("source") or "edl",
+                    action_type=row.get("action_type") or None,
+                )
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+    return out
+
+
+def load_sidecar_segments(path, sidecar_signature, settings_signature):
+    """Cached segment list for ``path`` when signatures match; else None."""
+    if not path or not _signature_cacheable(sidecar_signature):
+        return None
+    with _lock:
+        entry = _load().get(path)
+        if not entry:
+            return None
+        if entry.get("sidecar") != _jsonable(sidecar_signature):
+            return None
+        if entry.get("settings") != _jsonable(settings_signature):
+            return None
+        segments = segments_from_rows(entry.get("segments"))
+    if segments is not None:
+        _log("💾 Sidecar segments from disk cache: %d for %s" % (len(segments), path))
+    return segments
+
+
+def store_sidecar_segments(path, sidecar_signature, settings_signature, segments) -> bool:
+    """Remember parsed sidecar segments for ``path``. Returns True when written."""
+    if not path or not segments or not _signature_cacheable(sidecar_signature):
+        return False
+    payload = segments_to_rows(segments)
+    with _lock:
+        entries = _load()
+        entries[path] = {
+            "sidecar": _jsonable(sidecar_signature),
+            "settings": _jsonable(settings_signature),
+            "segments": payload,
+            "stored": time.time(),
+        }
+        if len(entries) > MAX_ENTRIES:
+            by_age = sorted(entries, key=lambda k: entries[k].get("stored") or 0)
+            for key in by_age[: len(entries) - MAX_ENTRIES]:
+                entries.pop(key, None)
+        ok = write_json(_cache_path(), {"schema": SCHEMA, "entries": entries})
+    if not ok:
+        _log("could not write segment parse cache")
+    return ok
+
+
+def forget_sidecar_segments(path) -> None:
+    """Drop the entry for ``path`` (sidecar written by Skippy itself)."""
+    with _lock:
+        entries = _load()
+        if entries.pop(path, None) is not None:
+            write_json(_cache_path(), {"schema": SCHEMA, "entries": entries})
+
+
+def clear_cache() -> None:
+    global _cache
+    with _lock:
+        _cache = None
@@ -1,23 +1,33 @@
 # -*- coding: utf-8 -*-
-"""Schedule library-based prefetch of **online-only** segments for the next TV episode."""
+"""Schedule library-based prefetch of **online-only** segments for the next TV episodes.
+
+The lookahead window (``tv_prefetch_episode_count``, next N library episodes) is fetched in
+order by one background worker, one episode every ``PREFETCH_REQUEST_INTERVAL_S`` at most.
+Scheduling for a new file or resetting playback cancels a worker that is still running.
+"""
 
 from __future__ import annotations
 
 import os
 import threading
 
-from prefetch_segment_cache import clear_prefetch_segment_cache, set_tv_segment_prefetch
+from prefetch_segment_cache import (
+    clear_prefetch_segment_cache,
+    has_tv_prefetch,
+    set_tv_segment_prefetch,
+)
 from remote_segments import (
     build_tv_cache_key,
     build_tv_episode_context,
     fetch_remote_tv_segments_core,
     get_enriched_item_for_path,
-    resolve_tv_library_successor_episode_item,
+    resolve_tv_library_lookahead_episode_items,
     episode_runtime_seconds_for_prefetch,
 )
 from service_online_policy import _normalize_segment_source_priority
 from settings_utils import (
     addon_get_bool,
+    addon_get_int,
     addon_get_setting_text,
     get_addon,
     log,
@@ -26,6 +36,11 @@ from settings_utils import (
 
 _PREFETCH_RUNNING = "running"
 
+LOOKAHEAD_DEFAULT = 2
+LOOKAHEAD_MAX = 5
+# Minimum spacing between online lookups of consecutive lookahead episodes.
+PREFETCH_REQUEST_INTERVAL_S = 2.0
+
 
 def _prefetch_log_detail(msg):
     log_service_detail(msg, tag="prefetch")
@@ -39,8 +54,12 @@ def _segment_sources_summary(segments):
 
 
 def clear_tv_prefetch_thread_state(segment_monitor) -> None:
+    """Forget the scheduled prefetch and cancel a worker that is still fetching."""
     if segment_monitor is None:
         return
+    cancel = getattr(segment_monitor, "prefetch_tv_cancel", None)
+    if cancel is not None:
+        cancel.set()
     lock = getattr(segment_monitor, "prefetch_tv_lock", None)
     if lock is None:
         segment_monitor.prefetch_tv_scheduled_path = None
@@ -51,82 +70,95 @@ def clear_tv_prefetch_thread_state(segment_monitor) -> None:
         segment_monitor.prefetch_tv_result = None
 
 
-def _prefetch_worker(segment_monitor, path):
+def _prefetch_worker(segment_monitor, path, count=LOOKAHEAD_DEFAULT, cancel=None):
+    if cancel is None:
+        cancel = threading.Event()
     try:
         item = get_enriched_item_for_path(path)
         if not item or (item.get("type") or "").lower() != "episode":
-            clear_prefetch_segment_cache()
             _prefetch_log_detail(
-                "prefetch: no library episode row for current file — cleared store"
+                "prefetch: no library episode row for current file — nothing to fetch"
             )
             return
 
-        successor = resolve_tv_library_successor_episode_item(item)
-        if not successor:
-            clear_prefetch_segment_cache()
+        window = resolve_tv_library_lookahead_episode_items(item, count)
+        if not window:
             _prefetch_log_detail(
-                "prefetch: no library successor after S%s E%s — cleared store"
+                "prefetch: no library episode after S%s E%s — nothing to fetch"
                 % (item.get("season"), item.get("episode"))
             )
             return
 
-        ep_id = successor.get("id")
-        try:
-            ep_id = int(ep_id)
-        except (TypeError, ValueError):
-            ep_id = None
-        tt = episode_runtime_seconds_for_prefetch(ep_id) if ep_id else 0.0
-        if tt < 1.0:
-            clear_prefetch_segment_cache()
+        fetched = 0
+        for position, successor in enumerate(window, 1):
+            if cancel.is_set():
+                _prefetch_log_detail(
+                    "prefetch: cancelled at %d/%d of the lookahead window"
+                    % (position, len(window))
+                )
+                return
+            label = "S%sE%s" % (successor.get("season"), successor.get("episode"))
+            succ_path = successor.get("file") or ""
+            succ_ctx = build_tv_episode_context(successor)
+            succ_key = build_tv_cache_key(succ_ctx) if succ_ctx else None
+            if not succ_key:
+                _prefetch_log_detail(
+                    "prefetch: could not build TV context/key for %s — skipped" % label
+                )
+                continue
+            if has_tv_prefetch(succ_key):
+                _prefetch_log_detail(
+                    "prefetch: %s already stored key=%s — skipped" % (label, succ_key)
+                )
+                continue
+
+            ep_id = successor.get("id")
+            try:
+                ep_id = int(ep_id)
+            except (TypeError, ValueError):
+                ep_id = None
+            tt = episode_runtime_seconds_for_prefetch(ep_id) if ep_id else 0.0
+            if tt < 1.0:
+                _prefetch_log_detail(
+                    "prefetch: %s episodeid=%s runtime=%s unavailable — skipped"
+                    % (label, ep_id, tt)
+                )
+                continue
+
+            # Space online lookups out so a lookahead window is not a burst of API calls.
+            if fetched and cancel.wait(PREFETCH_REQUEST_INTERVAL_S):
+                _prefetch_log_detail(
+                    "prefetch: cancelled at %d/%d of the lookahead window"
+                    % (position, len(window))
+                )
+                return
+            fetched += 1
             _prefetch_log_detail(
-                "prefetch: successor episodeid=%s runtime=%s unavailable — cleared store"
-                % (ep_id, tt)
+                "prefetch: fetching %s (%d/%d) → %s key=%s runtime=%.1fs"
+                % (
+                    label,
+                    position,
+                    len(window),
+                    os.path.basename(str(succ_path)),
+                    succ_key,
+                    tt,
+                )
             )
-            return
 
-        succ_path = successor.get("file") or ""
-        succ_ctx = build_tv_episode_context(successor)
-        succ_key = build_tv_cache_key(succ_ctx) if succ_ctx else None
-        _prefetch_log_detail(
-            "prefetch: fetching successor S%sE%s → %s key=%s runtime=%.1fs"
-            % (
-                successor.get("season"),
-                successor.get("episode"),
-                os.path.basename(str(succ_path)),
-                succ_key,
-                tt,
-            )
-        )
+            segs = fetch_remote_tv_segments_core(successor, tt, {})
+            if not segs:
+                log("TV prefetch: %s has no online segments — nothing stored" % label)
+                continue
 
-        segs = fetch_remote_tv_segments_core(successor, tt, {})
-        if not segs:
-            clear_prefetch_segment_cache()
+            set_tv_segment_prefetch(succ_path, segs, succ_key)
             log(
-                "TV prefetch: successor S%sE%s has no online segments — nothing stored"
-                % (successor.get("season"), successor.get("episode"))
+                "TV prefetch: stored %d online segment(s) for upcoming episode %s (%s)"
+                % (len(segs), label, os.path.basename(str(succ_path)))
             )
-            _prefetch_log_detail("prefetch: API merge returned 0 segments — cleared store")
-            return
-
-        if not succ_ctx or not succ_key:
-            clear_prefetch_segment_cache()
-            _prefetch_log_detail("prefetch: could not build TV context/key for successor")
-            return
-
-        set_tv_segment_prefetch(succ_path, segs, succ_key)
-        log(
-            "TV prefetch: stored %d online segment(s) for next episode S%sE%s (%s)"
-            % (
-                len(segs),
-                successor.get("season"),
-                successor.get("episode"),
-                os.path.basename(str(succ_path)),
+            _prefetch_log_detail(
+                "prefetch: stored segments sources=[%s] cache_key=%s target_path=%r"
+                % (_segment_sources_summary(segs), succ_key, succ_path)
             )
-        )
-        _prefetch_log_detail(
-            "prefetch: stored segments sources=[%s] cache_key=%s target_path=%r"
-            % (_segment_sources_summary(segs), succ_key, succ_path)
-        )
     except Exception as exc:
         log("⚠ TV prefetch worker failed: %s" % exc)
     finally:
@@ -139,7 +171,8 @@ def _prefetch_worker(segment_monitor, path):
 def schedule_tv_successor_prefetch(segment_monitor, path, playback_type):
     """
     When TV **Online first** and **Prefetch next episode** is on, fetch merged online
-    segments for the library successor and store them for handoff on next playback.
+    segments for the next ``tv_prefetch_episode_count`` library episodes and store them
+    for handoff when one of them plays.
     """
     addon = get_addon()
     if not addon:
@@ -179,18 +212,26 @@ def schedule_tv_successor_prefetch(segment_monitor, path, playback_type):
         )
         return
 
+    count = addon_get_int(
+        addon, "tv_prefetch_episode_count", LOOKAHEAD_DEFAULT, minimum=1, maximum=LOOKAHEAD_MAX
+    )
+    cancel = threading.Event()
     lock = segment_monitor.prefetch_tv_lock
     with lock:
         if segment_monitor.prefetch_tv_scheduled_path == path:
             state = segment_monitor.prefetch_tv_result
             if state == _PREFETCH_RUNNING or state == "done":
                 return
+        previous = getattr(segment_monitor, "prefetch_tv_cancel", None)
+        if previous is not None:
+            previous.set()
+        segment_monitor.prefetch_tv_cancel = cancel
         segment_monitor.prefetch_tv_scheduled_path = path
         segment_monitor.prefetch_tv_result = _PREFETCH_RUNNING
 
     threading.Thread(
         target=_prefetch_worker,
-        args=(segment_monitor, path),
+        args=(segment_monitor, path, count, cancel),
         daemon=True,
         name="skippy_tv_prefetch",
     ).start()
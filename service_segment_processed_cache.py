@@ -3,11 +3,16 @@
 
 from __future__ import annotations
 
-import copy
+from bisect import bisect_right
 from typing import Any, Optional
 
-from segment_relations import RELATION_NESTED, iter_forward_overlaps
-from settings_utils import addon_get_bool, get_addon
+from segment_item import build_segment_index
+from segment_timeline import SegmentTimeline
+from settings_utils import addon_get_bool, get_addon, settings_snapshot
+
+# Phases x segments beyond which jump tables are filled per phase on first use instead
+# of all at store time (bounds memory for EDLs with very many nested rows).
+JUMP_TABLE_MAX_CELLS = 100000
 
 
 def clear_segment_processed_cache(segment_monitor) -> None:
@@ -31,33 +36,107 @@ def source_segment_fingerprint(segments) -> tuple:
 def processed_settings_signature(addon, playback_type, source_settings_sig) -> tuple:
     if not addon:
         return (source_settings_sig, True)
+    snap = settings_snapshot(addon)
+    if snap is not None:
+        return (source_settings_sig, snap.get_bool("skip_overlapping_segments", True))
     skip_overlaps = addon_get_bool(addon, "skip_overlapping_segments", True)
     return (source_settings_sig, skip_overlaps)
 
 
 def compute_link_boundaries(filtered_segments) -> tuple:
-    boundaries = []
-    for i in range(len(filtered_segments)):
-        for child, relation in iter_forward_overlaps(filtered_segments, i):
-            if relation == RELATION_NESTED:
-                boundaries.append(float(child.start_seconds))
-    return tuple(sorted(set(boundaries)))
+    timeline = SegmentTimeline(filtered_segments)
+    return tuple(sorted({float(child.start_seconds) for _parent, child in timeline.nested_pairs()}))
 
 
 def compute_link_phase(current_time: Optional[float], boundaries: tuple) -> int:
     if current_time is None or not boundaries:
         return 0
-    phase = 0
-    for boundary in boundaries:
-        if current_time >= boundary:
-            phase += 1
-        else:
-            break
-    return phase
+    return bisect_right(boundaries, current_time)
 
 
 def _clone_processed_segments(segments):
-    return [copy.copy(seg) for seg in (segments or [])]
+    return [
+        seg.with_jump(seg.next_segment_start, seg.next_segment_info)
+        for seg in (segments or [])
+    ]
+
+
+def phase_window(phase: int, boundaries: tuple) -> tuple:
+    """
+    Playhead range ``(start, end)`` covered by link ``phase``.
+
+    Jump targets depend on the phase only, except that nested segments active at the
+    playhead jump to their own end; evaluating over the whole window marks every nested
+    segment that can be active during the phase (lenient edges included).
+    """
+    start = float(boundaries[phase - 1]) if phase >= 1 else float("-inf")
+    end = float(boundaries[phase]) if phase < len(boundaries) else float("inf")
+    return start, end
+
+
+def _jump_row(pass1_segments, timeline, boundaries, phase) -> tuple:
+    from service_segment_processing import segment_jump_points
+
+    start, end = phase_window(phase, boundaries)
+    return tuple(
+        segment_jump_points(pass1_segments, start, timeline=timeline, active_until=end)
+    )
+
+
+def build_jump_table(pass1_segments, boundaries, timeline=None) -> list:
+    """
+    One ``(next_segment_start, next_segment_info)`` row per link phase, aligned with
+    ``pass1_segments``. Rows are None when left to ``_jump_row_for_phase`` (large tables).
+    """
+    if timeline is None:
+        timeline = SegmentTimeline(pass1_segments)
+    phases = len(boundaries) + 1
+    if phases * max(1, len(pass1_segments)) > JUMP_TABLE_MAX_CELLS:
+        return [None] * phases
+    return [_jump_row(pass1_segments, timeline, boundaries, p) for p in range(phases)]
+
+
+def _jump_row_for_phase(cache, phase) -> tuple:
+    table = cache["jump_table"]
+    row = table[phase]
+    if row is None:
+        pass1 = cache.get("pass1_segments") or []
+        row = _jump_row(pass1, SegmentTimeline(pass1), cache.get("link_boundaries") or (), phase)
+        table[phase] = row
+    return row
+
+
+def current_segments_index(segment_monitor):
+    """
+    ``build_segment_index`` result for ``segment_monitor.current_segments``, built once per
+    link phase and kept in the processed cache. The list handed out for a phase is a clone
+    of that phase's processed segments, so the index stays valid across ticks even though
+    each parse assigns a new list. None when there is no cache (callers scan linearly).
+    """
+    cache = getattr(segment_monitor, "segment_processed_cache", None)
+    current = getattr(segment_monitor, "current_segments", None)
+    if not cache or not current:
+        return None
+    processed = cache.get("processed_segments") or []
+    if len(processed) != len(current):
+        return None
+    indexes = cache.setdefault("phase_indexes", {})
+    phase = cache.get("link_phase", 0)
+    index = indexes.get(phase)
+    if index is None:
+        try:
+            index = build_segment_index(processed)
+        except (TypeError, ValueError, AttributeError):
+            return None
+        indexes[phase] = index
+    return index
+
+
+def _apply_jump_row(segments, row):
+    for seg, (next_start, next_info) in zip(segments, row):
+        seg.next_segment_start = next_start
+        seg.next_segment_info = next_info
+    return segments
 
 
 def _cache_key(
@@ -113,23 +192,29 @@ def try_get_processed_cache(
     if phase == cached_phase:
         log_if_changed(
             "segment_process_cache",
-            "♻ Using cached processed segments (phase=%d, count=%d)"
-            % (phase, len(cache.get("processed_segments") or [])),
+            "♻ Using cached processed segments (phase=%d, count=%d)",
+            phase,
+            len(cache.get("processed_segments") or []),
         )
         return _clone_processed_segments(cache.get("processed_segments") or []), "hit"
 
-    pass1 = clone_pass1_fn(cache.get("pass1_segments") or [])
-    from service_segment_processing import re_evaluate_segment_jump_points
-
-    re_evaluate_segment_jump_points(pass1, current_time)
-    cache["processed_segments"] = _clone_processed_segments(pass1)
+    phase_segments = cache.setdefault("phase_segments", {})
+    processed = phase_segments.get(phase)
+    if processed is None:
+        processed = _apply_jump_row(
+            clone_pass1_fn(cache.get("pass1_segments") or []),
+            _jump_row_for_phase(cache, phase),
+        )
+        phase_segments[phase] = processed
+    cache["processed_segments"] = processed
     cache["link_phase"] = phase
     log_if_changed(
         "segment_process_phase",
-        "♻ Re-evaluated processed segments for link phase %d → %d"
-        % (cached_phase, phase),
+        "♻ Switched processed segments to precomputed link phase %d → %d",
+        cached_phase,
+        phase,
     )
-    return _clone_processed_segments(pass1), "phase_reeval"
+    return _clone_processed_segments(processed), "phase_reeval"
 
 
 def store_segment_processed_cache(
@@ -148,13 +233,20 @@ def store_segment_processed_cache(
     addon = get_addon()
     proc_sig = processed_settings_signature(addon, playback_type, source_settings_sig)
     fingerprint = source_segment_fingerprint(source_segments)
-    boundaries = compute_link_boundaries(pass1_segments)
+    pass1 = _clone_processed_segments(pass1_segments)
+    timeline = SegmentTimeline(pass1)
+    boundaries = compute_link_boundaries(pass1)
     phase = compute_link_phase(current_time, boundaries)
+    processed = _clone_processed_segments(processed_segments)
     segment_monitor.segment_processed_cache = {
         "key": _cache_key(path, playback_type, proc_sig, sidecar_signature, fingerprint),
-        "pass1_segments": _clone_processed_segments(pass1_segments),
-        "processed_segments": _clone_processed_segments(processed_segments),
+        "pass1_segments": pass1,
+        "processed_segments": processed,
         "link_boundaries": boundaries,
         "link_phase": phase,
+        "jump_table": build_jump_table(pass1, boundaries, timeline),
+        # Materialized per-phase lists (never handed out; callers get clones). The
+        # store-time phase keeps the Pass 2 result it was built from.
+        "phase_segments": {phase: processed},
         "nested_parent_map": dict(nested_parent_map or {}),
     }
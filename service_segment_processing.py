@@ -3,14 +3,13 @@
 import xbmc
 import xbmcgui
 
-from segment_item import segment_is_active_lenient, segments_active_for_playback
+from segment_item import SEGMENT_PLAYBACK_TOLERANCE, segments_active_for_playback
 from segment_editor_utils import set_editor_modal_open
 from segment_relations import (
     RELATION_NESTED,
     RELATION_OVERLAPPING,
     is_nested_segment,
     is_overlapping_segment,
-    iter_forward_overlaps,
     jump_info_nested,
     jump_info_overlapping,
     jump_info_remaining,
@@ -21,6 +20,7 @@ from service_segment_processed_cache import (
     store_segment_processed_cache,
     try_get_processed_cache,
 )
+from segment_timeline import SegmentTimeline
 from service_segment_sources import _clone_segments, _source_settings_signature
 from settings_utils import addon_get_bool, get_addon, get_localized, log, show_overlapping_toast
 
@@ -60,7 +60,9 @@ def should_suppress_segment_dialog(
                 parent_segment, current_segment
             ):
                 log(
-                    f"✅ Allowing nested segment '{current_segment.segment_type_label}' to show even though parent '{parent_segment.segment_type_label}' was dismissed"
+                    "✅ Allowing nested segment '%s' to show even though parent '%s' was dismissed",
+                    current_segment.segment_type_label,
+                    parent_segment.segment_type_label,
                 )
                 return False
 
@@ -71,17 +73,23 @@ def should_suppress_segment_dialog(
             if recently_dismissed:
                 if current_seg_id in recently_dismissed:
                     log(
-                        f"✅ Allowing nested segment '{later_segment.segment_type_label}' to show even though parent '{current_segment.segment_type_label}' was dismissed"
+                        "✅ Allowing nested segment '%s' to show even though parent '%s' was dismissed",
+                        later_segment.segment_type_label,
+                        current_segment.segment_type_label,
                     )
                     return False
             log(
-                f"🚫 Suppressing dialog for '{current_segment.segment_type_label}' because '{later_segment.segment_type_label}' is nested within it"
+                "🚫 Suppressing dialog for '%s' because '%s' is nested within it",
+                current_segment.segment_type_label,
+                later_segment.segment_type_label,
             )
             return True
 
         if is_overlapping_segment(current_segment, later_segment):
             log(
-                f"🚫 Suppressing dialog for '{current_segment.segment_type_label}' because '{later_segment.segment_type_label}' overlaps with it"
+                "🚫 Suppressing dialog for '%s' because '%s' overlaps with it",
+                current_segment.segment_type_label,
+                later_segment.segment_type_label,
             )
             return True
 
@@ -91,19 +99,25 @@ def should_suppress_segment_dialog(
 def build_nested_parent_map(filtered_segments):
     """Map child segment id -> parent segment id for nested pairs."""
     parent_map = {}
-    for i, parent in enumerate(filtered_segments):
-        for child, relation in iter_forward_overlaps(filtered_segments, i):
-            if relation == RELATION_NESTED:
-                parent_map[segment_id(child)] = segment_id(parent)
+    for parent, child in SegmentTimeline(filtered_segments).nested_pairs():
+        parent_map[segment_id(child)] = segment_id(parent)
     return parent_map
 
 
-def re_evaluate_segment_jump_points(segments, current_time):
+def segment_jump_points(
+    segments, current_time, *, timeline=None, trace=False, active_until=None
+):
     """
-    Re-evaluate jump points for segments based on current playback position.
-    This is needed after major rewinds to ensure correct jump targets.
+    Jump targets for ``segments`` (start-sorted) at ``current_time`` without mutating them.
+
+    Returns one ``(next_segment_start, next_segment_info)`` pair per segment. Nested
+    segments active at ``current_time`` (or anywhere up to ``active_until``) jump to their
+    own end. ``trace`` logs each link decision (rewind re-evaluation); the processed
+    cache builds its per-phase tables quietly.
     """
-    log(f"🔄 Re-evaluating jump points for {len(segments)} segments at time {current_time:.2f}")
+    if timeline is None:
+        timeline = SegmentTimeline(segments)
+    jumps = []
 
     for i in range(len(segments)):
         current_seg = segments[i]
@@ -111,59 +125,72 @@ def re_evaluate_segment_jump_points(segments, current_time):
         next_jump_target = None
         next_segment_info = None
 
-        for next_seg, relation in iter_forward_overlaps(segments, i):
+        for next_seg, relation in timeline.forward_overlaps(i):
             if relation == RELATION_NESTED:
                 if current_time < next_seg.start_seconds:
-                    log(
-                        f"🔍 Re-evaluating: '{next_seg.segment_type_label}' is nested in '{current_seg.segment_type_label}', current time {current_time:.2f} is before nested segment ({next_seg.start_seconds}-{next_seg.end_seconds})"
-                    )
+                    if trace:
+                        log(
+                            f"🔍 Re-evaluating: '{next_seg.segment_type_label}' is nested in '{current_seg.segment_type_label}', current time {current_time:.2f} is before nested segment ({next_seg.start_seconds}-{next_seg.end_seconds})"
+                        )
                     next_jump_target = next_seg.start_seconds
                     next_segment_info = jump_info_nested(next_seg)
-                else:
+                elif trace:
                     log(
                         f"🔍 Re-evaluating: '{next_seg.segment_type_label}' is nested in '{current_seg.segment_type_label}', but current time {current_time:.2f} is at or past nested segment ({next_seg.start_seconds}-{next_seg.end_seconds}), will skip to parent end"
                     )
-                    next_jump_target = None
-                    next_segment_info = None
                 break
 
             if relation == RELATION_OVERLAPPING:
-                log(
-                    f"🔍 Re-evaluating: '{next_seg.segment_type_label}' overlaps with '{current_seg.segment_type_label}'"
-                )
+                if trace:
+                    log(
+                        f"🔍 Re-evaluating: '{next_seg.segment_type_label}' overlaps with '{current_seg.segment_type_label}'"
+                    )
                 next_jump_target = next_seg.start_seconds
                 next_segment_info = jump_info_overlapping(next_seg)
                 break
 
+        jumps.append((next_jump_target, next_segment_info))
+
+    if trace:
+        linked = sum(1 for target, _info in jumps if target is not None)
+        log(
+            f"🔗 Re-evaluated {len(segments)} segment(s): {linked} linked, "
+            f"{len(segments) - linked} jump to end of segment"
+        )
+        log(
+            f"🔍 Additional pass: Checking nested segments for correct jump points at time {current_time:.2f}"
+        )
+    if active_until is None:
+        active_until = current_time
+    for i in timeline.active_between(
+        current_time, active_until, lenient_s=SEGMENT_PLAYBACK_TOLERANCE
+    ):
+        current_seg = segments[i]
+        parent_seg = timeline.first_container(i)
+        if parent_seg is not None and jumps[i][0] != current_seg.end_seconds:
+            if trace:
+                log(
+                    f"🔧 Fixing nested segment '{current_seg.segment_type_label}': setting jump point to {current_seg.end_seconds}s (end of segment)"
+                )
+            jumps[i] = (current_seg.end_seconds, jump_info_remaining(parent_seg))
+
+    return jumps
+
+
+def re_evaluate_segment_jump_points(segments, current_time):
+    """
+    Re-evaluate jump points for segments based on current playback position.
+    This is needed after major rewinds to ensure correct jump targets.
+    """
+    log(f"🔄 Re-evaluating jump points for {len(segments)} segments at time {current_time:.2f}")
+    jumps = segment_jump_points(segments, current_time, trace=True)
+    for current_seg, (next_jump_target, next_segment_info) in zip(segments, jumps):
         current_seg.next_segment_start = next_jump_target
         current_seg.next_segment_info = next_segment_info
-
         if next_jump_target is not None:
             log(
                 f"🔗 Re-evaluated jump point for '{current_seg.segment_type_label}' to {next_jump_target}s ({next_segment_info})"
             )
-        else:
-            log(
-                f"🔗 Re-evaluated jump point for '{current_seg.segment_type_label}' to end of segment ({current_seg.end_seconds}s)"
-            )
-
-    log(
-        f"🔍 Additional pass: Checking nested segments for correct jump points at time {current_time:.2f}"
-    )
-    for i in range(len(segments)):
-        current_seg = segments[i]
-
-        if segment_is_active_lenient(current_seg, current_time):
-            for j in range(i):
-                parent_seg = segments[j]
-                if is_nested_segment(parent_seg, current_seg):
-                    if current_seg.next_segment_start != current_seg.end_seconds:
-                        log(
-                            f"🔧 Fixing nested segment '{current_seg.segment_type_label}': setting jump point to {current_seg.end_seconds}s (end of segment)"
-                        )
-                        current_seg.next_segment_start = current_seg.end_seconds
-                        current_seg.next_segment_info = jump_info_remaining(parent_seg)
-                    break
 
 
 def parse_and_process_segments(
@@ -204,7 +231,7 @@ def parse_and_process_segments(
         )
         return []
 
-    log_if_changed("segment_process_path", "🚦 Segment parse and process for: %s" % path)
+    log_if_changed("segment_process_path", "🚦 Segment parse and process for: %s", path)
     addon = get_addon()
     if not addon:
         return []
@@ -250,32 +277,40 @@ def parse_and_process_segments(
 
     segments = sorted(parsed, key=lambda s: s.start_seconds)
 
-    filtered_segments = []
-
-    for current_seg in segments:
-        is_overlapping_with_filtered = False
-        for existing_seg in filtered_segments:
-            if not (
-                current_seg.end_seconds <= existing_seg.start_seconds
-                or current_seg.start_seconds >= existing_seg.end_seconds
-            ):
-                is_overlapping_with_filtered = True
-                break
-
-        if is_overlapping_with_filtered and skip_overlaps:
-            log(
-                f"🚫 Skipping segment {current_seg.start_seconds}-{current_seg.end_seconds} due to user setting 'skip_overlapping_segments' which detected an overlap."
-            )
-            continue
-
-        filtered_segments.append(current_seg)
+    if skip_overlaps:
+        # Sweep line: every kept segment starts no later than the current one, so the
+        # current one overlaps a kept segment exactly when the latest kept end is past
+        # its start.
+        filtered_segments = []
+        kept_max_end = None
+        for current_seg in segments:
+            start = current_seg.start_seconds
+            if current_seg.end_seconds > start:
+                is_overlapping_with_filtered = kept_max_end is not None and kept_max_end > start
+            else:
+                is_overlapping_with_filtered = any(
+                    kept.start_seconds < start < kept.end_seconds for kept in filtered_segments
+                )
+            if is_overlapping_with_filtered:
+                log(
+                    "🚫 Skipping segment %s-%s due to user setting 'skip_overlapping_segments' which detected an overlap.",
+                    current_seg.start_seconds,
+                    current_seg.end_seconds,
+                )
+                continue
+            filtered_segments.append(current_seg)
+            if kept_max_end is None or current_seg.end_seconds > kept_max_end:
+                kept_max_end = current_seg.end_seconds
+    else:
+        filtered_segments = list(segments)
 
-    log(f"✅ Pass 1 complete. Filtered segments: {len(filtered_segments)}")
+    log("✅ Pass 1 complete. Filtered segments: %d", len(filtered_segments))
 
     pass1_snapshot = _clone_segments(filtered_segments)
 
     log("🔗 Pass 2: Linking segments for progressive skipping and detecting overlaps/nested...")
     has_overlap_or_nested = False
+    timeline = SegmentTimeline(filtered_segments)
 
     for i in range(len(filtered_segments)):
         current_seg = filtered_segments[i]
@@ -283,23 +318,33 @@ def parse_and_process_segments(
         next_jump_target = None
         next_segment_info = None
 
-        for next_seg, relation in iter_forward_overlaps(filtered_segments, i):
+        for next_seg, relation in timeline.forward_overlaps(i):
             has_overlap_or_nested = True
 
             if relation == RELATION_NESTED:
                 log(
-                    f"🔍 Detected NESTED segment: '{next_seg.segment_type_label}' ({next_seg.start_seconds}-{next_seg.end_seconds}) is nested inside '{current_seg.segment_type_label}' ({current_seg.start_seconds}-{current_seg.end_seconds})"
+                    "🔍 Detected NESTED segment: '%s' (%s-%s) is nested inside '%s' (%s-%s)",
+                    next_seg.segment_type_label,
+                    next_seg.start_seconds,
+                    next_seg.end_seconds,
+                    current_seg.segment_type_label,
+                    current_seg.start_seconds,
+                    current_seg.end_seconds,
                 )
 
                 if current_time is None or current_time < next_seg.start_seconds:
                     next_jump_target = next_seg.start_seconds
                     next_segment_info = jump_info_nested(next_seg)
                     log(
-                        f"🔗 Setting jump point for '{current_seg.segment_type_label}' to {next_jump_target}s ({next_segment_info})"
+                        "🔗 Setting jump point for '%s' to %ss (%s)",
+                        current_seg.segment_type_label,
+                        next_jump_target,
+                        next_segment_info,
                     )
                 else:
                     log(
-                        f"🔗 Context-aware: current time {current_time:.2f} is at or past nested segment, will skip to end of parent"
+                        "🔗 Context-aware: current time %.2f is at or past nested segment, will skip to end of parent",
+                        current_time,
                     )
                     next_jump_target = None
                     next_segment_info = None
@@ -307,17 +352,21 @@ def parse_and_process_segments(
                 next_seg.next_segment_start = next_seg.end_seconds
                 next_seg.next_segment_info = jump_info_remaining(current_seg)
                 log(
-                    "🔗 Setting jump point for nested '%s' to %ss (%s)"
-                    % (
-                        next_seg.segment_type_label,
-                        next_seg.end_seconds,
-                        next_seg.next_segment_info,
-                    )
+                    "🔗 Setting jump point for nested '%s' to %ss (%s)",
+                    next_seg.segment_type_label,
+                    next_seg.end_seconds,
+                    next_seg.next_segment_info,
                 )
 
             elif relation == RELATION_OVERLAPPING:
                 log(
-                    f"🔍 Detected OVERLAPPING segment: '{next_seg.segment_type_label}' ({next_seg.start_seconds}-{next_seg.end_seconds}) overlaps with '{current_seg.segment_type_label}' ({current_seg.start_seconds}-{current_seg.end_seconds})"
+                    "🔍 Detected OVERLAPPING segment: '%s' (%s-%s) overlaps with '%s' (%s-%s)",
+                    next_seg.segment_type_label,
+                    next_seg.start_seconds,
+                    next_seg.end_seconds,
+                    current_seg.segment_type_label,
+                    current_seg.start_seconds,
+                    current_seg.end_seconds,
                 )
                 next_jump_target = next_seg.start_seconds
                 next_segment_info = jump_info_overlapping(next_seg)
@@ -326,7 +375,10 @@ def parse_and_process_segments(
                 current_seg.next_segment_start = next_jump_target
                 current_seg.next_segment_info = next_segment_info
                 log(
-                    f"🔗 Setting jump point for '{current_seg.segment_type_label}' to {next_jump_target}s ({next_segment_info})"
+                    "🔗 Setting jump point for '%s' to %ss (%s)",
+                    current_seg.segment_type_label,
+                    next_jump_target,
+                    next_segment_info,
                 )
                 break
 
@@ -435,5 +487,5 @@ def parse_and_process_segments(
             f"❌ Failed to display overlapping segments toast notification (possible Kodi/device limitation): {e}"
         )
 
-    log(f"✅ Pass 2 complete. Final segments to process: {len(filtered_segments)}")
+    log("✅ Pass 2 complete. Final segments to process: %d", len(filtered_segments))
     return filtered_segments
@@ -1,6 +1,5 @@
 """Chapter XML / EDL / embedded chapter parsing and segment source cache."""
 
-import copy
 import time
 import xml.etree.ElementTree as ET
 
@@ -25,6 +24,7 @@ from service_online_lookup_pause import (
     run_blocking_online_lookup,
 )
 from service_player_snapshot import get_player_snapshot
+from service_segment_disk_cache import load_sidecar_segments, store_sidecar_segments
 from service_segment_prefetch import schedule_tv_successor_prefetch
 from service_sidecar_paths import (
     _chapter_xml_paths_to_try,
@@ -40,12 +40,13 @@ from settings_utils import (
     log,
     log_service_detail,
     normalize_label,
+    settings_snapshot,
 )
 from time_format import hms_to_seconds
 
 
-def _log_seg_detail(msg):
-    log_service_detail(msg, tag="segments")
+def _log_seg_detail(msg, *args):
+    log_service_detail(msg, *args, tag="segments")
 
 
 def _embedded_player_id(segment_monitor):
@@ -142,6 +143,16 @@ def safe_file_read(*paths):
 def _source_settings_signature(addon, playback_type):
     if not addon:
         return ()
+    snap = settings_snapshot(addon)
+    if snap is not None:
+        return snap.derived(
+            ("source_settings_signature", playback_type),
+            lambda: _read_source_settings_signature(addon, playback_type),
+        )
+    return _read_source_settings_signature(addon, playback_type)
+
+
+def _read_source_settings_signature(addon, playback_type):
     if playback_type == "episode":
         keys = (
             "tv_use_local_chapter_edl",
@@ -171,13 +182,7 @@ def _source_settings_signature(addon, playback_type):
 
 
 def _clone_segments(segments):
-    cloned = []
-    for seg in segments or []:
-        item = copy.copy(seg)
-        item.next_segment_start = None
-        item.next_segment_info = None
-        cloned.append(item)
-    return cloned
+    return [seg.with_jump(None, None) for seg in segments or []]
 
 
 def _chapter_window_overlap(s1, e1, s2, e2, tol=1.5):
@@ -304,9 +309,7 @@ def parse_chapters(video_path, update_monitor=True, segment_monitor=None):
                         source="xml",
                     )
                 )
-                _log_seg_detail(
-                    f"📘 Parsed XML segment: {start} → {end} | label='{label}'"
-                )
+                _log_seg_detail("📘 Parsed XML segment: %s → %s | label='%s'", start, end, label)
         if result:
             n0 = len(result)
             result = dedupe_overlapping_same_label_segments(result)
@@ -398,6 +401,20 @@ def parse_edl(video_path, update_monitor=True, segment_monitor=None):
     return segments
 
 
+def _parse_local_sidecar_segments(path, segment_monitor, sidecar_sig=None, settings_sig=None):
+    """Chapter XML first, then EDL; served from the profile disk cache when signatures match."""
+    if sidecar_sig is not None and settings_sig is not None:
+        cached = load_sidecar_segments(path, sidecar_sig, settings_sig)
+        if cached is not None:
+            return cached
+    parsed = parse_chapters(path, update_monitor=False, segment_monitor=segment_monitor)
+    if not parsed:
+        parsed = parse_edl(path, update_monitor=False, segment_monitor=segment_monitor)
+    if parsed and sidecar_sig is not None and settings_sig is not None:
+        store_sidecar_segments(path, sidecar_sig, settings_sig, parsed)
+    return parsed or []
+
+
 def _parse_source_segments_uncached(
     path,
     playback_type,
@@ -405,6 +422,9 @@ def _parse_source_segments_uncached(
     segment_player,
     on_remote_segments_saved,
     on_local_to_online_sync_check=None,
+    *,
+    sidecar_sig=None,
+    settings_sig=None,
 ):
     """Read/select segment sources. Per-time filtering/linking remains in parse_and_process_segments.
 
@@ -435,11 +455,9 @@ def _parse_source_segments_uncached(
 
         local_list = []
         if tv_local:
-            pxml = parse_chapters(path, update_monitor=False, segment_monitor=segment_monitor)
-            if pxml:
-                local_list = pxml
-            else:
-                local_list = parse_edl(path, update_monitor=False, segment_monitor=segment_monitor)
+            local_list = _parse_local_sidecar_segments(
+                path, segment_monitor, sidecar_sig, settings_sig
+            )
         local_file_found = (
             local_chapter_or_edl_file_exists(path, segment_monitor)
             if tv_local
@@ -571,13 +589,10 @@ def _parse_source_segments_uncached(
         local_list = []
         if movie_local:
             log(f"🎬 Movie: attempting local chapter/EDL parsing for {path}")
-            pxml = parse_chapters(path, update_monitor=False, segment_monitor=segment_monitor)
-            if pxml:
-                local_list = pxml
-                log(f"🎬 Movie: found {len(pxml)} segments from chapters.xml")
-            else:
-                local_list = parse_edl(path, update_monitor=False, segment_monitor=segment_monitor)
-                log(f"🎬 Movie: found {len(local_list)} segments from EDL")
+            local_list = _parse_local_sidecar_segments(
+                path, segment_monitor, sidecar_sig, settings_sig
+            )
+            log(f"🎬 Movie: found {len(local_list)} segments from chapter XML / EDL")
         local_file_found = (
             local_chapter_or_edl_file_exists(path, segment_monitor)
             if movie_local
@@ -758,6 +773,8 @@ def get_cached_source_segments(
         segment_player,
         on_remote_segments_saved,
         on_local_to_online_sync_check,
+        sidecar_sig=sidecar_sig_before,
+        settings_sig=settings_sig,
     )
     sidecar_sig_after = _sidecar_signature(path, segment_monitor)
     segment_monitor.segment_parse_cache = {
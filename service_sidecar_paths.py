@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 """Sidecar path discovery (.edl, chapter XML variants) and change signatures for cache invalidation."""
+import json
 import os
+import threading
+import time
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
 
 import xbmc
 import xbmcvfs
@@ -11,7 +15,7 @@ from segment_editor_parser import (
     DEFAULT_NEW_CHAPTER_XML_SUFFIX,
     normalize_matroska_chapter_xml_text,
 )
-from settings_utils import get_addon, log, log_service_detail
+from settings_utils import get_addon, log, log_service_detail, parse_kodi_jsonrpc_raw
 
 # Jellyfin Kodi plugin (chapters/edl exporter) may place exports under this folder beside the video.
 _JF_CHAPTERS_SUBDIR = ".chapters"
@@ -19,6 +23,16 @@ _JF_CHAPTERS_SUBDIR = ".chapters"
 # Deduplicate high-frequency path detail lines (sidecar checks every few seconds).
 _last_paths_detail = {}
 
+# Directory listings shared across episodes (binge-watching a season lists the same
+# folder once). Entries are revalidated by the directory mtime; when Stat reports no
+# mtime (some VFS protocols) they expire after a short TTL instead.
+LISTING_CACHE_MAX_DIRS = 32
+LISTING_TTL_NO_MTIME_S = 10.0
+# Safety net for same-second adds that leave the directory mtime unchanged.
+LISTING_MAX_AGE_S = 300.0
+_listing_cache = OrderedDict()
+_listing_lock = threading.Lock()
+
 
 def _log_paths_detail(msg):
     log_service_detail(msg, tag="paths")
@@ -108,10 +122,7 @@ def _chapter_xml_paths_to_try(video_path):
     return paths_to_try
 
 
-def _listdir_index(parent):
-    """Return ``(file_lower_to_name, dir_lower_set)`` or ``None`` when listdir fails."""
-    if not parent:
-        return None
+def _listdir_index_uncached(parent):
     try:
         dirs, files = xbmcvfs.listdir(parent)
     except (OSError, IOError, RuntimeError, ValueError, TypeError, AttributeError) as exc:
@@ -125,6 +136,59 @@ def _listdir_index(parent):
     return file_map, dir_set
 
 
+def _directory_mtime(parent):
+    """Directory mtime from ``xbmcvfs.Stat``; None when unsupported or zero."""
+    try:
+        stat_obj = xbmcvfs.Stat(parent)
+    except (OSError, IOError, RuntimeError, ValueError, TypeError, AttributeError):
+        return None
+    return _safe_stat_value(stat_obj, "st_mtime") or None
+
+
+def _listing_entry_valid(entry, mtime, now):
+    cached_mtime, listed_at, _index = entry
+    age = now - listed_at
+    if age >= LISTING_MAX_AGE_S:
+        return False
+    if cached_mtime is None or mtime is None:
+        return cached_mtime is None and mtime is None and age < LISTING_TTL_NO_MTIME_S
+    return cached_mtime == mtime
+
+
+def _listdir_index(parent):
+    """Return ``(file_lower_to_name, dir_lower_set)`` or ``None`` when listdir fails."""
+    if not parent:
+        return None
+    mtime = _directory_mtime(parent)
+    now = time.monotonic()
+    with _listing_lock:
+        entry = _listing_cache.get(parent)
+        if entry is not None and _listing_entry_valid(entry, mtime, now):
+            _listing_cache.move_to_end(parent)
+            return entry[2]
+    index = _listdir_index_uncached(parent)
+    with _listing_lock:
+        if index is None:
+            _listing_cache.pop(parent, None)
+            return None
+        _listing_cache[parent] = (mtime, now, index)
+        _listing_cache.move_to_end(parent)
+        while len(_listing_cache) > LISTING_CACHE_MAX_DIRS:
+            _listing_cache.popitem(last=False)
+    return index
+
+
+def clear_directory_listing_cache(video_path=None):
+    """Forget cached listings (folders holding ``video_path``'s sidecars, or all)."""
+    with _listing_lock:
+        if not video_path:
+            _listing_cache.clear()
+            return
+        parent = os.path.dirname(video_path)
+        _listing_cache.pop(parent, None)
+        _listing_cache.pop(os.path.join(parent, _JF_CHAPTERS_SUBDIR), None)
+
+
 def existing_paths_from_listing(candidate_paths):
     """Split candidates into listed hits vs unknown (listdir failed for that parent).
 
@@ -286,8 +350,89 @@ def _safe_stat_value(stat_obj, name):
         return None
 
 
+def _lastmodified_to_epoch(raw):
+    """Kodi ``lastmodified`` (``YYYY-MM-DD HH:MM:SS``, local time) as epoch seconds."""
+    if not raw:
+        return None
+    try:
+        return int(time.mktime(time.strptime(str(raw).strip(), "%Y-%m-%d %H:%M:%S")))
+    except (TypeError, ValueError, OverflowError):
+        # Unknown format: no mtime, so the caller falls back to xbmcvfs.Stat instead of
+        # mixing string and epoch mtimes in sidecar signatures.
+        return None
+
+
+def _directory_file_stats(parent):
+    """
+    ``{name_lower: (mtime, size)}`` for every file in ``parent`` from one
+    ``Files.GetDirectory`` call, or None when the call fails or omits the fields.
+    """
+    if not parent:
+        return None
+    try:
+        raw = xbmc.executeJSONRPC(
+            json.dumps(
+                {
+                    "jsonrpc": "2.0",
+                    "id": "SkippySidecarStat",
+                    "method": "Files.GetDirectory",
+                    "params": {
+                        "directory": parent,
+                        "media": "files",
+                        "properties": ["size", "lastmodified"],
+                    },
+                }
+            )
+        )
+    except (TypeError, ValueError, AttributeError, RuntimeError) as exc:
+        _log_paths_detail("Files.GetDirectory failed for %s: %s" % (parent, exc))
+        return None
+    data, err = parse_kodi_jsonrpc_raw(raw)
+    if err or not data or data.get("error"):
+        return None
+    result = data.get("result")
+    if not isinstance(result, dict):
+        return None
+    stats = {}
+    for row in result.get("files") or []:
+        if not isinstance(row, dict) or row.get("filetype") == "directory":
+            continue
+        name = os.path.basename(str(row.get("file") or "").rstrip("/\\"))
+        mtime = _lastmodified_to_epoch(row.get("lastmodified"))
+        size = row.get("size")
+        if not name or mtime is None or size is None:
+            return None
+        stats[name.lower()] = (mtime, size)
+    return stats
+
+
+def _batched_sidecar_stats(watch_paths):
+    """
+    ``{path: (mtime, size) or None}`` using one directory enumeration per parent.
+
+    ``None`` marks a path confirmed missing. Paths whose folder could not be
+    enumerated are left out so the caller can fall back to per-file Stat.
+    """
+    by_parent = {}
+    for path in watch_paths:
+        by_parent.setdefault(os.path.dirname(path), []).append(path)
+    out = {}
+    for parent, paths in by_parent.items():
+        stats = _directory_file_stats(parent)
+        if stats is None:
+            continue
+        for path in paths:
+            out[path] = stats.get(os.path.basename(path).lower())
+    return out
+
+
 def _sidecar_signature(video_path, segment_monitor=None):
-    """Return existing sidecar paths with mtime/size so edits during playback can refresh parsing."""
+    """Return existing sidecar paths with mtime/size so edits during playback can refresh parsing.
+
+    One ``Files.GetDirectory`` per folder supplies existence, mtime and size for all
+    watched paths; the per-file ``exists`` + ``Stat`` loop only covers folders that
+    could not be enumerated.
+    """
     if segment_monitor is not None:
         from service_sidecar_probe_cache import resolve_sidecar_paths
 
@@ -311,7 +456,13 @@ def _sidecar_signature(video_path, segment_monitor=None):
                     probe.edl_path,
                 )
             ]
+    batched = _batched_sidecar_stats(watch_paths)
     for path in watch_paths:
+        if path in batched:
+            row = batched[path]
+            if row is not None:
+                signature.append((path, row[0], row[1]))
+            continue
         try:
             if not xbmcvfs.exists(path):
                 continue
@@ -7,7 +7,11 @@ import time
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from service_sidecar_paths import sidecar_hits_from_directory_listing, vfs_file_exists
+from service_sidecar_paths import (
+    clear_directory_listing_cache,
+    sidecar_hits_from_directory_listing,
+    vfs_file_exists,
+)
 from settings_utils import log
 
 # Hit cache matches sidecar mtime checks. Confirmed misses wait longer so NFS
@@ -41,6 +45,9 @@ def clear_sidecar_probe_cache(segment_monitor=None, video_path: Optional[str] =
     """Drop cached probe results (one path or entire cache)."""
     if segment_monitor is None:
         return
+    if video_path:
+        # A sidecar was just written beside this video; relist its folder.
+        clear_directory_listing_cache(video_path)
     cache = getattr(segment_monitor, "sidecar_probe_cache", None)
     if not cache:
         segment_monitor.sidecar_probe_cache = {}
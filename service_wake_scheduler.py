@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Event-driven wake scheduling for the service monitor loop.
+
+Instead of a full tick every ``CHECK_INTERVAL``, the loop sleeps until the next
+interesting playhead instant (segment start/end, nested link boundary, or the
+parse lookahead before one). ``xbmc.Player`` / ``xbmc.Monitor`` callbacks wake it
+early. Kodi dispatches those callbacks on the script thread from inside
+``waitForAbort``, which only returns on abort or timeout, so the wait runs in slices
+of ``WAKE_SLICE_S`` and checks the wake flag between them. The slice matches the old
+fixed poll, so an idle service wakes no more often than before; a scheduled instant
+closer than one slice is still hit exactly. The expensive tick work (``getTime``,
+context refresh, parse gate) runs only when a wake is due.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import xbmc
+
+# Slice length while waiting; bounds wake-on-event latency. Not below the old 1s poll:
+# every slice end is a Python wakeup, even with nothing to do.
+WAKE_SLICE_S = 1.0
+# Longest idle sleep far from any segment (sidecar edits / remote data still land).
+MAX_IDLE_SLEEP_S = 10.0
+# Never schedule a full tick sooner than this (avoid spinning at a boundary).
+MIN_SLEEP_S = 0.1
+# Instants closer than this to the playhead are treated as already reached.
+_REACHED_EPSILON_S = 0.05
+
+
+def _segment_bounds(segments):
+    bounds = []
+    for seg in segments or []:
+        try:
+            bounds.append((float(seg.start_seconds), float(seg.end_seconds)))
+        except (TypeError, ValueError, AttributeError):
+            continue
+    return bounds
+
+
+def next_wake_delay(
+    segments,
+    current_time,
+    boundaries,
+    *,
+    check_interval,
+    lookahead,
+    max_idle=MAX_IDLE_SLEEP_S,
+):
+    """
+    Seconds until the next tick worth running.
+
+    Each segment start/end and link boundary contributes two candidates: the
+    instant itself (sub-second skip timing) and ``lookahead`` before it (parse
+    gate / dialog warm-up). Inside a segment or lookahead window the loop keeps
+    its normal ``check_interval`` cadence so dialogs and rewinds behave as before.
+    """
+    try:
+        t = float(current_time)
+    except (TypeError, ValueError):
+        return float(check_interval)
+    cap = float(max_idle)
+    instants = []
+    for start, end in _segment_bounds(segments):
+        if (start - lookahead) <= t <= (end + lookahead):
+            cap = min(cap, float(check_interval))
+        instants.extend((start, end))
+    for raw in boundaries or ():
+        try:
+            boundary = float(raw)
+        except (TypeError, ValueError):
+            continue
+        if abs(t - boundary) <= lookahead:
+            cap = min(cap, float(check_interval))
+        instants.append(boundary)
+    best = None
+    for instant in instants:
+        for candidate in (instant - lookahead, instant):
+            if candidate - t > _REACHED_EPSILON_S and (best is None or candidate < best):
+                best = candidate
+    delay = cap if best is None else min(best - t, cap)
+    return max(MIN_SLEEP_S, delay)
+
+
+class PlaybackWakeScheduler:
+    """Wake flag shared by player/monitor callbacks and the monitor loop."""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self.last_reason = None
+        self.playback_speed = 1.0
+
+    def notify(self, reason="event"):
+        with self._lock:
+            self.last_reason = reason
+        self._wake.set()
+
+    def set_speed(self, speed):
+        try:
+            self.playback_speed = float(speed)
+        except (TypeError, ValueError):
+            self.playback_speed = 1.0
+        self.notify("speed")
+
+    @property
+    def normal_speed(self) -> bool:
+        return self.playback_speed == 1.0
+
+    def wait(self, monitor, delay) -> bool:
+        """Sleep up to ``delay`` seconds; return True on abort. Returns early on notify."""
+        remaining = max(0.0, float(delay))
+        if self._wake.is_set():
+            self._wake.clear()
+            return bool(monitor.abortRequested())
+        while remaining > 0:
+            step = min(WAKE_SLICE_S, remaining)
+            if monitor.waitForAbort(step):
+                return True
+            remaining -= step
+            if self._wake.is_set():
+                self._wake.clear()
+                return False
+        return False
+
+
+class WakingPlayer(xbmc.Player):
+    """``xbmc.Player`` that wakes the monitor loop on playback state callbacks."""
+
+    def __init__(self, scheduler: PlaybackWakeScheduler):
+        super().__init__()
+        self._scheduler = scheduler
+
+    def onPlayBackStarted(self):
+        self._scheduler.notify("started")
+
+    def onAVStarted(self):
+        self._scheduler.notify("av_started")
+
+    def onAVChange(self):
+        self._scheduler.notify("av_change")
+
+    def onPlayBackSeek(self, _time, _seek_offset):
+        self._scheduler.notify("seek")
+
+    def onPlayBackSeekChapter(self, _chapter):
+        self._scheduler.notify("seek_chapter")
+
+    def onPlayBackPaused(self):
+        self._scheduler.notify("paused")
+
+    def onPlayBackResumed(self):
+        self._scheduler.notify("resumed")
+
+    def onPlayBackSpeedChanged(self, speed):
+        self._scheduler.set_speed(speed)
+
+    def onPlayBackStopped(self):
+        self._scheduler.playback_speed = 1.0
+        self._scheduler.notify("stopped")
+
+    def onPlayBackEnded(self):
+        self._scheduler.playback_speed = 1.0
+        self._scheduler.notify("ended")
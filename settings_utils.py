@@ -1,13 +1,18 @@
 import json
 import os
 import re
+import threading
 import time
 import unicodedata
+from dataclasses import dataclass, field
+from types import MappingProxyType
 import xbmcaddon
 import xbmc
 import xbmcgui
 import xbmcvfs
 
+from skippy_log_sink import flush_log_sink, write_line
+
 # Log detail when enable_verbose_logging is true (skippy_log_detail_level)
 SKIPPY_LOG_ERROR_ONLY = "ErrorOnly"
 SKIPPY_LOG_NORMAL = "Normal"
@@ -22,10 +27,27 @@ _addon_cached_at = 0.0
 _log_level_cached = None
 _log_level_cached_at = 0.0
 
+# Settings snapshot (service process only, see enable_settings_snapshot): every setting
+# declared in resources/settings.xml read in one pass, served to reads through the shared
+# handle until the next invalidate_settings_cache (PlayerMonitor.onSettingsChanged).
+_SETTINGS_XML_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "resources", "settings.xml"
+)
+_SETTING_ID_RE = re.compile(r'<setting\s[^>]*?\bid="([^"]+)"')
+_declared_setting_ids = None
+_snapshot_enabled = False
+_snapshot = None
+_snapshot_generation = 0
+_snapshot_lock = threading.Lock()
+
 
 def invalidate_settings_cache():
-    """Drop the cached Addon handle and log level (call after writing settings)."""
+    """Drop the cached Addon handle, log level and settings snapshot (call after writing settings)."""
     global _addon_cached, _addon_cached_at, _log_level_cached, _log_level_cached_at
+    global _snapshot, _snapshot_generation
+    with _snapshot_lock:
+        _snapshot = None
+        _snapshot_generation += 1
     _addon_cached = None
     _addon_cached_at = 0.0
     _log_level_cached = None
@@ -33,6 +55,83 @@ def invalidate_settings_cache():
     _skip_mode_lists_cache.clear()
 
 
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """
+    Raw setting strings for every declared key, read once. Never mutated: a settings
+    change replaces the whole snapshot. ``derived`` memoizes values computed from it
+    (settings signatures) for the snapshot's lifetime.
+    """
+
+    values: MappingProxyType
+    generation: int
+    _derived: dict = field(default_factory=dict, compare=False, repr=False)
+
+    def get_bool(self, key, default=False):
+        return _parse_bool_setting(self.values.get(key), default)
+
+    def get_int(self, key, default=0, minimum=None, maximum=None):
+        return _parse_int_setting(self.values.get(key), default, minimum, maximum)
+
+    def get_text(self, key, default=""):
+        raw = self.values.get(key)
+        return default if raw is None else raw
+
+    def derived(self, name, build):
+        """``build()`` evaluated once per snapshot and cached under ``name``."""
+        try:
+            return self._derived[name]
+        except KeyError:
+            return self._derived.setdefault(name, build())
+
+
+def _settings_xml_ids():
+    global _declared_setting_ids
+    if _declared_setting_ids is None:
+        try:
+            with open(_SETTINGS_XML_PATH, encoding="utf-8") as handle:
+                ids = _SETTING_ID_RE.findall(handle.read())
+        except OSError:
+            ids = []
+        _declared_setting_ids = tuple(dict.fromkeys(ids))
+    return _declared_setting_ids
+
+
+def enable_settings_snapshot():
+    """
+    Serve settings reads through the shared handle from a snapshot. Only the service
+    calls this: it gets onSettingsChanged, RunScript processes do not.
+    """
+    global _snapshot_enabled
+    _snapshot_enabled = True
+
+
+def settings_snapshot(addon=None):
+    """
+    Current ``SettingsSnapshot`` for the shared handle (built on first use), or None when
+    snapshots are disabled or ``addon`` is a caller-owned handle that must read live.
+    """
+    if not _snapshot_enabled:
+        return None
+    shared = get_addon()
+    if shared is None or (addon is not None and addon is not shared):
+        return None
+    return _snapshot or _build_settings_snapshot(shared)
+
+
+def _build_settings_snapshot(addon):
+    global _snapshot
+    with _snapshot_lock:
+        generation = _snapshot_generation
+    values = {key: _read_setting_live(addon, key) for key in _settings_xml_ids()}
+    snap = SettingsSnapshot(MappingProxyType(values), generation)
+    with _snapshot_lock:
+        # A settings change while reading makes this snapshot stale; use it once, keep none.
+        if generation == _snapshot_generation and addon is _addon_cached:
+            _snapshot = snap
+    return snap
+
+
 def _redact_secrets_for_log(msg):
     """Strip common secret patterns before logging (URLs, JSON-ish key values)."""
     s = str(msg)
@@ -78,7 +177,10 @@ def get_addon():
     """Get the addon object, handling cases where addon is being updated/uninstalled."""
     global _addon_cached, _addon_cached_at
     now = time.monotonic()
-    if _addon_cached is not None and (now - _addon_cached_at) < _SETTINGS_CACHE_TTL_S:
+    if _addon_cached is not None and (
+        _snapshot_enabled or (now - _addon_cached_at) < _SETTINGS_CACHE_TTL_S
+    ):
+        # With the snapshot on, onSettingsChanged invalidates; no need to expire.
         return _addon_cached
     try:
         # We pass the ID explicitly so Kodi knows exactly what we want
@@ -222,6 +324,15 @@ def notify_skippy(
 
 
 def _addon_read_setting_raw(addon, key):
+    """Read setting as string; served from the settings snapshot for the shared handle."""
+    if _snapshot_enabled and addon is not None and addon is _addon_cached:
+        snap = _snapshot or _build_settings_snapshot(addon)
+        if key in snap.values:
+            return snap.values[key]
+    return _read_setting_live(addon, key)
+
+
+def _read_setting_live(addon, key):
     """
     Read setting as string. Prefer getSetting; call getSettingString only if getSetting raises.
 
@@ -280,6 +391,28 @@ def skippy_log_effective_detail_level(addon):
     return _log_level_cached
 
 
+# Effective levels in increasing verbosity; a message at level L is written when the
+# effective level ranks at or above L.
+_LOG_LEVEL_RANK = {
+    "Off": 0,
+    SKIPPY_LOG_ERROR_ONLY: 1,
+    SKIPPY_LOG_NORMAL: 2,
+    SKIPPY_LOG_ALL: 3,
+}
+
+
+def is_enabled(level=SKIPPY_LOG_NORMAL):
+    """
+    True when messages at ``level`` (ErrorOnly / Normal / All) would be written. Cheap
+    (cached level): guard multi-line log blocks or expensive diagnostics with it.
+    """
+    addon = get_addon()
+    if not addon:
+        return False
+    effective = skippy_log_effective_detail_level(addon)
+    return _LOG_LEVEL_RANK.get(effective, 0) >= _LOG_LEVEL_RANK.get(level, SKIPPY_LOG_ALL)
+
+
 def addon_get_bool(addon, key, default=False):
     """
     Read bool settings without getSettingBool (some Kodi/CoreELEC builds log Invalid setting type).
@@ -287,7 +420,10 @@ def addon_get_bool(addon, key, default=False):
     """
     if not addon:
         return default
-    s = _addon_read_setting_raw(addon, key)
+    return _parse_bool_setting(_addon_read_setting_raw(addon, key), default)
+
+
+def _parse_bool_setting(s, default):
     if s is None or s == "":
         return default
     return str(s).lower() in ("true", "1", "yes")
@@ -307,7 +443,10 @@ def addon_get_int(addon, key, default=0, minimum=None, maximum=None):
     """Read integer settings without getSettingInt when that API throws on some builds."""
     if not addon:
         return default
-    raw = _addon_read_setting_raw(addon, key)
+    return _parse_int_setting(_addon_read_setting_raw(addon, key), default, minimum, maximum)
+
+
+def _parse_int_setting(raw, default, minimum=None, maximum=None):
     if raw is None or str(raw).strip() == "":
         v = default
     else:
@@ -322,6 +461,12 @@ def addon_get_int(addon, key, default=0, minimum=None, maximum=None):
     return v
 
 
+def addon_set_setting(addon, key, value):
+    """``setSetting`` followed by a cache drop, so this process reads the new value at once."""
+    addon.setSetting(key, value)
+    invalidate_settings_cache()
+
+
 def get_skip_jump_offset_seconds(addon):
     """Seconds added to the computed skip destination (-5..+5). Default 0."""
     return addon_get_int(addon, "skip_jump_offset_seconds", 0, minimum=-5, maximum=5)
@@ -344,23 +489,47 @@ def compute_skip_seek_destination_seconds(segment, addon):
 _DEFAULT_LOG_TAG = "service"
 
 
+def format_log_message(msg, args=()):
+    """
+    Render a lazy log message: ``msg()`` when callable, then ``msg % args`` when args were
+    given. The log helpers call this only after the level check, so callers passing
+    ``("... %s", value)`` or a lambda pay nothing when the line is dropped.
+    """
+    if callable(msg):
+        msg = msg()
+    if not args:
+        return msg
+    try:
+        return msg % args
+    except (TypeError, ValueError):
+        return "%s %r" % (msg, args)
+
+
 def _skippy_log_line(msg, tag=_DEFAULT_LOG_TAG):
     return "[service.skippy - %s] %s" % (tag or _DEFAULT_LOG_TAG, _ascii_log_text(msg))
 
 
-def log(msg, *, tag=_DEFAULT_LOG_TAG):
-    """Standard INFO trace when verbose is on and log level is Normal or All detail."""
+def log(msg, *args, tag=_DEFAULT_LOG_TAG):
+    """
+    Standard INFO trace when verbose is on and log level is Normal or All detail.
+
+    All log helpers take ``msg, *args`` (``%``-style) or a zero-argument callable and only
+    format after the level check.
+    """
     addon = get_addon()
     if not addon:
-        xbmc.log(_skippy_log_line("%s (shutdown)" % msg, tag), xbmc.LOGINFO)
+        write_line(
+            _skippy_log_line("%s (shutdown)" % format_log_message(msg, args), tag),
+            xbmc.LOGINFO,
+        )
         return
     lv = skippy_log_effective_detail_level(addon)
     if lv == "Off" or lv == SKIPPY_LOG_ERROR_ONLY:
         return
-    xbmc.log(_skippy_log_line(msg, tag), xbmc.LOGINFO)
+    write_line(_skippy_log_line(format_log_message(msg, args), tag), xbmc.LOGINFO)
 
 
-def log_error(msg, *, tag=_DEFAULT_LOG_TAG):
+def log_error(msg, *args, tag=_DEFAULT_LOG_TAG):
     """LOGERROR when verbose is on (any level except Off). For Errors-only mode this is the main output."""
     addon = get_addon()
     if not addon:
@@ -368,10 +537,12 @@ def log_error(msg, *, tag=_DEFAULT_LOG_TAG):
     lv = skippy_log_effective_detail_level(addon)
     if lv == "Off":
         return
-    xbmc.log(_skippy_log_line(msg, tag), xbmc.LOGERROR)
+    write_line(_skippy_log_line(format_log_message(msg, args), tag), xbmc.LOGERROR)
+    # Errors are what a trace is read for; make sure everything before it has been written.
+    flush_log_sink()
 
 
-def log_remote(msg):
+def log_remote(msg, *args):
     """Online lookup INFO lines; Normal or All only (same channel as former _rlog)."""
     addon = get_addon()
     if not addon:
@@ -379,10 +550,13 @@ def log_remote(msg):
     lv = skippy_log_effective_detail_level(addon)
     if lv not in (SKIPPY_LOG_NORMAL, SKIPPY_LOG_ALL):
         return
-    xbmc.log("[service.skippy - remote] %s" % _ascii_log_text(msg), xbmc.LOGINFO)
+    write_line(
+        "[service.skippy - remote] %s" % _ascii_log_text(format_log_message(msg, args)),
+        xbmc.LOGINFO,
+    )
 
 
-def log_segment_detail(msg):
+def log_segment_detail(msg, *args):
     """High-frequency SegmentItem traces; All detail only."""
     addon = get_addon()
     if not addon:
@@ -393,10 +567,13 @@ def log_segment_detail(msg):
         aid = addon.getAddonInfo("id")
     except Exception:
         aid = "service.skippy"
-    xbmc.log(f"[{aid} - SegmentItem] {_ascii_log_text(msg)}", xbmc.LOGINFO)
+    write_line(
+        f"[{aid} - SegmentItem] {_ascii_log_text(format_log_message(msg, args))}",
+        xbmc.LOGINFO,
+    )
 
 
-def log_service_detail(msg, *, tag=_DEFAULT_LOG_TAG):
+def log_service_detail(msg, *args, tag=_DEFAULT_LOG_TAG):
     """Per-loop JSON-RPC, path probes, per-atom parse lines; All detail only (quiets Normal).
 
     tag: short sub-source for kodi.log filters, e.g. jsonrpc, segments, sidecar, playback.
@@ -406,10 +583,10 @@ def log_service_detail(msg, *, tag=_DEFAULT_LOG_TAG):
         return
     if skippy_log_effective_detail_level(addon) != SKIPPY_LOG_ALL:
         return
-    xbmc.log(_skippy_log_line(msg, tag), xbmc.LOGINFO)
+    write_line(_skippy_log_line(format_log_message(msg, args), tag), xbmc.LOGINFO)
 
 
-def log_segment(msg):
+def log_segment(msg, *args):
     """SegmentItem INFO when verbose is Normal or All (not Error-only)."""
     addon = get_addon()
     if not addon:
@@ -421,7 +598,10 @@ def log_segment(msg):
         aid = addon.getAddonInfo("id")
     except Exception:
         aid = "service.skippy"
-    xbmc.log(f"[{aid} - SegmentItem] {_ascii_log_text(msg)}", xbmc.LOGINFO)
+    write_line(
+        f"[{aid} - SegmentItem] {_ascii_log_text(format_log_message(msg, args))}",
+        xbmc.LOGINFO,
+    )
 
 
 def _playback_snap_trim(s, max_len=120):
@@ -506,6 +686,7 @@ def log_playback_settings_snapshot(addon=None):
             "online_sidecar_snap_neighbor_start=%s" % bo("online_sidecar_snap_neighbor_start", False),
             "online_sidecar_snap_neighbor_end=%s" % bo("online_sidecar_snap_neighbor_end", False),
             "tv_prefetch_next_episode=%s" % bo("tv_prefetch_next_episode", True),
+            "tv_prefetch_episode_count=%s" % ni("tv_prefetch_episode_count", 2),
         ]
     )
     part_api = ", ".join(
@@ -514,6 +695,7 @@ def log_playback_settings_snapshot(addon=None):
             "tv_tmdb_api_key_set=%s" % tmdb_set,
             "tv_tmdb_use_helper_api_key=%s" % bo("tv_tmdb_use_helper_api_key", True),
             "remote_api_failure_cooldown_seconds=%s" % ni("remote_api_failure_cooldown_seconds", 120),
+            "remote_cache_stale_while_revalidate=%s" % bo("remote_cache_stale_while_revalidate", True),
             "toast_not_found_tv=%s" % bo("show_not_found_toast_for_tv_episodes", True),
             "toast_not_found_movie=%s" % bo("show_not_found_toast_for_movies", False),
             "toast_overlap=%s" % bo("show_toast_for_overlapping_nested_segments", False),
@@ -522,6 +704,7 @@ def log_playback_settings_snapshot(addon=None):
             % bo("show_toast_for_segment_marker", True),
             "enable_verbose_logging=%s" % verb,
             "skippy_log_detail_level=%s" % detail,
+            "buffered_log_sink=%s" % bo("buffered_log_sink", False),
         ]
     )
     kw = _playback_snap_trim(tx("custom_segment_keywords", ""), 160)
@@ -539,13 +722,14 @@ def log_playback_settings_snapshot(addon=None):
     log("📋 Playback settings snapshot [API, toasts, logging] — %s" % part_api)
 
 
-def log_always(msg, *, tag=_DEFAULT_LOG_TAG):
+def log_always(msg, *args, tag=_DEFAULT_LOG_TAG):
     """Startup/shutdown and rare critical paths; always INFO."""
+    msg = format_log_message(msg, args)
     addon = get_addon()
     if addon:
-        xbmc.log(_skippy_log_line(msg, tag), xbmc.LOGINFO)
+        write_line(_skippy_log_line(msg, tag), xbmc.LOGINFO)
     else:
-        xbmc.log(_skippy_log_line("%s (shutdown)" % msg, tag), xbmc.LOGINFO)
+        write_line(_skippy_log_line("%s (shutdown)" % msg, tag), xbmc.LOGINFO)
 
 def normalize_label(label):
     # Normalize and lowercase labels for consistent matching
@@ -13,7 +13,6 @@ from addon_skin_resolution import (
 from settings_utils import (
     SKIPPY_LOG_ERROR_ONLY,
     addon_get_bool,
-    addon_get_int,
     addon_get_setting_text,
     get_addon,
     get_localized,
@@ -25,6 +24,7 @@ from skip_dialog_appearance import (
     SMOOTH_BAR_WINDOW_PROP as _SMOOTH_BAR_WINDOW_PROP,
     SMOOTH_PROGRESS_FILL_ID as _SMOOTH_PROGRESS_FILL_ID,
     AddonSettingsReader,
+    DictSettingsReader,
     apply_full_skip_layout,
     apply_jump_properties,
     build_skip_button_label as _build_skip_button_label,
@@ -56,6 +56,7 @@ from skip_dialog_appearance import (
     shadow_for_text as _shadow_for_text,
 )
 from skip_dialog_window_ui import _argb_to_kodi
+from skippy_log_sink import write_line
 
 
 def _ascii_log_text(msg):
@@ -83,6 +84,29 @@ def _minimal_plate_filename(addon):
     return minimal_plate_filename(AddonSettingsReader(addon))
 
 
+# Settings the progress loop reads; captured once per dialog in onInit so frames never
+# touch the addon handle.
+_FRAME_LOOP_SETTING_KEYS = (
+    "smooth_progress_bar",
+    "progress_bar_updates_per_second",
+    "show_progress_bar",
+    "progress_bar_countdown",
+    "skip_duration_format",
+    "skip_duration_content",
+)
+
+
+def _frame_settings_snapshot(addon):
+    """``DictSettingsReader`` over the progress-loop settings (unset keys use defaults)."""
+    data = {}
+    if addon:
+        for key in _FRAME_LOOP_SETTING_KEYS:
+            raw = addon_get_setting_text(addon, key, "")
+            if raw:
+                data[key] = raw
+    return DictSettingsReader(data)
+
+
 def log(msg):
     addon = get_addon()
     if not addon:
@@ -91,9 +115,9 @@ def log(msg):
     if lv == "Off" or lv == SKIPPY_LOG_ERROR_ONLY:
         return
     try:
-        xbmc.log(f"[{addon.getAddonInfo('id')} - SkipDialog] {_ascii_log_text(msg)}", xbmc.LOGINFO)
+        write_line(f"[{addon.getAddonInfo('id')} - SkipDialog] {_ascii_log_text(msg)}", xbmc.LOGINFO)
     except RuntimeError:
-        xbmc.log(f"[service.skippy - SkipDialog] {_ascii_log_text(msg)}", xbmc.LOGINFO)
+        write_line(f"[service.skippy - SkipDialog] {_ascii_log_text(msg)}", xbmc.LOGINFO)
 
 def log_always(msg):
     # This function is now more robust against shutdown failures
@@ -171,6 +195,7 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
         duration_str = f"{m}m{s}s" if m else f"{s}s"
 
         addon = get_addon()
+        self._frame_settings = _frame_settings_snapshot(addon)
         raw_font_color = (
             addon_get_setting_text(addon, "skip_dialog_font_color", "FFFFFFFF") or "FFFFFFFF"
         ).strip()
@@ -263,7 +288,7 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
         self._skippy_dialog_result = None
         self.player = xbmc.Player()
         self._total_duration = self.segment.end_seconds - self.segment.start_seconds
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
 
         jump_str = apply_jump_properties(self, addon, self.segment, all_caps=self._skip_all_caps)
         if jump_str:
@@ -341,28 +366,84 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
                     f"❌ CRITICAL: Failed to set focus to any button - dialog may not be functional: {e2}"
                 )
 
+    def _frame_settings_reader(self):
+        settings = getattr(self, "_frame_settings", None)
+        if settings is None:
+            settings = self._frame_settings = _frame_settings_snapshot(get_addon())
+        return settings
+
+    def _control(self, control_id):
+        """``getControl`` once per dialog; control handles stay valid while the window is open."""
+        controls = getattr(self, "_controls", None)
+        if controls is None:
+            controls = self._controls = {}
+        control = controls.get(control_id)
+        if control is None:
+            control = controls[control_id] = self.getControl(control_id)
+        return control
+
+    def _prepare_progress_bar(self, show_progress, smooth, raw_setting):
+        """Set progress-bar visibility once; the settings cannot change while the dialog is up."""
+        progress = self._control(3014)
+        self._last_progress_percent = None
+        if show_progress and smooth:
+            # Keep the width seeded by the layout so the first frame only moves the fill.
+            progress.setVisible(False)
+            self._set_smooth_bar_window_visible(True)
+            return
+        self._last_smooth_fill_w = None
+        if show_progress:
+            self._set_smooth_bar_window_visible(False)
+            progress.setVisible(True)
+        else:
+            progress.setVisible(False)
+            self._set_smooth_bar_window_visible(False)
+            log(f"📊 Progress bar hidden due to setting (raw: '{raw_setting}')")
+
     def _monitor_segment_end(self):
         timeout = self._total_duration + 5  # ⏳ Dynamic timeout based on segment length
         self._last_smooth_fill_w = getattr(self, "_last_smooth_fill_w", None)
         self._last_smooth_log_ts = 0.0
         self._last_classic_log_ts = 0.0
 
+        settings = self._frame_settings_reader()
+        smooth = settings.get_bool("smooth_progress_bar", False)
+        ups = settings.get_int("progress_bar_updates_per_second", 4, minimum=2, maximum=120)
+        delay = (1.0 / ups) if (smooth or getattr(self, "_combined_mode", False)) else 0.25
+        raw_setting = settings.get_text("show_progress_bar", "")
+        show_progress = settings.get_bool("show_progress_bar", False)
+        countdown = settings.get_bool("progress_bar_countdown", False)
+        bar_w = getattr(
+            self,
+            "_skip_progress_bar_width",
+            self._skin_sc(FULL_SKIP_PROGRESS_BAR_WIDTH),
+        )
+        bar_prepared = False
+        last_countdown = None
+        # Frame budget is the frame interval: work that overruns it pushes the next frame
+        # past its slot, and every whole interval overrun counts as a dropped frame.
+        frames = 0
+        dropped = 0
+        worst = 0.0
+        # Frames are scheduled on a monotonic grid (start + n * delay) so time spent
+        # updating controls does not stretch the interval; a late frame re-anchors the grid.
+        next_frame = time.monotonic()
+
         while not self._closing:
+            frame_start = time.monotonic()
             if not self.player.isPlaying():
                 log("⏹️ Playback stopped during dialog")
                 break
 
-            addon = get_addon()
-            smooth = addon_get_bool(addon, "smooth_progress_bar", False) if addon else False
-            ups = addon_get_int(addon, "progress_bar_updates_per_second", 4) if addon else 4
-            ups = min(120, max(2, ups))
-            delay = (1.0 / ups) if (smooth or getattr(self, "_combined_mode", False)) else 0.25
-
             current = self.player.getTime()
             remaining = int(self.segment.end_seconds - current)
             m, s = divmod(max(remaining, 0), 60)
-            self.setProperty("countdown", f"{m:02d}:{s:02d}")
-            self._refresh_countdown_label()
+            countdown_text = f"{m:02d}:{s:02d}"
+            # Every GUI call takes Kodi's GUI lock; only push what changed since the last frame.
+            if countdown_text != last_countdown:
+                last_countdown = countdown_text
+                self.setProperty("countdown", countdown_text)
+                self._refresh_countdown_label(countdown_text)
             self._refresh_skip_duration_label(current)
 
             if not self._minimal_mode:
@@ -370,65 +451,40 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
                     if getattr(self, "_combined_mode", False):
                         self._update_combined_fill(current)
                     else:
-                        raw_setting = addon_get_setting_text(addon, "show_progress_bar", "")
-                        show_progress = addon_get_bool(addon, "show_progress_bar", False)
-                        countdown = addon_get_bool(addon, "progress_bar_countdown", False) if addon else False
-                        progress = self.getControl(3014)
-                        fill = self.getControl(_SMOOTH_PROGRESS_FILL_ID)
-
-                        if show_progress:
-                            if smooth:
-                                progress.setVisible(False)
-                                self._set_smooth_bar_window_visible(True)
-                                elapsed_f = _elapsed_progress_percent_float(
-                                    current, self.segment.start_seconds, self._total_duration
-                                )
-                                pct_f = _progress_display_percent_float(elapsed_f, countdown)
-                                w = int(
-                                    round(
-                                        (pct_f / 100.0)
-                                        * getattr(
-                                            self,
-                                            "_skip_progress_bar_width",
-                                            self._skin_sc(FULL_SKIP_PROGRESS_BAR_WIDTH),
-                                        )
-                                    )
+                        if not bar_prepared:
+                            self._prepare_progress_bar(show_progress, smooth, raw_setting)
+                            bar_prepared = True
+
+                        if show_progress and smooth:
+                            elapsed_f = _elapsed_progress_percent_float(
+                                current, self.segment.start_seconds, self._total_duration
+                            )
+                            pct_f = _progress_display_percent_float(elapsed_f, countdown)
+                            w = int(round((pct_f / 100.0) * bar_w))
+                            w = max(0, min(bar_w, w))
+                            if w != self._last_smooth_fill_w:
+                                self._last_smooth_fill_w = w
+                                self._control(_SMOOTH_PROGRESS_FILL_ID).setWidth(w)
+                            now_wall = time.monotonic()
+                            if (now_wall - self._last_smooth_log_ts) >= 1.5:
+                                self._last_smooth_log_ts = now_wall
+                                log(
+                                    f"📊 Smooth bar {w}px (≈{pct_f:.2f}%, countdown={countdown}, ups={ups}, raw: '{raw_setting}')"
                                 )
-                                bar_w = getattr(
-                                    self,
-                                    "_skip_progress_bar_width",
-                                    self._skin_sc(FULL_SKIP_PROGRESS_BAR_WIDTH),
+                        elif show_progress:
+                            elapsed_pct = _elapsed_progress_percent(
+                                current, self.segment.start_seconds, self._total_duration
+                            )
+                            disp = _progress_display_percent(elapsed_pct, countdown)
+                            if disp != self._last_progress_percent:
+                                self._last_progress_percent = disp
+                                self._control(3014).setPercent(disp)
+                            now_wall = time.monotonic()
+                            if (now_wall - self._last_classic_log_ts) >= 1.5:
+                                self._last_classic_log_ts = now_wall
+                                log(
+                                    f"📊 Progress bar {disp}% (elapsed={elapsed_pct}%, countdown={countdown}, raw: '{raw_setting}')"
                                 )
-                                w = max(0, min(bar_w, w))
-                                if w != self._last_smooth_fill_w:
-                                    self._last_smooth_fill_w = w
-                                    fill.setWidth(w)
-                                now_wall = time.time()
-                                if (now_wall - self._last_smooth_log_ts) >= 1.5:
-                                    self._last_smooth_log_ts = now_wall
-                                    log(
-                                        f"📊 Smooth bar {w}px (≈{pct_f:.2f}%, countdown={countdown}, ups={ups}, raw: '{raw_setting}')"
-                                    )
-                            else:
-                                self._last_smooth_fill_w = None
-                                self._set_smooth_bar_window_visible(False)
-                                progress.setVisible(True)
-                                elapsed_pct = _elapsed_progress_percent(
-                                    current, self.segment.start_seconds, self._total_duration
-                                )
-                                disp = _progress_display_percent(elapsed_pct, countdown)
-                                progress.setPercent(disp)
-                                now_wall = time.time()
-                                if (now_wall - self._last_classic_log_ts) >= 1.5:
-                                    self._last_classic_log_ts = now_wall
-                                    log(
-                                        f"📊 Progress bar {disp}% (elapsed={elapsed_pct}%, countdown={countdown}, raw: '{raw_setting}')"
-                                    )
-                        else:
-                            self._last_smooth_fill_w = None
-                            progress.setVisible(False)
-                            self._set_smooth_bar_window_visible(False)
-                            log(f"📊 Progress bar hidden due to setting (raw: '{raw_setting}')")
                 except Exception as e:
                     log(f"⚠️ Progress bar update error: {e}")
 
@@ -439,22 +495,40 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
                 break
 
             # ⏳ Timeout fallback
-            if time.time() - self._start_time > timeout:
+            now = time.monotonic()
+            if now - self._start_time > timeout:
                 log("⏳ Timeout reached — auto-decline")
                 self._finish_dialog(False)
                 break
 
-            time.sleep(delay)
+            frames += 1
+            work = now - frame_start
+            worst = max(worst, work)
+            if work > delay:
+                dropped += int(work // delay)
+
+            next_frame += delay
+            if next_frame > now:
+                time.sleep(next_frame - now)
+            else:
+                next_frame = now
+
+        self._frames_rendered = frames
+        self._frames_dropped = dropped
+        log(
+            f"🎞️ Progress loop: {frames} frame(s), {dropped} dropped "
+            f"(budget {delay * 1000:.0f} ms, worst {worst * 1000:.1f} ms)"
+        )
 
     def _refresh_skip_duration_label(self, playhead):
         if not getattr(self, "_skip_duration_live", False):
             return
+        dur = skip_duration_for_playhead(playhead, self.segment, self._frame_settings_reader())
+        if dur == getattr(self, "_last_skip_dur_key", None):
+            return
         addon = get_addon()
         if not addon:
             return
-        dur = skip_duration_for_playhead(playhead, self.segment, AddonSettingsReader(addon))
-        if dur == getattr(self, "_last_skip_dur_key", None):
-            return
         self._last_skip_dur_key = dur
         label = apply_skip_dialog_caps(
             _build_skip_button_label(self.segment, self._skip_fmt, dur, addon),
@@ -464,13 +538,12 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
         ids = (3012,) if self._minimal_mode else FULL_SKIP_BUTTON_IDS
         for cid in ids:
             try:
-                _set_skip_button_label(self.getControl(cid), label, text_color)
+                _set_skip_button_label(self._control(cid), label, text_color)
             except Exception:
                 pass
 
     def _update_combined_fill(self, current):
-        addon = get_addon()
-        countdown = addon_get_bool(addon, "progress_bar_countdown", False) if addon else False
+        countdown = self._frame_settings_reader().get_bool("progress_bar_countdown", False)
         bar_w = getattr(
             self,
             "_skip_progress_bar_width",
@@ -482,7 +555,10 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
         pct_f = _progress_display_percent_float(elapsed_f, countdown)
         w = int(round((pct_f / 100.0) * float(bar_w)))
         w = max(0, min(int(bar_w), w))
-        sliced = self.getProperty("skippy_combined_slice") == "true"
+        sliced = getattr(self, "_combined_sliced", None)
+        if sliced is None:
+            # Set once by the combined layout in onInit; read it on the first frame only.
+            sliced = self._combined_sliced = self.getProperty("skippy_combined_slice") == "true"
         if sliced and w > 0:
             w = max(w, min(int(bar_w), COMBINED_SLICE_MIN_W))
         if w == getattr(self, "_last_smooth_fill_w", None):
@@ -490,7 +566,7 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
         self._last_smooth_fill_w = w
         fill_id = COMBINED_FILL_SLICE_ID if sliced else COMBINED_FILL_STRETCH_ID
         try:
-            self.getControl(fill_id).setWidth(w)
+            self._control(fill_id).setWidth(w)
         except Exception:
             pass
 
@@ -529,18 +605,20 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
         except Exception as e:
             log(f"⚠️ _apply_dialog_text_colors: {e}")
 
-    def _refresh_countdown_label(self):
+    def _refresh_countdown_label(self, countdown=None):
         if self._minimal_mode:
             return
         if self.getProperty("hide_ending_text") == "true":
             return
         try:
-            c = self.getControl(2)
             et = self.getProperty("ending_text") or ""
-            cd = self.getProperty("countdown") or ""
+            cd = countdown if countdown is not None else (self.getProperty("countdown") or "")
             line = f"{et} {cd}".strip()
+            if line == getattr(self, "_last_countdown_line", None):
+                return
             text_color = ENDING_TEXT_ARGB
-            _set_skip_info_label(c, line, text_color, font="font10")
+            _set_skip_info_label(self._control(2), line, text_color, font="font10")
+            self._last_countdown_line = line
         except Exception:
             pass
 
@@ -576,9 +654,7 @@ class SkipDialog(xbmcgui.WindowXMLDialog):
                 self.setProperty("skippy_progress_ready", "false")
             except Exception:
                 pass
-            _ad = get_addon()
-            show_progress = addon_get_bool(_ad, "show_progress_bar", False) if _ad else False
-            if show_progress:
+            if self._frame_settings_reader().get_bool("show_progress_bar", False):
                 self.getControl(3014).setPercent(0)
                 try:
                     self.getControl(_SMOOTH_PROGRESS_FILL_ID).setWidth(0)
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""Buffered background writer for Skippy's kodi.log lines (``buffered_log_sink``).
+
+At All detail the service loop, the prefetch thread and the skip dialog write many lines
+per second, and every ``xbmc.log`` call is synchronous: full tracing shifts the very
+timings it is meant to capture. While the sink runs, ``write_line`` only appends the
+finished line to a bounded queue and a daemon thread hands it to ``xbmc.log``:
+
+- the queue holds ``QUEUE_CAPACITY`` lines; when the writer falls behind, the oldest
+  unwritten lines are dropped and counted, and the count is logged with the next batch;
+- ``flush`` blocks until everything queued so far is written (abort, ``log_error``);
+- the last ``TAIL_LINES`` written lines are kept so ``dump_log_tail`` can save them to
+  ``addon_data/service.skippy/log_tail.txt`` on demand;
+- ``stop`` keeps accepting lines until the writer thread has drained the queue and
+  exited, so lines logged during shutdown still land after the older queued ones.
+
+Only the service process starts a sink; elsewhere ``write_line`` writes synchronously.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+
+import xbmc
+
+from skippy_profile_store import ensure_parent_dir, profile_path
+
+QUEUE_CAPACITY = 2000
+TAIL_LINES = 500
+TAIL_FILENAME = "log_tail.txt"
+# Upper bound for flush(); a stuck writer must not hang an error path or shutdown.
+FLUSH_TIMEOUT_S = 2.0
+
+_DROPPED_LINE = "[service.skippy - log] %d line(s) dropped by the log buffer"
+
+
+def _xbmc_write(line, level):
+    xbmc.log(line, level)
+
+
+class LogSink:
+    """Bounded line queue drained by one daemon writer thread."""
+
+    def __init__(self, write=None, *, capacity=QUEUE_CAPACITY, tail_lines=TAIL_LINES):
+        self._write = write or _xbmc_write
+        self._capacity = max(1, int(capacity))
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._tail = deque(maxlen=max(1, int(tail_lines)))
+        self._submitted = 0
+        self._done = 0
+        self._dropped = 0
+        self.dropped_total = 0
+        self._closed = False
+        self._exited = False
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        """True while lines are queued rather than written directly (until the writer exits)."""
+        return self._thread is not None and not self._exited
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._closed = False
+            self._exited = False
+            self._thread = threading.Thread(
+                target=self._run, name="skippy-log-sink", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, line, level) -> bool:
+        """Queue ``line``. False once the writer has exited; the caller writes it itself."""
+        with self._cond:
+            if self._exited:
+                return False
+            if len(self._pending) >= self._capacity:
+                self._pending.popleft()
+                self._dropped += 1
+                self.dropped_total += 1
+            self._submitted += 1
+            self._pending.append((self._submitted, line, level))
+            self._cond.notify_all()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    # Decided under the lock: later submits fall back to direct writes,
+                    # which now come after everything this thread wrote.
+                    self._exited = True
+                    self._cond.notify_all()
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+                dropped, self._dropped = self._dropped, 0
+            if dropped:
+                self._emit(_DROPPED_LINE % dropped, xbmc.LOGWARNING)
+            for _seq, line, level in batch:
+                self._emit(line, level)
+            with self._cond:
+                self._done = batch[-1][0]
+                self._cond.notify_all()
+
+    def _emit(self, line, level) -> None:
+        try:
+            self._write(line, level)
+        except Exception:
+            pass
+        self._tail.append(line)
+
+    def flush(self, timeout=FLUSH_TIMEOUT_S) -> bool:
+        """Wait until every line submitted so far is written. False on timeout / no writer."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            target = self._submitted
+            while self._done < target:
+                thread = self._thread
+                if thread is None or not thread.is_alive():
+                    return False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout=FLUSH_TIMEOUT_S) -> None:
+        """
+        Write what is queued, including lines submitted meanwhile, then end the writer
+        thread. Submits keep queueing until the thread has exited.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def tail(self, lines=None) -> list:
+        snapshot = list(self._tail)
+        if lines is not None:
+            snapshot = snapshot[-max(0, int(lines)):] if lines else []
+        return snapshot
+
+
+_lock = threading.Lock()
+_sink: LogSink | None = None
+
+
+def write_line(line, level) -> None:
+    """Queue ``line`` on the running sink, else write it to kodi.log right away."""
+    sink = _sink
+    if sink is None or not sink.submit(line, level):
+        xbmc.log(line, level)
+
+
+def start_log_sink() -> LogSink:
+    global _sink
+    with _lock:
+        if _sink is None or not _sink.running:
+            _sink = LogSink()
+            _sink.start()
+        return _sink
+
+
+def stop_log_sink() -> None:
+    """Drain and stop the sink; later lines are written synchronously again."""
+    global _sink
+    with _lock:
+        # Stays installed while draining so concurrent lines queue behind the older ones.
+        sink = _sink
+        if sink is not None:
+            sink.stop()
+        _sink = None
+
+
+def flush_log_sink(timeout=FLUSH_TIMEOUT_S) -> bool:
+    sink = _sink
+    if sink is None or not sink.running:
+        return True
+    return sink.flush(timeout)
+
+
+def dropped_line_count() -> int:
+    sink = _sink
+    return sink.dropped_total if sink is not None else 0
+
+
+def tail_path() -> str | None:
+    return profile_path(TAIL_FILENAME)
+
+
+def dump_log_tail(lines=None) -> int | None:
+    """
+    Write the last ``lines`` (default all kept) written lines to ``log_tail.txt``.
+    Returns the number of lines saved, or None when no sink runs or the write fails.
+    """
+    sink = _sink
+    if sink is None or not sink.running:
+        return None
+    sink.flush()
+    rows = sink.tail(lines)
+    path = tail_path()
+    if not path or not ensure_parent_dir(path):
+        return None
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as handle:
+            for row in rows:
+                handle.write(row)
+                handle.write("\n")
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    return len(rows)
@@ -52,8 +52,11 @@ def read_json(path: str | None, default=None):
         return default
 
 
-def write_json(path: str | None, data) -> bool:
-    """Write JSON via a temp file + replace so a crash cannot truncate the original."""
+def write_json(path: str | None, data, *, compact: bool = False) -> bool:
+    """
+    Write JSON via a temp file + replace so a crash cannot truncate the original.
+    ``compact`` drops indentation for large machine-only files.
+    """
     if not path:
         return False
     if not ensure_parent_dir(path):
@@ -61,7 +64,10 @@ def write_json(path: str | None, data) -> bool:
     tmp_path = path + ".tmp"
     try:
         with open(tmp_path, "w", encoding="utf-8", newline="\n") as handle:
-            json.dump(data, handle, indent=2, ensure_ascii=False, sort_keys=True)
+            if compact:
+                json.dump(data, handle, separators=(",", ":"), ensure_ascii=False)
+            else:
+                json.dump(data, handle, indent=2, ensure_ascii=False, sort_keys=True)
             handle.write("\n")
         os.replace(tmp_path, path)
         return True
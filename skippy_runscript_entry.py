@@ -101,6 +101,24 @@ def main():
             )
             return
 
+        # --- Diagnostics (the log buffer lives in the service process) ---
+        if command == "dump_log_buffer":
+            import json
+
+            import xbmc
+
+            xbmc.executeJSONRPC(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "JSONRPC.NotifyAll",
+                        "params": {"sender": "service.skippy", "message": "dump_log_buffer"},
+                        "id": 1,
+                    }
+                )
+            )
+            return
+
         # --- Backup / restore (delegated modules only) ---
         if command == "backup_settings":
             from settings_backup import run_backup_ui
@@ -3,7 +3,13 @@
 
 Counters live in ``addon_data/service.skippy/statistics.json`` and are updated from
 both the playback loop and background prefetch/upload threads, so every mutation goes
-through one lock and a write-through cache.
+through one lock and an in-memory cache.
+
+Counter events are written behind: they mark the cache dirty and a timer persists it
+``FLUSH_DELAY_S`` later, so a skip never waits on a JSON dump and a binge session does not
+rewrite the file after every seek. ``flush_statistics`` writes pending changes at once; the
+main loop calls it when playback stops and the service calls it on shutdown. Merges and
+resets are written immediately.
 """
 
 from __future__ import annotations
@@ -17,8 +23,13 @@ from skippy_profile_store import profile_path, read_json, write_json
 STATS_FILENAME = "statistics.json"
 SCHEMA = "skippy_statistics_v1"
 
+# Pending counter changes are persisted at most this long after the first one.
+FLUSH_DELAY_S = 30.0
+
 _lock = threading.RLock()
 _cache: dict | None = None
+_dirty = False
+_flush_timer: threading.Timer | None = None
 
 
 def _log(msg: str) -> None:
@@ -99,11 +110,49 @@ def load_statistics() -> dict:
         }
 
 
-def _flush() -> None:
+def _flush() -> bool:
+    global _dirty
     if _cache is None:
-        return
+        return False
     if not write_json(_stats_path(), _cache):
+        # Stay dirty so the next flush retries.
         _log("could not write statistics file")
+        return False
+    _dirty = False
+    return True
+
+
+def _mark_dirty() -> None:
+    """Schedule a write-behind flush (caller holds ``_lock``)."""
+    global _dirty, _flush_timer
+    _dirty = True
+    if _flush_timer is None:
+        timer = threading.Timer(FLUSH_DELAY_S, _flush_from_timer)
+        timer.daemon = True
+        timer.name = "skippy-stats-flush"
+        _flush_timer = timer
+        timer.start()
+
+
+def _flush_from_timer() -> None:
+    global _flush_timer
+    with _lock:
+        if _flush_timer is threading.current_thread():
+            _flush_timer = None
+        if _dirty:
+            _flush()
+
+
+def flush_statistics() -> bool:
+    """Write pending counter changes now. Returns True when the file was written."""
+    global _flush_timer
+    with _lock:
+        timer, _flush_timer = _flush_timer, None
+        if timer is not None:
+            timer.cancel()
+        if not _dirty:
+            return False
+        return _flush()
 
 
 def record_skip(segment_label, seconds_saved=0.0) -> None:
@@ -117,7 +166,7 @@ def record_skip(segment_label, seconds_saved=0.0) -> None:
         )
         by_type = _cache["skips"]["by_type"]
         by_type[label] = by_type.get(label, 0) + 1
-        _flush()
+        _mark_dirty()
 
 
 def record_online_segments_downloaded(count) -> None:
@@ -128,7 +177,7 @@ def record_online_segments_downloaded(count) -> None:
     with _lock:
         load_statistics()
         _cache["online"]["segments_downloaded"] += added
-        _flush()
+        _mark_dirty()
 
 
 def record_online_segment_uploaded(count=1) -> None:
@@ -139,7 +188,7 @@ def record_online_segment_uploaded(count=1) -> None:
     with _lock:
         load_statistics()
         _cache["online"]["segments_uploaded"] += added
-        _flush()
+        _mark_dirty()
 
 
 def merge_statistics_from_backup(incoming) -> bool:
@@ -150,6 +199,7 @@ def merge_statistics_from_backup(incoming) -> bool:
     backup) and keeps the earlier ``since_utc`` when both are present.
     Returns True when anything changed.
     """
+    global _dirty
     incoming_stats = _normalized(incoming)
     with _lock:
         load_statistics()
@@ -187,18 +237,22 @@ def merge_statistics_from_backup(incoming) -> bool:
                 changed = True
 
         if changed:
-            _flush()
+            _dirty = True
+            flush_statistics()
         return changed
 
 
 def reset_statistics() -> None:
-    global _cache
+    global _cache, _dirty
     with _lock:
         _cache = _empty_stats()
-        _flush()
+        _dirty = True
+        flush_statistics()
 
 
 def clear_cache() -> None:
+    """Drop the in-memory counters after writing any pending changes."""
     global _cache
     with _lock:
+        flush_statistics()
         _cache = None
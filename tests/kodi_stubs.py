@@ -133,6 +133,10 @@ def install_kodi_stubs(*, addon=None):
     # (and each test module) starts from the addon it just registered.
     if "settings_utils" in sys.modules:
         sys.modules["settings_utils"].invalidate_settings_cache()
+    # Directory listings are shared process-wide; a listing from an earlier test
+    # must not answer for a differently stubbed ``listdir``.
+    if "service_sidecar_paths" in sys.modules:
+        sys.modules["service_sidecar_paths"].clear_directory_listing_cache()
 
     return addon
 
@@ -74,6 +74,22 @@ class JustSkippedHelperTests(unittest.TestCase):
         monitor.last_ask_mono = time.monotonic() - 1.0
         self.assertFalse(mod.ask_same_seg_on_cooldown(monitor, (0, 65)))
 
+    def test_refused_asks_log_unformatted(self):
+        recap = SegmentItem(0.0, 65.0, "recap", source="xml")
+        monitor = _base_monitor([recap])
+        ctx = _base_ctx(monitor)
+        monitor.skip_dialog_modal_active = True
+        self.assertIsNone(mod._handle_ask_skip(ctx, recap, (0, 65), 65.0, MagicMock()))
+        monitor.skip_dialog_modal_active = False
+        mod.stamp_ask_opened(monitor, (0, 65))
+        self.assertIsNone(mod._handle_ask_skip(ctx, recap, (0, 65), 65.0, MagicMock()))
+        (key1, _msg1, *args1), (key2, _msg2, *args2) = [
+            c.args for c in ctx.log_if_changed.call_args_list
+        ]
+        self.assertEqual((key1, args1), ("skip_dialog_in_flight", [(0, 65)]))
+        self.assertEqual(key2, ("ask_cooldown", (0, 65)))
+        self.assertEqual(args2[0], (0, 65))
+
 
 class JustSkippedProcessTests(unittest.TestCase):
     def test_blocks_same_seg_auto_while_still_inside(self):
@@ -2,6 +2,8 @@
 """Matroska chapter header parse and embedded-chapter JSON-RPC fallback."""
 
 import json
+import tempfile
+import types
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -9,7 +11,9 @@ from tests.kodi_stubs import install_kodi_stubs
 
 install_kodi_stubs()
 
-from mkv_chapter_parse import parse_matroska_chapters_from_bytes
+import mkv_chapter_parse
+import skippy_profile_store
+from mkv_chapter_parse import parse_matroska_chapters_from_bytes, parse_matroska_chapters_via_vfs
 from service_embedded_chapters import parse_embedded_chapters
 from settings_utils import normalize_label
 
@@ -71,6 +75,103 @@ class MkvChapterParseTests(unittest.TestCase):
         self.assertEqual(rows[0]["name"], "Intro")
 
 
+def _elem_long(eid: bytes, payload: bytes) -> bytes:
+    """Element with an 8-byte size vint (payloads past the short helper's range)."""
+    return eid + b"\x01" + len(payload).to_bytes(7, "big") + payload
+
+
+def _mkv_with_seekhead_past_void(void_bytes):
+    """SeekHead → Chapters placed after a large Void, as mkvmerge does with reserved space."""
+    intro = _elem(
+        b"\xb6", _elem(b"\x91", _uint(0, 1)) + _elem(b"\x80", _elem(b"\x85", b"Intro"))
+    )
+    chapters = _elem(b"\x10\x43\xa7\x70", _elem(b"\x45\xb9", intro))
+    void = _elem_long(b"\xec", b"\x00" * void_bytes)
+
+    def seekhead_for(rel):
+        seek = _elem(
+            b"\x4d\xbb",
+            _elem(b"\x53\xab", b"\x10\x43\xa7\x70") + _elem(b"\x53\xac", _uint(rel, 4)),
+        )
+        return _elem(b"\x11\x4d\x9b\x74", seek)
+
+    seekhead = seekhead_for(0)
+    seekhead = seekhead_for(len(seekhead) + len(void))
+    body = seekhead + void + chapters
+    ebml = _elem(b"\x1a\x45\xdf\xa3", _elem(b"\x42\x86", b"\x01"))
+    return ebml + _elem_long(b"\x18\x53\x80\x67", body)
+
+
+class _FakeVfsFile:
+    def __init__(self, data):
+        self._data = data
+        self._pos = 0
+        self.bytes_served = 0
+
+    def seek(self, offset, _whence=0):
+        self._pos = offset
+        return offset
+
+    def readBytes(self, nbytes):
+        out = self._data[self._pos : self._pos + nbytes]
+        self._pos += len(out)
+        self.bytes_served += len(out)
+        return bytearray(out)
+
+    def close(self):
+        pass
+
+
+class MkvRangeReadTests(unittest.TestCase):
+    def setUp(self):
+        install_kodi_stubs()
+        self._tmp = tempfile.TemporaryDirectory()
+        patcher = patch.object(
+            skippy_profile_store, "profile_dir", return_value=self._tmp.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+        mkv_chapter_parse.clear_chapters_offset_cache()
+        self.addCleanup(mkv_chapter_parse.clear_chapters_offset_cache)
+        self.data = _mkv_with_seekhead_past_void(2 * 1024 * 1024)
+        self.files = []
+
+    def _open(self, _path):
+        handle = _FakeVfsFile(self.data)
+        self.files.append(handle)
+        return handle
+
+    def _parse(self):
+        stat = types.SimpleNamespace(
+            st_size=lambda: len(self.data), st_mtime=lambda: 1700000000
+        )
+        with patch("xbmcvfs.File", side_effect=self._open), patch(
+            "xbmcvfs.Stat", return_value=stat
+        ):
+            return parse_matroska_chapters_via_vfs("smb://nas/show.mkv")
+
+    def test_seeks_past_void_without_reading_it(self):
+        rows = self._parse()
+        self.assertEqual([r["name"] for r in rows], ["Intro"])
+        self.assertLess(self.files[0].bytes_served, 128 * 1024)
+
+    def test_remembered_offset_skips_header_walk(self):
+        self._parse()
+        mkv_chapter_parse.clear_chapters_offset_cache()
+        rows = self._parse()
+        self.assertEqual([r["name"] for r in rows], ["Intro"])
+        self.assertLess(self.files[1].bytes_served, 1024)
+
+    def test_no_chapters_is_remembered(self):
+        ebml = _elem(b"\x1a\x45\xdf\xa3", _elem(b"\x42\x86", b"\x01"))
+        cluster = _elem(b"\x1f\x43\xb6\x75", b"\x00" * 16)
+        self.data = ebml + _elem(b"\x18\x53\x80\x67", cluster)
+        self.assertEqual(self._parse(), [])
+        self.assertEqual(self._parse(), [])
+        self.assertEqual(self.files[1].bytes_served, 0)
+
+
 class EmbeddedChaptersJsonRpcTests(unittest.TestCase):
     def setUp(self):
         self.addon = install_kodi_stubs()
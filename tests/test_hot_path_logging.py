@@ -3,7 +3,8 @@
 
 import sys
 import unittest
-from unittest.mock import patch
+from dataclasses import FrozenInstanceError
+from unittest.mock import MagicMock, patch
 
 from tests.kodi_stubs import install_kodi_stubs
 
@@ -28,6 +29,41 @@ class HotPathLoggingTests(unittest.TestCase):
             seg.get_duration()
         mock_detail.assert_not_called()
 
+    @patch("segment_item.log_segment")
+    def test_construction_and_to_dict_do_not_log(self, mock_log):
+        seg = SegmentItem(0.0, 60.0, "intro", source="xml")
+        seg.to_dict()
+        seg.with_jump(90.0, "recap")
+        mock_log.assert_not_called()
+
+
+class SegmentItemCloneTests(unittest.TestCase):
+    def test_slotted_instances_have_no_dict(self):
+        seg = SegmentItem(0.0, 60.0, "intro", source="xml")
+        self.assertFalse(hasattr(seg, "__dict__"))
+        with self.assertRaises(AttributeError):
+            seg.unexpected = 1
+
+    def test_with_jump_copies_fields_and_sets_jump(self):
+        seg = SegmentItem(5.0, 60.0, "Intro", source="edl", action_type="Skip", timeout=3.0, allow_input=False)
+        seg.next_segment_start = 40.0
+        clone = seg.with_jump(90.0, "recap")
+        self.assertIsNot(clone, seg)
+        self.assertEqual(
+            clone.to_dict(),
+            dict(seg.to_dict(), next_segment_start=90.0, next_segment_info="recap"),
+        )
+        self.assertEqual(seg.next_segment_start, 40.0)
+        self.assertEqual(seg.with_jump().next_segment_start, None)
+
+    def test_copy_keeps_jump(self):
+        import copy
+
+        seg = SegmentItem(0.0, 60.0, "intro", next_segment_start=70.0, next_segment_info="x")
+        clone = copy.copy(seg)
+        self.assertIsNot(clone, seg)
+        self.assertEqual(clone.to_dict(), seg.to_dict())
+
 
 class SettingsCacheTests(unittest.TestCase):
     def tearDown(self):
@@ -125,6 +161,72 @@ class LogTagAndLevelTests(unittest.TestCase):
         self.assertEqual(recorded, [])
 
 
+class LazyLogFormattingTests(unittest.TestCase):
+    def tearDown(self):
+        settings_utils.invalidate_settings_cache()
+
+    def _at_level(self, level):
+        return (
+            patch.object(settings_utils, "get_addon", return_value=object()),
+            patch.object(settings_utils, "skippy_log_effective_detail_level", return_value=level),
+        )
+
+    def test_dropped_lines_are_never_formatted(self):
+        build = MagicMock(return_value="expensive")
+        arg = MagicMock()
+        addon_patch, level_patch = self._at_level("Off")
+        with addon_patch, level_patch, patch.object(settings_utils, "_ascii_log_text") as render:
+            with patch.object(settings_utils.xbmc, "log") as xbmc_log:
+                settings_utils.log(build)
+                settings_utils.log("value %s", arg)
+                settings_utils.log_service_detail("value %s", arg, tag="segments")
+                settings_utils.log_segment_detail(build)
+        build.assert_not_called()
+        arg.__str__.assert_not_called()
+        render.assert_not_called()
+        xbmc_log.assert_not_called()
+
+    def test_written_lines_are_formatted_after_the_check(self):
+        recorded = []
+        addon_patch, level_patch = self._at_level(settings_utils.SKIPPY_LOG_ALL)
+        with addon_patch, level_patch, patch.object(
+            settings_utils.xbmc, "log", side_effect=lambda msg, _lv=None: recorded.append(msg)
+        ):
+            settings_utils.log("Parsed %d segment(s) for %s", 3, "episode")
+            settings_utils.log_service_detail(lambda: "built late", tag="segments")
+            settings_utils.log("100% literal")
+        self.assertIn("Parsed 3 segment(s) for episode", recorded[0])
+        self.assertIn("[service.skippy - segments] built late", recorded[1])
+        self.assertIn("100% literal", recorded[2])
+
+    def test_bad_format_args_do_not_raise(self):
+        self.assertEqual(
+            settings_utils.format_log_message("%d items", ("x",)), "%d items ('x',)"
+        )
+
+    def test_is_enabled_ranks_levels(self):
+        cases = {
+            "Off": (False, False, False),
+            settings_utils.SKIPPY_LOG_ERROR_ONLY: (True, False, False),
+            settings_utils.SKIPPY_LOG_NORMAL: (True, True, False),
+            settings_utils.SKIPPY_LOG_ALL: (True, True, True),
+        }
+        for effective, expected in cases.items():
+            addon_patch, level_patch = self._at_level(effective)
+            with addon_patch, level_patch:
+                got = tuple(
+                    settings_utils.is_enabled(level)
+                    for level in (
+                        settings_utils.SKIPPY_LOG_ERROR_ONLY,
+                        settings_utils.SKIPPY_LOG_NORMAL,
+                        settings_utils.SKIPPY_LOG_ALL,
+                    )
+                )
+            self.assertEqual(got, expected, effective)
+        with patch.object(settings_utils, "get_addon", return_value=None):
+            self.assertFalse(settings_utils.is_enabled())
+
+
 class PlayheadMovedLogTests(unittest.TestCase):
     def test_slow_parse_logs_at_all_detail_only(self):
         from service_main_loop import PARSE_SLOW_LOG_MS
@@ -132,5 +234,81 @@ class PlayheadMovedLogTests(unittest.TestCase):
         self.assertGreaterEqual(PARSE_SLOW_LOG_MS, 200)
 
 
+class SettingsSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.values = {"skip_overlapping_segments": "false", "tv_use_local_chapter_edl": "true"}
+        self.reads = []
+
+        def _get(key):
+            self.reads.append(key)
+            return self.values.get(key, "")
+
+        self.addon = MagicMock()
+        self.addon.getSetting = _get
+        xbmcaddon = sys.modules["xbmcaddon"]
+        original = xbmcaddon.Addon
+        xbmcaddon.Addon = lambda _addon_id: self.addon
+        self.addCleanup(setattr, xbmcaddon, "Addon", original)
+        settings_utils.invalidate_settings_cache()
+        self.addCleanup(settings_utils.invalidate_settings_cache)
+        self.addCleanup(setattr, settings_utils, "_snapshot_enabled", False)
+
+    def test_declared_ids_come_from_settings_xml(self):
+        ids = settings_utils._settings_xml_ids()
+        self.assertIn("skip_overlapping_segments", ids)
+        self.assertIn("remote_cache_stale_while_revalidate", ids)
+
+    def test_disabled_by_default_reads_live(self):
+        addon = settings_utils.get_addon()
+        self.assertIsNone(settings_utils.settings_snapshot(addon))
+        settings_utils.addon_get_bool(addon, "skip_overlapping_segments", True)
+        self.assertEqual(self.reads, ["skip_overlapping_segments"])
+
+    def test_shared_handle_reads_come_from_one_pass(self):
+        settings_utils.enable_settings_snapshot()
+        addon = settings_utils.get_addon()
+        self.assertFalse(settings_utils.addon_get_bool(addon, "skip_overlapping_segments", True))
+        first_pass = len(self.reads)
+        self.assertEqual(first_pass, len(settings_utils._settings_xml_ids()))
+        for _ in range(100):
+            settings_utils.addon_get_bool(addon, "tv_use_local_chapter_edl")
+            settings_utils.addon_get_int(addon, "skip_jump_offset_seconds", 0)
+        self.assertEqual(len(self.reads), first_pass)
+        snap = settings_utils.settings_snapshot(addon)
+        self.assertIs(settings_utils.settings_snapshot(), snap)
+        with self.assertRaises(FrozenInstanceError):
+            snap.generation = 99
+
+    def test_invalidate_rebuilds_with_new_values(self):
+        settings_utils.enable_settings_snapshot()
+        addon = settings_utils.get_addon()
+        self.assertFalse(settings_utils.addon_get_bool(addon, "skip_overlapping_segments", True))
+        self.values["skip_overlapping_segments"] = "true"
+        self.assertFalse(settings_utils.addon_get_bool(addon, "skip_overlapping_segments", True))
+        settings_utils.invalidate_settings_cache()
+        addon = settings_utils.get_addon()
+        self.assertTrue(settings_utils.addon_get_bool(addon, "skip_overlapping_segments", False))
+
+    def test_caller_owned_handle_reads_live(self):
+        settings_utils.enable_settings_snapshot()
+        other = MagicMock()
+        other.getSetting = lambda _key: "true"
+        self.assertIsNone(settings_utils.settings_snapshot(other))
+        self.assertTrue(settings_utils.addon_get_bool(other, "skip_overlapping_segments", False))
+
+    def test_signatures_are_computed_once_per_snapshot(self):
+        from service_segment_processed_cache import processed_settings_signature
+        from service_segment_sources import _source_settings_signature
+
+        settings_utils.enable_settings_snapshot()
+        addon = settings_utils.get_addon()
+        sig = _source_settings_signature(addon, "episode")
+        self.assertIs(_source_settings_signature(addon, "episode"), sig)
+        self.assertIn(("tv_use_local_chapter_edl", "true"), sig)
+        self.assertEqual(processed_settings_signature(addon, "episode", sig), (sig, False))
+        settings_utils.invalidate_settings_cache()
+        self.assertIsNot(_source_settings_signature(settings_utils.get_addon(), "episode"), sig)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""Buffered log sink: background writes, drop counting, flush and tail dumps."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+import settings_utils
+import skippy_profile_store
+from skippy_log_sink import LogSink
+
+
+class _BlockingWriter:
+    """Records lines; holds the writer thread until ``release`` is set."""
+
+    def __init__(self):
+        self.lines = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, line, _level):
+        self.release.wait(5)
+        self.lines.append(line)
+
+
+class LogSinkTests(unittest.TestCase):
+    def _sink(self, **kwargs):
+        writer = _BlockingWriter()
+        sink = LogSink(writer, **kwargs)
+        sink.start()
+        self.addCleanup(sink.stop)
+        return sink, writer
+
+    def test_lines_are_written_in_order_after_flush(self):
+        sink, writer = self._sink()
+        for i in range(50):
+            sink.submit("line %d" % i, 1)
+        self.assertTrue(sink.flush())
+        self.assertEqual(writer.lines, ["line %d" % i for i in range(50)])
+
+    def test_full_queue_drops_oldest_and_reports_count(self):
+        sink, writer = self._sink(capacity=3)
+        writer.release.clear()
+        sink.submit("first", 1)
+        # Wait for the writer to take "first" and block on it.
+        for _ in range(200):
+            with sink._cond:
+                if not sink._pending:
+                    break
+            threading.Event().wait(0.005)
+        for i in range(5):
+            sink.submit("queued %d" % i, 1)
+        writer.release.set()
+        self.assertTrue(sink.flush())
+        self.assertEqual(sink.dropped_total, 2)
+        self.assertEqual(writer.lines[0], "first")
+        self.assertIn("2 line(s) dropped", writer.lines[1])
+        self.assertEqual(writer.lines[2:], ["queued 2", "queued 3", "queued 4"])
+
+    def test_flush_times_out_when_the_writer_is_stuck(self):
+        sink, writer = self._sink()
+        writer.release.clear()
+        sink.submit("stuck", 1)
+        self.assertFalse(sink.flush(timeout=0.05))
+        writer.release.set()
+        self.assertTrue(sink.flush())
+
+    def test_stop_writes_what_is_queued(self):
+        writer = _BlockingWriter()
+        sink = LogSink(writer)
+        sink.start()
+        for i in range(10):
+            sink.submit("line %d" % i, 1)
+        sink.stop()
+        self.assertFalse(sink.running)
+        self.assertEqual(len(writer.lines), 10)
+
+    def test_lines_submitted_while_stopping_keep_their_order(self):
+        writer = _BlockingWriter()
+        sink = LogSink(writer)
+        sink.start()
+        writer.release.clear()
+        for i in range(3):
+            sink.submit("line %d" % i, 1)
+        stopper = threading.Thread(target=sink.stop)
+        stopper.start()
+        with sink._cond:
+            while not sink._closed:
+                sink._cond.wait(0.01)
+        self.assertTrue(sink.running)
+        self.assertTrue(sink.submit("late", 1))
+        writer.release.set()
+        stopper.join(5)
+        self.assertFalse(sink.running)
+        self.assertFalse(sink.submit("after", 1))
+        self.assertEqual(writer.lines, ["line 0", "line 1", "line 2", "late"])
+
+    def test_tail_keeps_the_last_lines(self):
+        sink, _writer = self._sink(tail_lines=4)
+        for i in range(10):
+            sink.submit("line %d" % i, 1)
+        sink.flush()
+        self.assertEqual(sink.tail(), ["line 6", "line 7", "line 8", "line 9"])
+        self.assertEqual(sink.tail(2), ["line 8", "line 9"])
+
+
+class LogSinkModuleTests(unittest.TestCase):
+    def setUp(self):
+        import skippy_log_sink
+
+        self.mod = skippy_log_sink
+        self._tmp = tempfile.TemporaryDirectory()
+        patcher = patch.object(skippy_profile_store, "profile_dir", return_value=self._tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+        self.addCleanup(self.mod.stop_log_sink)
+
+    def test_write_line_is_synchronous_without_a_sink(self):
+        with patch.object(self.mod.xbmc, "log") as xbmc_log:
+            self.mod.write_line("now", 1)
+        xbmc_log.assert_called_once_with("now", 1)
+        self.assertIsNone(self.mod.dump_log_tail())
+
+    def test_dump_writes_the_tail_to_the_profile(self):
+        with patch.object(self.mod.xbmc, "log"):
+            self.mod.start_log_sink()
+            for i in range(3):
+                self.mod.write_line("line %d" % i, 1)
+            saved = self.mod.dump_log_tail()
+        self.assertEqual(saved, 3)
+        with open(os.path.join(self._tmp.name, self.mod.TAIL_FILENAME), encoding="utf-8") as fh:
+            self.assertEqual(fh.read().splitlines(), ["line 0", "line 1", "line 2"])
+
+    def test_lines_logged_during_stop_are_not_written_ahead(self):
+        writer = _BlockingWriter()
+        with patch.object(self.mod.xbmc, "log", side_effect=writer):
+            self.mod.start_log_sink()
+            writer.release.clear()
+            self.mod.write_line("queued", 1)
+            stopper = threading.Thread(target=self.mod.stop_log_sink)
+            stopper.start()
+            threading.Event().wait(0.05)
+            self.mod.write_line("during stop", 1)
+            writer.release.set()
+            stopper.join(5)
+            self.mod.write_line("after stop", 1)
+        self.assertEqual(writer.lines, ["queued", "during stop", "after stop"])
+
+    def test_log_error_flushes_the_sink(self):
+        with patch.object(settings_utils, "get_addon", return_value=object()), patch.object(
+            settings_utils,
+            "skippy_log_effective_detail_level",
+            return_value=settings_utils.SKIPPY_LOG_ALL,
+        ), patch.object(settings_utils, "flush_log_sink") as flush:
+            settings_utils.log_error("boom")
+            settings_utils.log("fine")
+        flush.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""ETag / Last-Modified revalidation in fetch_remote_json."""
+
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+import remote_http
+import remote_http_pool
+import remote_response_cache
+import skippy_profile_store
+
+PAYLOAD = {"intro": [{"start_ms": 0, "end_ms": 60000}]}
+LAST_MODIFIED = "Wed, 01 Oct 2025 10:00:00 GMT"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        validators = {}
+        if self.path.startswith("/etag"):
+            validators["ETag"] = '"v1"'
+            fresh = self.headers.get("If-None-Match") == '"v1"'
+        elif self.path.startswith("/lastmod"):
+            validators["Last-Modified"] = LAST_MODIFIED
+            fresh = self.headers.get("If-Modified-Since") == LAST_MODIFIED
+        else:
+            fresh = False
+        if fresh:
+            self.send_response(304)
+            for k, v in validators.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(PAYLOAD).encode("utf-8")
+        self.send_response(200)
+        for k, v in validators.items():
+            self.send_header(k, v)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.bodies += 1
+
+    def log_message(self, *_args):
+        pass
+
+
+class ConditionalRequestTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        patcher = patch.object(
+            skippy_profile_store, "profile_dir", return_value=self._tmp.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        remote_response_cache.clear_cache()
+        self.addCleanup(remote_response_cache.clear_cache)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.requests = []
+        self.server.bodies = 0
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(remote_http_pool.close_idle_connections)
+        self.base = "http://127.0.0.1:%d" % self.server.server_address[1]
+
+    def _fetch(self, path):
+        return remote_http.fetch_remote_json(self.base + path, "TheIntroDB")
+
+    def test_etag_revalidation_reuses_stored_body(self):
+        self.assertEqual(self._fetch("/etag/media?s=1"), PAYLOAD)
+        remote_response_cache.clear_cache()  # reload from disk, as after a restart
+        self.assertTrue(remote_response_cache.conditional_headers(self.base + "/etag/media?s=1"))
+        with patch.object(remote_http.json, "loads", side_effect=AssertionError("parsed")):
+            self.assertEqual(self._fetch("/etag/media?s=1"), PAYLOAD)
+        self.assertEqual(self.server.bodies, 1)
+        self.assertEqual(self.server.requests[1].get("If-None-Match"), '"v1"')
+        self.assertEqual(
+            remote_http.fetch_remote_json_outcome(self.base + "/etag/media?s=1", "TheIntroDB"),
+            (PAYLOAD, remote_http.FETCH_OK),
+        )
+
+    def test_last_modified_revalidation(self):
+        self._fetch("/lastmod/media")
+        self.assertEqual(self._fetch("/lastmod/media"), PAYLOAD)
+        self.assertEqual(self.server.bodies, 1)
+        self.assertEqual(self.server.requests[1].get("If-Modified-Since"), LAST_MODIFIED)
+
+    def test_response_without_validators_is_not_stored(self):
+        self._fetch("/plain/media")
+        self._fetch("/plain/media")
+        self.assertEqual(self.server.bodies, 2)
+        self.assertNotIn("If-None-Match", self.server.requests[1])
+        self.assertEqual(remote_response_cache.conditional_headers(self.base + "/plain/media"), {})
+
+    def test_store_is_written_behind(self):
+        with patch.object(remote_response_cache, "write_json", return_value=True) as write:
+            self._fetch("/etag/media?s=1")
+            self._fetch("/lastmod/media")
+            self.assertEqual(write.call_count, 0)
+            self.assertTrue(remote_response_cache.flush_response_cache())
+            self.assertEqual(write.call_count, 1)
+
+    def test_not_modified_does_not_rewrite_the_store(self):
+        self._fetch("/etag/media?s=1")
+        remote_response_cache.flush_response_cache()
+        with patch.object(remote_response_cache, "write_json", return_value=True) as write:
+            self.assertEqual(self._fetch("/etag/media?s=1"), PAYLOAD)
+            self.assertFalse(remote_response_cache.flush_response_cache())
+        write.assert_not_called()
+
+    def test_api_key_not_written_to_profile(self):
+        self._fetch("/etag/media?api_key=SECRET123")
+        remote_response_cache.flush_response_cache()
+        with open(remote_response_cache._cache_path(), encoding="utf-8") as handle:
+            self.assertNotIn("SECRET123", handle.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Per-show library episode index: bisect queries, persistence and library notifications."""
+
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+import remote_episode_index
+import remote_library
+import skippy_profile_store
+from remote_episode_index import ShowEpisodeIndex
+
+
+def _row(season, episode, eid=None):
+    return {
+        "episodeid": eid or season * 100 + episode,
+        "season": season,
+        "episode": episode,
+        "file": "/tv/S%02dE%02d.mkv" % (season, episode),
+    }
+
+
+def _show_rows():
+    rows = [_row(0, 1), _row(0, 2)]
+    rows += [_row(1, e) for e in (1, 2, 3, 5)]
+    rows += [_row(2, e) for e in (1, 2)]
+    return rows
+
+
+class ShowEpisodeIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = ShowEpisodeIndex(7, list(reversed(_show_rows())))
+
+    def _key(self, row):
+        return (row["season"], row["episode"]) if row else None
+
+    def test_successor_steps_over_gaps_and_into_the_next_season(self):
+        self.assertEqual(self._key(self.index.successor(1, 1)), (1, 2))
+        self.assertEqual(self._key(self.index.successor(1, 3)), (1, 5))
+        self.assertEqual(self._key(self.index.successor(1, 5)), (2, 1))
+        self.assertIsNone(self.index.successor(2, 2))
+
+    def test_predecessor_stays_out_of_specials(self):
+        self.assertEqual(self._key(self.index.predecessor(2, 1)), (1, 5))
+        self.assertIsNone(self.index.predecessor(1, 1))
+        self.assertEqual(self._key(self.index.predecessor(0, 2)), (0, 1))
+
+    def test_next_n(self):
+        self.assertEqual(
+            [self._key(r) for r in self.index.next_n(1, 3, 3)], [(1, 5), (2, 1), (2, 2)]
+        )
+        self.assertEqual(self._key(self.index.next_n(0, 2, 1)[0]), (1, 1))
+        self.assertEqual(self.index.next_n(1, 1, 0), [])
+
+
+class _FakeKodi:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, payload):
+        data = json.loads(payload)
+        self.calls.append(data)
+        params = data.get("params") or {}
+        if data["method"] == "VideoLibrary.GetEpisodes":
+            result = {"episodes": self.rows}
+        elif data["method"] == "VideoLibrary.GetEpisodeDetails":
+            eid = params["episodeid"]
+            row = next((r for r in self.rows if r["episodeid"] == eid), None)
+            if row is None:
+                return json.dumps({"id": 1, "error": {"code": -32602, "message": "x"}})
+            result = {"episodedetails": dict(row, tvshowid=7, uniqueid={"tmdb": "1"})}
+        else:
+            result = {}
+        return json.dumps({"jsonrpc": "2.0", "id": 1, "result": result})
+
+    def dumps(self):
+        """Whole-show GetEpisodes calls (not the path-filter fallback)."""
+        return sum(
+            1
+            for c in self.calls
+            if c["method"] == "VideoLibrary.GetEpisodes" and "tvshowid" in c["params"]
+        )
+
+
+class EpisodeIndexCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        for target, name, kwargs in (
+            (skippy_profile_store, "profile_dir", {"return_value": self._tmp.name}),
+            (remote_library, "_episode_fields", {"new": ["season", "episode"]}),
+        ):
+            patcher = patch.object(target, name, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        remote_episode_index.clear_cache()
+        remote_library.clear_library_rows()
+        self.addCleanup(remote_episode_index.clear_cache)
+        self.addCleanup(remote_library.clear_library_rows)
+        self.kodi = _FakeKodi(_show_rows())
+        patcher = patch.object(remote_library.xbmc, "executeJSONRPC", self.kodi, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _successor(self, season, episode):
+        item = {"type": "episode", "id": 1, "tvshowid": 7, "season": season, "episode": episode}
+        return remote_library.resolve_tv_library_successor_episode_item(item)
+
+    def test_successors_share_one_episode_dump(self):
+        self.assertEqual(self._successor(1, 5)["id"], 201)
+        self.assertEqual(self._successor(2, 1)["id"], 202)
+        self.assertIsNone(self._successor(2, 2))
+        self.assertEqual(self.kodi.dumps(), 1)
+
+    def test_index_survives_a_restart(self):
+        remote_episode_index.episode_index(7)
+        remote_episode_index.clear_cache()
+        index = remote_episode_index.episode_index(7)
+        self.assertEqual(len(index), len(_show_rows()))
+        self.assertEqual(self.kodi.dumps(), 1)
+
+    def test_watched_state_updates_keep_the_index(self):
+        remote_episode_index.episode_index(7)
+        changed = remote_episode_index.note_library_update(
+            "VideoLibrary.OnUpdate", '{"item": {"id": 101, "type": "episode"}, "playcount": 1}'
+        )
+        self.assertFalse(changed)
+        remote_episode_index.episode_index(7)
+        self.assertEqual(self.kodi.dumps(), 1)
+
+    def test_added_or_removed_episodes_rebuild_the_index(self):
+        for method, data in (
+            ("VideoLibrary.OnUpdate", {"item": {"id": 999, "type": "episode"}, "added": True}),
+            ("VideoLibrary.OnRemove", {"id": 101, "type": "episode"}),
+            ("VideoLibrary.OnUpdate", {"item": {"id": 7, "type": "tvshow"}}),
+        ):
+            remote_episode_index.episode_index(7)
+            self.assertTrue(remote_episode_index.note_library_update(method, json.dumps(data)))
+        remote_episode_index.episode_index(7)
+        self.assertEqual(self.kodi.dumps(), 4)
+
+    def test_vanished_row_drops_the_index(self):
+        remote_episode_index.episode_index(7)
+        self.kodi.rows = [r for r in self.kodi.rows if r["episodeid"] != 201]
+        self.assertIsNone(self._successor(1, 5))
+        self.assertEqual(self._successor(1, 5)["id"], 202)
+        self.assertEqual(self.kodi.dumps(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Keep-alive connection reuse for remote API requests."""
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.error import HTTPError, URLError
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+import remote_http_pool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith("/missing"):
+            self._reply(404, {"error": "not found"})
+        elif self.path.startswith("/moved"):
+            self.send_response(302)
+            self.send_header("Location", "/media?moved=1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._reply(200, {"path": self.path})
+            if self.path.startswith("/drop"):
+                # Close without a Connection: close header, like an idle-timeout on the server.
+                self.close_connection = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._reply(201, json.loads(self.rfile.read(length) or b"null"))
+
+    def log_message(self, *_args):
+        pass
+
+
+class RemoteHttpPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.connections = 0
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(remote_http_pool.close_idle_connections)
+        self.base = "http://127.0.0.1:%d" % self.server.server_address[1]
+
+    def _get(self, path):
+        resp = remote_http_pool.http_open(self.base + path, timeout=5)
+        return resp.status, json.loads(resp.read().decode("utf-8"))
+
+    def test_sequential_requests_share_one_connection(self):
+        self.assertEqual(self._get("/media?a=1"), (200, {"path": "/media?a=1"}))
+        self.assertEqual(self._get("/media?a=2"), (200, {"path": "/media?a=2"}))
+        resp = remote_http_pool.http_open(
+            self.base + "/submit", method="POST", data=b'{"x": 1}', timeout=5,
+            headers={"Content-Type": "application/json"},
+        )
+        self.assertEqual(resp.status, 201)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(remote_http_pool.idle_connection_count(), 1)
+
+    def test_http_error_keeps_body_and_connection(self):
+        with self.assertRaises(HTTPError) as ctx:
+            remote_http_pool.http_open(self.base + "/missing", timeout=5)
+        self.assertEqual(ctx.exception.code, 404)
+        self.assertIn(b"not found", ctx.exception.read())
+        self._get("/media")
+        self.assertEqual(self.server.connections, 1)
+
+    def test_redirect_is_followed(self):
+        self.assertEqual(self._get("/moved"), (200, {"path": "/media?moved=1"}))
+
+    def test_idle_connection_evicted_after_timeout(self):
+        self._get("/media")
+        with patch.object(remote_http_pool, "IDLE_TIMEOUT_S", -1.0):
+            self._get("/media")
+        self.assertEqual(self.server.connections, 2)
+
+    def test_server_closed_socket_is_retried_on_fresh_connection(self):
+        self._get("/drop")
+        self.assertEqual(self._get("/media?again=1"), (200, {"path": "/media?again=1"}))
+        self.assertEqual(self.server.connections, 2)
+
+    def test_post_on_server_closed_socket_is_not_resent(self):
+        self._get("/drop")
+        with self.assertRaises(URLError):
+            remote_http_pool.http_open(
+                self.base + "/submit", method="POST", data=b'{"x": 1}', timeout=5,
+                headers={"Content-Type": "application/json"},
+            )
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(remote_http_pool.idle_connection_count(), 0)
+
+    def test_connection_refused_raises_url_error(self):
+        self.server.shutdown()
+        self.server.server_close()
+        remote_http_pool.close_idle_connections()
+        with self.assertRaises(URLError):
+            remote_http_pool.http_open(self.base + "/media", timeout=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Batched library JSON-RPC: batch helper, per-playback row cache, field capability memo."""
+
+import json
+import unittest
+from unittest.mock import patch
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+import remote_http
+import remote_library
+
+
+class _FakeKodi:
+    """executeJSONRPC stand-in answering single calls and batch arrays; counts round-trips."""
+
+    def __init__(self, *, batches=True, reject_full_fields=False):
+        self.batches = batches
+        self.reject_full_fields = reject_full_fields
+        self.round_trips = []
+
+    def _answer(self, call):
+        method = call["method"]
+        params = call.get("params") or {}
+        reply = {"jsonrpc": "2.0", "id": call.get("id")}
+        if method == "VideoLibrary.GetEpisodeDetails":
+            props = params.get("properties") or []
+            if self.reject_full_fields and "showtitle" in props:
+                reply["error"] = {"code": -32602, "message": "Invalid params."}
+                return reply
+            reply["result"] = {
+                "episodedetails": {
+                    "episodeid": params["episodeid"],
+                    "season": 1,
+                    "episode": 2,
+                    "tvshowid": 7,
+                    "uniqueid": {"imdb": "tt0000002", "tvdb": "555"},
+                }
+            }
+        elif method == "VideoLibrary.GetTVShowDetails":
+            reply["result"] = {
+                "tvshowdetails": {
+                    "tvshowid": params["tvshowid"],
+                    "imdbnumber": "tt0000001",
+                    "uniqueid": {"tmdb": "1399", "tvdb": "121361", "imdb": "tt0000001"},
+                }
+            }
+        else:
+            reply["result"] = {}
+        return reply
+
+    def __call__(self, payload):
+        data = json.loads(payload)
+        self.round_trips.append(data)
+        if isinstance(data, list):
+            if not self.batches:
+                return json.dumps(
+                    {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "x"}}
+                )
+            return json.dumps([self._answer(call) for call in reversed(data)])
+        return json.dumps(self._answer(data))
+
+
+class _RemoteLibraryCase(unittest.TestCase):
+    def setUp(self):
+        remote_library.clear_library_rows()
+        self.addCleanup(remote_library.clear_library_rows)
+        for target, name, value in (
+            (remote_http, "_jsonrpc_batch_supported", None),
+            (remote_library, "_episode_fields", remote_http._EPISODE_JSONRPC_FIELDS),
+        ):
+            patcher = patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _kodi(self, **kwargs):
+        kodi = _FakeKodi(**kwargs)
+        patcher = patch.object(remote_http.xbmc, "executeJSONRPC", kodi, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return kodi
+
+
+class JsonRpcBatchTests(_RemoteLibraryCase):
+    def test_responses_come_back_in_call_order(self):
+        kodi = self._kodi()
+        out = remote_http.jsonrpc_batch(
+            [
+                ("VideoLibrary.GetEpisodeDetails", {"episodeid": 3, "properties": []}),
+                ("VideoLibrary.GetTVShowDetails", {"tvshowid": 9, "properties": []}),
+            ]
+        )
+        self.assertEqual(len(kodi.round_trips), 1)
+        self.assertEqual(out[0]["result"]["episodedetails"]["episodeid"], 3)
+        self.assertEqual(out[1]["result"]["tvshowdetails"]["tvshowid"], 9)
+
+    def test_unsupported_batch_falls_back_and_is_remembered(self):
+        kodi = self._kodi(batches=False)
+        calls = [
+            ("VideoLibrary.GetTVShowDetails", {"tvshowid": 1, "properties": []}),
+            ("VideoLibrary.GetTVShowDetails", {"tvshowid": 2, "properties": []}),
+        ]
+        out = remote_http.jsonrpc_batch(calls)
+        self.assertEqual([r["result"]["tvshowdetails"]["tvshowid"] for r in out], [1, 2])
+        self.assertEqual(len(kodi.round_trips), 3)
+        remote_http.jsonrpc_batch(calls)
+        self.assertEqual(len(kodi.round_trips), 5)
+        self.assertFalse(any(isinstance(d, list) for d in kodi.round_trips[3:]))
+
+
+class LibraryMetadataAssemblerTests(_RemoteLibraryCase):
+    def _build(self, item):
+        with patch.object(remote_library, "_get_tmdb_api_key", return_value=None), patch.object(
+            remote_library, "get_addon", return_value=None
+        ), patch.object(remote_library.xbmc, "getInfoLabel", return_value="", create=True):
+            return remote_library.build_tv_episode_context(item)
+
+    def test_context_is_built_from_one_round_trip(self):
+        kodi = self._kodi()
+        ctx = self._build(
+            {"type": "episode", "id": 42, "tvshowid": 7, "season": 1, "episode": 2}
+        )
+        self.assertEqual(len(kodi.round_trips), 1)
+        self.assertEqual(ctx["tmdb_id"], 1399)
+        self.assertEqual(ctx["tvdb_id"], 121361)
+        self.assertEqual(ctx["imdb_id"], "tt0000002")
+        self.assertEqual(ctx["show_imdb_id"], "tt0000001")
+
+    def test_show_id_from_episode_row_needs_a_second_round_trip(self):
+        kodi = self._kodi()
+        ctx = self._build({"type": "episode", "id": 42, "season": 1, "episode": 2})
+        self.assertEqual(len(kodi.round_trips), 2)
+        self.assertEqual(ctx["tmdb_id"], 1399)
+
+    def test_rejected_field_list_is_remembered_for_the_session(self):
+        kodi = self._kodi(reject_full_fields=True)
+        row, err = remote_library._fetch_episode_details(42)
+        self.assertIsNone(err)
+        self.assertEqual(row["episodeid"], 42)
+        self.assertEqual(len(kodi.round_trips), 2)
+        row, _err = remote_library._fetch_episode_details(43)
+        self.assertEqual(row["episodeid"], 43)
+        self.assertEqual(len(kodi.round_trips), 3)
+        self.assertNotIn("showtitle", kodi.round_trips[-1]["params"]["properties"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Parallel TheIntroDB / IntroDB.app lookups under a shared deadline."""
+
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+import remote_lookup
+import remote_segment_disk_cache
+from remote_http import FETCH_OK
+import skippy_profile_store
+from segment_item import SegmentItem
+
+EPISODE = {"type": "episode", "file": "/tv/show/s01e02.mkv"}
+CONTEXT = {
+    "type": "episode",
+    "tmdb_id": 1399,
+    "imdb_id": None,
+    "show_imdb_id": "tt0944947",
+    "season": 1,
+    "episode": 2,
+}
+
+
+def _seg(start, end, source):
+    return SegmentItem(start, end, "intro", source=source)
+
+
+class ConcurrentProviderLookupTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        patcher = patch.object(
+            skippy_profile_store, "profile_dir", return_value=self._tmp.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        remote_segment_disk_cache.clear_cache()
+        self.addCleanup(remote_segment_disk_cache.clear_cache)
+        for target, value in (
+            ("build_tv_episode_context", lambda _item: dict(CONTEXT)),
+            ("_online_merge_introdb_primary", lambda _kind: False),
+            ("record_online_segments_downloaded", lambda _n: None),
+        ):
+            patcher = patch.object(remote_lookup, target, side_effect=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_providers_run_in_parallel(self):
+        barrier = threading.Barrier(2, timeout=2.0)
+
+        def _the(_ctx, _tt):
+            barrier.wait()
+            return [_seg(10.0, 60.0, "theintrodb")], FETCH_OK
+
+        def _intro(_ctx, _tt):
+            barrier.wait()
+            return [_seg(300.0, 330.0, "introdb")], FETCH_OK
+
+        cache = {}
+        with patch.object(remote_lookup, "_lookup_theintrodb", side_effect=_the), patch.object(
+            remote_lookup, "_lookup_introdb", side_effect=_intro
+        ):
+            segs = remote_lookup.fetch_remote_tv_segments_core(EPISODE, 1800.0, cache)
+        self.assertEqual([s.source for s in segs], ["theintrodb", "introdb"])
+        self.assertEqual(len(cache), 1)
+
+    def test_slow_provider_yields_partial_uncached_result(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def _slow(_ctx, _tt):
+            release.wait(5.0)
+            return [_seg(300.0, 330.0, "introdb")], FETCH_OK
+
+        cache = {}
+        started = time.monotonic()
+        with patch.object(remote_lookup, "REMOTE_PROVIDER_DEADLINE_S", 0.2), patch.object(
+            remote_lookup,
+            "_lookup_theintrodb",
+            return_value=([_seg(10.0, 60.0, "theintrodb")], FETCH_OK),
+        ), patch.object(remote_lookup, "_lookup_introdb", side_effect=_slow):
+            segs = remote_lookup.fetch_remote_tv_segments_core(EPISODE, 1800.0, cache)
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual([s.source for s in segs], ["theintrodb"])
+        self.assertEqual(cache, {})
+        key = remote_lookup.build_tv_cache_key(CONTEXT)
+        self.assertIsNone(remote_segment_disk_cache.load_remote_segments(key))
+
+        release.set()
+        with patch.object(
+            remote_lookup,
+            "_lookup_theintrodb",
+            return_value=([_seg(10.0, 60.0, "theintrodb")], FETCH_OK),
+        ), patch.object(
+            remote_lookup,
+            "_lookup_introdb",
+            return_value=([_seg(300.0, 330.0, "introdb")], FETCH_OK),
+        ) as intro_fetch:
+            segs = remote_lookup.fetch_remote_tv_segments_core(EPISODE, 1800.0, cache)
+        intro_fetch.assert_called_once()
+        self.assertEqual([s.source for s in segs], ["theintrodb", "introdb"])
+
+    def test_provider_exception_counts_as_empty(self):
+        with patch.object(
+            remote_lookup, "_lookup_theintrodb", side_effect=RuntimeError("boom")
+        ), patch.object(
+            remote_lookup,
+            "_lookup_introdb",
+            return_value=([_seg(300.0, 330.0, "introdb")], FETCH_OK),
+        ):
+            the_segs, intro_segs, status = remote_lookup._fetch_provider_segments(
+                CONTEXT, 1800.0
+            )
+        self.assertEqual(the_segs, [])
+        self.assertEqual(len(intro_segs), 1)
+        self.assertEqual(status, remote_lookup.LOOKUP_FAILED)
+
+
+if __name__ == "__main__":
+    unittest.main()
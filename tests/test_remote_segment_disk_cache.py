@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""Persistent remote lookup cache: TTL per answer kind, stale-while-revalidate, eviction."""
+
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+import remote_lookup
+import remote_segment_disk_cache as disk_cache
+from remote_http import FETCH_OK, FETCH_SKIPPED
+import skippy_profile_store
+from segment_item import SegmentItem
+
+KEY = ("episode", 1399, None, "tt0944947", 1, 2)
+EPISODE = {"type": "episode", "file": "/tv/show/s01e02.mkv"}
+CONTEXT = {
+    "type": "episode",
+    "tmdb_id": 1399,
+    "imdb_id": None,
+    "show_imdb_id": "tt0944947",
+    "season": 1,
+    "episode": 2,
+}
+
+
+def _segs():
+    return [SegmentItem(10.0, 60.0, "intro", source="theintrodb")]
+
+
+class _ProfileTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        patcher = patch.object(
+            skippy_profile_store, "profile_dir", return_value=self._tmp.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        disk_cache.clear_cache()
+        self.addCleanup(disk_cache.clear_cache)
+
+
+class RemoteSegmentDiskCacheTests(_ProfileTestCase):
+    def test_hit_round_trip_survives_process_restart(self):
+        self.assertTrue(disk_cache.store_remote_segments(KEY, _segs(), disk_cache.KIND_HIT))
+        disk_cache.clear_cache()
+        segs, kind, fresh = disk_cache.load_remote_segments(KEY)
+        self.assertEqual(kind, disk_cache.KIND_HIT)
+        self.assertTrue(fresh)
+        self.assertEqual(segs[0].source, "theintrodb")
+        self.assertEqual(segs[0].end_seconds, 60.0)
+
+    def test_empty_answer_is_cached(self):
+        disk_cache.store_remote_segments(KEY, [], disk_cache.KIND_EMPTY)
+        self.assertEqual(
+            disk_cache.load_remote_segments(KEY), ([], disk_cache.KIND_EMPTY, True)
+        )
+
+    def test_expired_hit_is_stale_only_when_allowed(self):
+        with patch.object(disk_cache.time, "time", return_value=1000.0):
+            disk_cache.store_remote_segments(KEY, _segs(), disk_cache.KIND_HIT)
+        later = 1000.0 + disk_cache.HIT_TTL_S + 1
+        with patch.object(disk_cache.time, "time", return_value=later):
+            _segs_out, _kind, fresh = disk_cache.load_remote_segments(KEY, allow_stale=True)
+            self.assertFalse(fresh)
+            self.assertIsNone(disk_cache.load_remote_segments(KEY, allow_stale=False))
+        too_old = later + disk_cache.STALE_MAX_AGE_S
+        with patch.object(disk_cache.time, "time", return_value=too_old):
+            self.assertIsNone(disk_cache.load_remote_segments(KEY, allow_stale=True))
+
+    def test_expired_error_is_a_miss(self):
+        with patch.object(disk_cache.time, "time", return_value=1000.0):
+            disk_cache.store_remote_segments(KEY, [], disk_cache.KIND_ERROR)
+        with patch.object(
+            disk_cache.time, "time", return_value=1000.0 + disk_cache.ERROR_TTL_S + 1
+        ):
+            self.assertIsNone(disk_cache.load_remote_segments(KEY, allow_stale=True))
+
+    def test_oldest_entries_evicted(self):
+        with patch.object(disk_cache, "MAX_ENTRIES", 2):
+            for idx in range(3):
+                with patch.object(disk_cache.time, "time", return_value=1000.0 + idx):
+                    disk_cache.store_remote_segments(
+                        ("movie", idx, None), _segs(), disk_cache.KIND_HIT
+                    )
+        with patch.object(disk_cache.time, "time", return_value=1010.0):
+            self.assertIsNone(disk_cache.load_remote_segments(("movie", 0, None)))
+            self.assertIsNotNone(disk_cache.load_remote_segments(("movie", 2, None)))
+
+
+class RemoteLookupDiskCacheTests(_ProfileTestCase):
+    def setUp(self):
+        super().setUp()
+        for target, value in (
+            ("build_tv_episode_context", lambda _item: dict(CONTEXT)),
+            ("_online_merge_introdb_primary", lambda _kind: False),
+            ("record_online_segments_downloaded", lambda _n: None),
+        ):
+            patcher = patch.object(remote_lookup, target, side_effect=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _lookup(self, the_result, intro_result=((), FETCH_OK), cache=None):
+        with patch.object(
+            remote_lookup, "_lookup_theintrodb", side_effect=the_result
+        ) as the_fetch, patch.object(
+            remote_lookup, "_lookup_introdb", return_value=intro_result
+        ):
+            segs = remote_lookup.fetch_remote_tv_segments_core(
+                EPISODE, 1800.0, {} if cache is None else cache
+            )
+        return segs, the_fetch
+
+    def test_restart_reuses_cached_lookup_without_api_calls(self):
+        self._lookup(lambda _c, _t: (_segs(), FETCH_OK))
+        disk_cache.clear_cache()
+        segs, the_fetch = self._lookup(lambda _c, _t: self.fail("API called"))
+        self.assertEqual(len(segs), 1)
+        the_fetch.assert_not_called()
+
+    def test_no_data_answer_is_remembered(self):
+        self._lookup(lambda _c, _t: ([], FETCH_OK))
+        segs, the_fetch = self._lookup(lambda _c, _t: self.fail("API called"))
+        self.assertEqual(segs, [])
+        the_fetch.assert_not_called()
+
+    def test_provider_failure_stored_as_segmentless_error(self):
+        def _boom(_c, _t):
+            raise RuntimeError("down")
+
+        self._lookup(_boom, intro_result=(_segs(), FETCH_OK))
+        self.assertEqual(disk_cache.load_remote_segments(KEY), ([], disk_cache.KIND_ERROR, True))
+
+    def test_error_entry_is_not_copied_into_session_cache(self):
+        disk_cache.store_remote_segments(KEY, _segs(), disk_cache.KIND_ERROR)
+        cache = {}
+        segs, the_fetch = self._lookup(lambda _c, _t: self.fail("API called"), cache=cache)
+        self.assertEqual(segs, [])
+        self.assertEqual(cache, {})
+        the_fetch.assert_not_called()
+
+    def test_skipped_provider_with_no_data_is_not_remembered_as_empty(self):
+        self._lookup(lambda _c, _t: ([], FETCH_SKIPPED))
+        _segs_out, kind, _fresh = disk_cache.load_remote_segments(KEY)
+        self.assertEqual(kind, disk_cache.KIND_ERROR)
+
+    def test_stale_entry_served_and_revalidated_in_background(self):
+        stored_at = time.time() - disk_cache.HIT_TTL_S - 60
+        with patch.object(disk_cache.time, "time", return_value=stored_at):
+            disk_cache.store_remote_segments(KEY, _segs(), disk_cache.KIND_HIT)
+        refreshed = [SegmentItem(12.0, 62.0, "intro", source="theintrodb")]
+
+        with patch.object(
+            disk_cache, "stale_while_revalidate_enabled", return_value=True
+        ), patch.object(
+            remote_lookup, "_lookup_theintrodb", return_value=(refreshed, FETCH_OK)
+        ), patch.object(remote_lookup, "_lookup_introdb", return_value=([], FETCH_OK)):
+            segs = remote_lookup.fetch_remote_tv_segments_core(EPISODE, 1800.0, {})
+            self.assertEqual(segs[0].start_seconds, 10.0)
+            deadline = time.monotonic() + 2.0
+            while remote_lookup._revalidating and time.monotonic() < deadline:
+                time.sleep(0.01)
+        new_segs, _kind, fresh = disk_cache.load_remote_segments(KEY)
+        self.assertTrue(fresh)
+        self.assertEqual(new_segs[0].start_seconds, 12.0)
+
+if __name__ == "__main__":
+    unittest.main()
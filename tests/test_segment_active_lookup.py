@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Indexed active-segment lookup matches the linear scans it replaced."""
+
+import random
+import unittest
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+from segment_item import (
+    SegmentItem,
+    build_segment_index,
+    segments_active_for_playback,
+    segments_near_time,
+    should_show_skip_dialog,
+)
+from service_main_loop import _near_skip_window
+
+
+def _linear_active(segments, t, tol=0.25):
+    strict = [s for s in segments if s.start_seconds <= t <= s.end_seconds]
+    if strict:
+        return strict
+    loose = [s for s in segments if (s.start_seconds - tol) <= t <= (s.end_seconds + tol)]
+    if not loose:
+        return []
+
+    def dist_outside(s):
+        if t < s.start_seconds:
+            return s.start_seconds - t
+        return t - s.end_seconds
+
+    loose.sort(key=lambda s: (dist_outside(s), -s.start_seconds))
+    return [loose[0]]
+
+
+def _random_segments(rng, count):
+    segs = []
+    for idx in range(count):
+        start = float(rng.randrange(0, 3000)) + rng.choice((0.0, 0.1, 0.25, 0.3))
+        length = float(rng.choice((0, 5, 30, 90, 400)))
+        segs.append(SegmentItem(start, start + length, "ad %d" % idx, source="edl"))
+    rng.shuffle(segs)
+    return segs
+
+
+class ActiveSegmentLookupTests(unittest.TestCase):
+    def test_matches_linear_scan_on_unsorted_lists(self):
+        rng = random.Random(11)
+        for _ in range(15):
+            segs = _random_segments(rng, rng.randrange(1, 60))
+            index = build_segment_index(segs)
+            for _ in range(200):
+                t = rng.randrange(-20, 3600) + rng.choice((0.0, 0.1, 0.2, 0.25, 0.75))
+                expected = _linear_active(segs, t)
+                self.assertEqual(segments_active_for_playback(segs, t), expected)
+                self.assertEqual(segments_active_for_playback(segs, t, index=index), expected)
+                self.assertEqual(
+                    segments_near_time(segs, t, 5.0, index),
+                    [s for s in segs if (s.start_seconds - 5.0) <= t <= (s.end_seconds + 5.0)],
+                )
+
+    def test_index_answers_for_a_clone_of_its_list(self):
+        a = SegmentItem(100.0, 110.0, "a")
+        b = SegmentItem(0.0, 10.0, "b")
+        index = build_segment_index([a, b])
+        clone = [a.with_jump(), b.with_jump()]
+        self.assertIs(segments_active_for_playback(clone, 105.0, index=index)[0], clone[0])
+        self.assertEqual(segments_active_for_playback([b], 105.0, index=index), [])
+        self.assertEqual(segments_active_for_playback([], 105.0, index=index), [])
+
+    def test_skip_dialog_debounces_per_segment(self):
+        a = SegmentItem(0.0, 10.0, "a")
+        b = SegmentItem(5.0, 20.0, "b")
+        shown = {}
+        self.assertIs(should_show_skip_dialog(6.0, [a, b], shown), a)
+        self.assertIs(should_show_skip_dialog(7.0, [a, b], shown), b)
+        self.assertIsNone(should_show_skip_dialog(8.0, [a, b], shown))
+
+    def test_near_skip_window_uses_lookahead_and_boundaries(self):
+        segs = [SegmentItem(100.0, 200.0, "intro")]
+        self.assertTrue(_near_skip_window(segs, 95.0, (), lookahead=10.0))
+        self.assertFalse(_near_skip_window(segs, 80.0, (), lookahead=10.0))
+        self.assertTrue(_near_skip_window(segs, 80.0, (85.0,), lookahead=10.0))
+        self.assertTrue(_near_skip_window(segs, "bad", ()))
+
+
+if __name__ == "__main__":
+    unittest.main()
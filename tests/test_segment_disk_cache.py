@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Persistent parsed-sidecar cache keyed by sidecar and settings signatures."""
+
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+import service_segment_disk_cache as disk_cache
+import skippy_profile_store
+from segment_item import SegmentItem
+
+SIDECAR_SIG = (("/media/show.edl", 1700000000, 42),)
+SETTINGS_SIG = (("edl_action_mapping", "3:commercial"),)
+
+
+class SegmentDiskCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        patcher = patch.object(
+            skippy_profile_store, "profile_dir", return_value=self._tmp.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+        disk_cache.clear_cache()
+        self.addCleanup(disk_cache.clear_cache)
+
+    def _store(self, path="/media/show.mkv", sig=SIDECAR_SIG):
+        segs = [SegmentItem(10.0, 70.0, "intro", source="edl", action_type="skip")]
+        return disk_cache.store_sidecar_segments(path, sig, SETTINGS_SIG, segs)
+
+    def test_round_trip_survives_process_restart(self):
+        self.assertTrue(self._store())
+        disk_cache.clear_cache()
+        segs = disk_cache.load_sidecar_segments(
+            "/media/show.mkv", SIDECAR_SIG, SETTINGS_SIG
+        )
+        self.assertEqual(len(segs), 1)
+        self.assertEqual(segs[0].start_seconds, 10.0)
+        self.assertEqual(segs[0].segment_type_label, "intro")
+        self.assertEqual(segs[0].action_type, "skip")
+
+    def test_changed_mtime_is_a_miss(self):
+        self._store()
+        changed = (("/media/show.edl", 1700000001, 42),)
+        self.assertIsNone(
+            disk_cache.load_sidecar_segments("/media/show.mkv", changed, SETTINGS_SIG)
+        )
+
+    def test_changed_settings_is_a_miss(self):
+        self._store()
+        self.assertIsNone(
+            disk_cache.load_sidecar_segments("/media/show.mkv", SIDECAR_SIG, ())
+        )
+
+    def test_unstatable_signature_is_not_cached(self):
+        self.assertFalse(self._store(sig=(("/media/show.edl", None, None),)))
+        self.assertFalse(self._store(sig=()))
+
+    def test_oldest_entries_evicted(self):
+        with patch.object(disk_cache, "MAX_ENTRIES", 2):
+            for idx in range(3):
+                with patch.object(disk_cache.time, "time", return_value=float(idx)):
+                    self._store(path="/media/e%d.mkv" % idx)
+        self.assertIsNone(
+            disk_cache.load_sidecar_segments("/media/e0.mkv", SIDECAR_SIG, SETTINGS_SIG)
+        )
+        self.assertIsNotNone(
+            disk_cache.load_sidecar_segments("/media/e2.mkv", SIDECAR_SIG, SETTINGS_SIG)
+        )
+
+    def test_local_parse_skips_sidecar_read_on_hit(self):
+        import service_segment_sources
+
+        self._store()
+        with patch.object(service_segment_sources, "parse_chapters") as chapters, patch.object(
+            service_segment_sources, "parse_edl"
+        ) as edl:
+            segs = service_segment_sources._parse_local_sidecar_segments(
+                "/media/show.mkv", MagicMock(), SIDECAR_SIG, SETTINGS_SIG
+            )
+        self.assertEqual(len(segs), 1)
+        chapters.assert_not_called()
+        edl.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
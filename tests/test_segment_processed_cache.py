@@ -12,6 +12,7 @@ from service_segment_processed_cache import (
     clear_segment_processed_cache,
     compute_link_boundaries,
     compute_link_phase,
+    current_segments_index,
     source_segment_fingerprint,
     store_segment_processed_cache,
     try_get_processed_cache,
@@ -22,7 +23,7 @@ class _Monitor:
     segment_processed_cache = None
 
 
-def _noop_log_if_changed(_key, _msg):
+def _noop_log_if_changed(_key, _msg, *_args):
     pass
 
 
@@ -118,5 +119,134 @@ class ProcessedCacheTests(unittest.TestCase):
         self.assertEqual(fp[0][2], "intro")
 
 
+class PhaseJumpTableTests(unittest.TestCase):
+    def _segments(self):
+        return [
+            SegmentItem(0.0, 100.0, "recap", source="xml"),
+            SegmentItem(20.0, 30.0, "ad", source="xml"),
+            SegmentItem(60.0, 80.0, "ad", source="xml"),
+            SegmentItem(223.0, 283.0, "intro", source="xml"),
+        ]
+
+    def _store(self, monitor, segs, current_time):
+        from service_segment_processing import re_evaluate_segment_jump_points
+        from service_segment_sources import _clone_segments
+
+        processed = _clone_segments(segs)
+        re_evaluate_segment_jump_points(processed, current_time)
+        store_segment_processed_cache(
+            monitor,
+            "/video.mkv",
+            "episode",
+            segs,
+            segs,
+            processed,
+            current_time,
+            source_settings_sig=(),
+            sidecar_signature="sig1",
+        )
+
+    def _get(self, monitor, segs, current_time):
+        from service_segment_sources import _clone_segments
+
+        return try_get_processed_cache(
+            monitor,
+            "/video.mkv",
+            "episode",
+            segs,
+            current_time,
+            source_settings_sig=(),
+            sidecar_signature="sig1",
+            clone_pass1_fn=_clone_segments,
+            log_if_changed=_noop_log_if_changed,
+        )
+
+    def test_table_has_one_row_per_phase(self):
+        monitor = _Monitor()
+        segs = self._segments()
+        self._store(monitor, segs, 5.0)
+        cache = monitor.segment_processed_cache
+        self.assertEqual(cache["link_boundaries"], (20.0, 60.0))
+        self.assertEqual(len(cache["jump_table"]), 3)
+        # Parent links to its first nested child only while before it.
+        self.assertEqual(cache["jump_table"][0][0], (20.0, "nested segment 'ad'"))
+        self.assertEqual(cache["jump_table"][1][0], (None, None))
+        # Inside phase 2 the second ad jumps to its own end, back into the recap.
+        self.assertEqual(cache["jump_table"][2][2], (80.0, "remaining 'recap'"))
+
+    def test_phase_change_uses_table_without_relinking(self):
+        import service_segment_processing
+        from unittest.mock import patch
+
+        monitor = _Monitor()
+        segs = self._segments()
+        self._store(monitor, segs, 5.0)
+        with patch.object(
+            service_segment_processing, "segment_jump_points", side_effect=AssertionError
+        ):
+            result, status = self._get(monitor, segs, 65.0)
+            self.assertEqual(status, "phase_reeval")
+            again, _status = self._get(monitor, segs, 25.0)
+        self.assertIsNone(result[0].next_segment_start)
+        self.assertEqual(result[2].next_segment_start, 80.0)
+        self.assertEqual(again[1].next_segment_start, 30.0)
+        self.assertIsNot(again[0], monitor.segment_processed_cache["processed_segments"][0])
+
+    def test_table_matches_rewind_reevaluation_for_active_segments(self):
+        from segment_item import segment_is_active_lenient
+        from service_segment_processing import re_evaluate_segment_jump_points
+        from service_segment_sources import _clone_segments
+
+        segs = self._segments()
+        for t in (1.0, 19.9, 20.0, 25.0, 45.0, 59.9, 60.0, 70.0, 80.2, 90.0, 250.0):
+            # Store in another phase so the lookup for ``t`` comes from the table.
+            monitor = _Monitor()
+            self._store(monitor, segs, 250.0 if t < 60.0 else 1.0)
+            result, status = self._get(monitor, segs, t)
+            self.assertEqual(status, "phase_reeval")
+            expected = _clone_segments(segs)
+            re_evaluate_segment_jump_points(expected, t)
+            for got, want in zip(result, expected):
+                if segment_is_active_lenient(want, t):
+                    self.assertEqual(
+                        (got.next_segment_start, got.next_segment_info),
+                        (want.next_segment_start, want.next_segment_info),
+                        "t=%s seg=%s" % (t, want),
+                    )
+
+    def test_playback_index_built_once_per_phase(self):
+        import segment_item
+        from unittest.mock import patch
+
+        monitor = _Monitor()
+        segs = self._segments()
+        self._store(monitor, segs, 5.0)
+        built = []
+        real = segment_item.build_segment_index
+
+        def _count(segments):
+            built.append(len(segments))
+            return real(segments)
+
+        with patch("service_segment_processed_cache.build_segment_index", side_effect=_count):
+            for t in (6.0, 7.0, 8.0, 25.0, 26.0):
+                monitor.current_segments, _status = self._get(monitor, segs, t)
+                index = current_segments_index(monitor)
+                active = segment_item.segments_active_for_playback(
+                    monitor.current_segments, t, index=index
+                )
+                self.assertEqual(active[0].segment_type_label, "recap")
+                self.assertIn(active[-1], monitor.current_segments)
+        self.assertEqual(built, [4, 4])
+
+    def test_playback_index_needs_a_matching_cache(self):
+        monitor = _Monitor()
+        monitor.current_segments = self._segments()
+        self.assertIsNone(current_segments_index(monitor))
+        self._store(monitor, self._segments(), 5.0)
+        monitor.current_segments = self._segments()[:2]
+        self.assertIsNone(current_segments_index(monitor))
+
+
 if __name__ == "__main__":
     unittest.main()
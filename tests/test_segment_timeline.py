@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""SegmentTimeline answers match the linear scans they replace."""
+
+import random
+import unittest
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+from segment_item import SegmentItem, segment_is_active_lenient
+from segment_relations import is_nested_segment, iter_forward_overlaps
+from segment_timeline import SegmentTimeline
+
+
+def _random_segments(rng, count):
+    segs = []
+    for idx in range(count):
+        start = float(rng.randrange(0, 3000))
+        length = float(rng.choice((5, 30, 90, 400, 1200)))
+        segs.append(SegmentItem(start, start + length, "ad %d" % idx, source="edl"))
+    return sorted(segs, key=lambda s: s.start_seconds)
+
+
+class SegmentTimelineTests(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(7)
+
+    def test_forward_overlaps_match_linear_walk(self):
+        for _ in range(20):
+            segs = _random_segments(self.rng, 60)
+            timeline = SegmentTimeline(segs)
+            for i in range(len(segs)):
+                self.assertEqual(
+                    list(timeline.forward_overlaps(i)), list(iter_forward_overlaps(segs, i))
+                )
+
+    def test_first_container_matches_linear_scan(self):
+        for _ in range(20):
+            segs = _random_segments(self.rng, 60)
+            timeline = SegmentTimeline(segs)
+            for i, seg in enumerate(segs):
+                expected = next((p for p in segs[:i] if is_nested_segment(p, seg)), None)
+                self.assertIs(timeline.first_container(i), expected)
+
+    def test_active_indices_match_lenient_scan(self):
+        segs = _random_segments(self.rng, 200)
+        timeline = SegmentTimeline(segs)
+        for t in [x * 7.5 for x in range(600)]:
+            expected = [i for i, s in enumerate(segs) if segment_is_active_lenient(s, t, 0.25)]
+            self.assertEqual(timeline.active_indices(t, lenient_s=0.25), expected)
+
+    def test_next_boundary(self):
+        timeline = SegmentTimeline(
+            [SegmentItem(10.0, 50.0, "intro"), SegmentItem(20.0, 30.0, "recap")]
+        )
+        self.assertEqual(timeline.next_boundary(0.0), 10.0)
+        self.assertEqual(timeline.next_boundary(20.0), 30.0)
+        self.assertEqual(timeline.next_boundary(35.0), 50.0)
+        self.assertIsNone(timeline.next_boundary(50.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,8 +20,13 @@ REFACTORED_LOOP_MODULES = (
     "service_embedded_chapters",
     "mkv_chapter_parse",
     "service_main_loop",
+    "service_wake_scheduler",
     "remote_http",
+    "remote_http_pool",
+    "remote_segment_disk_cache",
+    "remote_response_cache",
     "remote_tmdb",
+    "remote_episode_index",
     "remote_library",
     "remote_lookup",
     "remote_segments",
@@ -31,6 +36,7 @@ REFACTORED_LOOP_MODULES = (
     "service_online_sidecar_save",
     "skippy_profile_backup",
     "skip_dialog_appearance",
+    "skippy_log_sink",
 )
 
 
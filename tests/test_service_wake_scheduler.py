@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Scheduler mode: sleep until the next segment instant, wake early on player events."""
+
+import types
+import unittest
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+from service_wake_scheduler import (
+    MAX_IDLE_SLEEP_S,
+    MIN_SLEEP_S,
+    PlaybackWakeScheduler,
+    next_wake_delay,
+)
+
+
+def _segment(start, end):
+    return types.SimpleNamespace(start_seconds=start, end_seconds=end)
+
+
+class _Monitor:
+    def __init__(self, on_wait=None):
+        self.waits = []
+        self._on_wait = on_wait
+
+    def abortRequested(self):
+        return False
+
+    def waitForAbort(self, seconds):
+        self.waits.append(seconds)
+        if self._on_wait:
+            self._on_wait(len(self.waits))
+        return False
+
+
+class NextWakeDelayTests(unittest.TestCase):
+    def test_far_from_segments_sleeps_until_lookahead(self):
+        delay = next_wake_delay(
+            [_segment(100.0, 130.0)], 90.0, (), check_interval=1, lookahead=3.0
+        )
+        self.assertAlmostEqual(delay, 7.0)
+
+    def test_idle_cap_without_upcoming_instants(self):
+        delay = next_wake_delay(
+            [_segment(10.0, 20.0)], 500.0, (), check_interval=1, lookahead=3.0
+        )
+        self.assertEqual(delay, MAX_IDLE_SLEEP_S)
+
+    def test_sub_second_wake_at_segment_start(self):
+        delay = next_wake_delay(
+            [_segment(100.0, 130.0)], 99.6, (), check_interval=1, lookahead=3.0
+        )
+        self.assertAlmostEqual(delay, 0.4)
+
+    def test_inside_segment_keeps_check_interval(self):
+        delay = next_wake_delay(
+            [_segment(100.0, 400.0)], 200.0, (), check_interval=1, lookahead=3.0
+        )
+        self.assertEqual(delay, 1.0)
+
+    def test_link_boundary_is_a_wake_instant(self):
+        delay = next_wake_delay(
+            [_segment(100.0, 400.0)], 50.0, (60.0,), check_interval=1, lookahead=3.0
+        )
+        self.assertAlmostEqual(delay, 7.0)
+
+    def test_unknown_time_uses_check_interval(self):
+        self.assertEqual(
+            next_wake_delay([], None, (), check_interval=1, lookahead=3.0), 1.0
+        )
+
+    def test_never_below_minimum(self):
+        delay = next_wake_delay(
+            [_segment(100.0, 130.0)], 99.94, (), check_interval=1, lookahead=3.0
+        )
+        self.assertGreaterEqual(delay, MIN_SLEEP_S)
+
+
+class SchedulerWaitTests(unittest.TestCase):
+    def test_notify_ends_wait_early(self):
+        scheduler = PlaybackWakeScheduler()
+
+        def fire(count):
+            if count == 2:
+                scheduler.notify("seek")
+
+        monitor = _Monitor(on_wait=fire)
+        self.assertFalse(scheduler.wait(monitor, 10.0))
+        self.assertEqual(len(monitor.waits), 2)
+        self.assertEqual(scheduler.last_reason, "seek")
+
+    def test_idle_wait_wakes_at_most_once_per_second(self):
+        scheduler = PlaybackWakeScheduler()
+        monitor = _Monitor()
+        self.assertFalse(scheduler.wait(monitor, 2.5))
+        self.assertEqual(monitor.waits, [1.0, 1.0, 0.5])
+
+    def test_pending_notify_skips_wait(self):
+        scheduler = PlaybackWakeScheduler()
+        scheduler.notify("av_started")
+        monitor = _Monitor()
+        self.assertFalse(scheduler.wait(monitor, 5.0))
+        self.assertEqual(monitor.waits, [])
+
+    def test_speed_change_disables_scheduling(self):
+        scheduler = PlaybackWakeScheduler()
+        scheduler.set_speed(2)
+        self.assertFalse(scheduler.normal_speed)
+        scheduler.set_speed(1)
+        self.assertTrue(scheduler.normal_speed)
+
+
+if __name__ == "__main__":
+    unittest.main()
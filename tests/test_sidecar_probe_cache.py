@@ -141,5 +141,155 @@ class DirectoryListingMatchTests(unittest.TestCase):
         self.assertEqual(unknown, [])
 
 
+class DirectoryListingCacheTests(unittest.TestCase):
+    def setUp(self):
+        install_kodi_stubs()
+        from service_sidecar_paths import clear_directory_listing_cache
+
+        clear_directory_listing_cache()
+        self.addCleanup(clear_directory_listing_cache)
+
+    def _stat(self, mtime):
+        import types
+
+        return types.SimpleNamespace(st_mtime=lambda: mtime, st_size=lambda: 0)
+
+    def test_listing_shared_while_directory_mtime_unchanged(self):
+        from service_sidecar_paths import existing_paths_from_listing
+
+        mtime = {"v": 100}
+        with patch(
+            "service_sidecar_paths.xbmcvfs.listdir", return_value=([], ["e01.edl"])
+        ) as listdir, patch(
+            "service_sidecar_paths.xbmcvfs.Stat", side_effect=lambda _p: self._stat(mtime["v"])
+        ):
+            existing_paths_from_listing(["/media/season/e01.edl"])
+            existing_paths_from_listing(["/media/season/e02.edl"])
+            self.assertEqual(listdir.call_count, 1)
+            mtime["v"] = 101
+            existing_paths_from_listing(["/media/season/e02.edl"])
+            self.assertEqual(listdir.call_count, 2)
+
+    def test_ttl_when_stat_has_no_mtime(self):
+        from service_sidecar_paths import LISTING_TTL_NO_MTIME_S, _listdir_index
+
+        clock = {"t": 0.0}
+        with patch(
+            "service_sidecar_paths.xbmcvfs.listdir", return_value=([], ["a.edl"])
+        ) as listdir, patch(
+            "service_sidecar_paths.xbmcvfs.Stat", side_effect=lambda _p: self._stat(0)
+        ), patch(
+            "service_sidecar_paths.time.monotonic", side_effect=lambda: clock["t"]
+        ):
+            _listdir_index("/media/season")
+            clock["t"] = LISTING_TTL_NO_MTIME_S / 2
+            _listdir_index("/media/season")
+            self.assertEqual(listdir.call_count, 1)
+            clock["t"] = LISTING_TTL_NO_MTIME_S + 1
+            _listdir_index("/media/season")
+            self.assertEqual(listdir.call_count, 2)
+
+    def test_sidecar_write_invalidates_folder_listing(self):
+        from unittest.mock import MagicMock
+
+        from service_sidecar_paths import _listdir_index
+        from service_sidecar_probe_cache import clear_sidecar_probe_cache
+
+        with patch(
+            "service_sidecar_paths.xbmcvfs.listdir", return_value=([], [])
+        ) as listdir, patch(
+            "service_sidecar_paths.xbmcvfs.Stat", side_effect=lambda _p: self._stat(5)
+        ):
+            _listdir_index("/media/season")
+            clear_sidecar_probe_cache(MagicMock(sidecar_probe_cache={}), "/media/season/e01.mkv")
+            _listdir_index("/media/season")
+            self.assertEqual(listdir.call_count, 2)
+
+
+class BatchedSidecarSignatureTests(unittest.TestCase):
+    def setUp(self):
+        install_kodi_stubs()
+
+    def _directory_response(self, files):
+        import json
+
+        return json.dumps({"jsonrpc": "2.0", "id": 1, "result": {"files": files}})
+
+    def test_one_directory_call_replaces_per_file_stat(self):
+        from service_sidecar_paths import _sidecar_signature
+
+        response = self._directory_response(
+            [
+                {"file": "/media/show.edl", "filetype": "file", "size": 42,
+                 "lastmodified": "2026-01-02 03:04:05"},
+                {"file": "/media/show.mkv", "filetype": "file", "size": 9,
+                 "lastmodified": "2026-01-02 03:04:05"},
+            ]
+        )
+        with patch(
+            "service_sidecar_paths._sidecar_paths_to_watch",
+            return_value=["/media/show.edl", "/media/show_chapters.xml"],
+        ), patch(
+            "service_sidecar_paths.xbmc.executeJSONRPC", return_value=response
+        ) as rpc, patch("service_sidecar_paths.xbmcvfs.exists") as exists, patch(
+            "service_sidecar_paths.xbmcvfs.Stat"
+        ) as stat:
+            sig = _sidecar_signature("/media/show.mkv")
+        self.assertEqual(rpc.call_count, 1)
+        exists.assert_not_called()
+        stat.assert_not_called()
+        self.assertEqual(len(sig), 1)
+        path, mtime, size = sig[0]
+        self.assertEqual(path, "/media/show.edl")
+        self.assertIsInstance(mtime, int)
+        self.assertEqual(size, 42)
+
+    def test_falls_back_to_stat_when_directory_call_fails(self):
+        import types
+
+        from service_sidecar_paths import _sidecar_signature
+
+        with patch(
+            "service_sidecar_paths._sidecar_paths_to_watch",
+            return_value=["/media/show.edl"],
+        ), patch(
+            "service_sidecar_paths.xbmc.executeJSONRPC",
+            return_value='{"jsonrpc":"2.0","id":1,"error":{"code":-32602}}',
+        ), patch(
+            "service_sidecar_paths.xbmcvfs.exists", return_value=True
+        ), patch(
+            "service_sidecar_paths.xbmcvfs.Stat",
+            return_value=types.SimpleNamespace(st_mtime=lambda: 7, st_size=lambda: 3),
+        ):
+            sig = _sidecar_signature("/media/show.mkv")
+        self.assertEqual(sig, (("/media/show.edl", 7, 3),))
+
+    def test_unparsable_lastmodified_falls_back_to_stat(self):
+        import types
+
+        from service_sidecar_paths import _sidecar_signature
+
+        response = self._directory_response(
+            [
+                {"file": "/media/show.edl", "filetype": "file", "size": 42,
+                 "lastmodified": "02/01/2026 3:04 AM"},
+            ]
+        )
+        with patch(
+            "service_sidecar_paths._sidecar_paths_to_watch",
+            return_value=["/media/show.edl"],
+        ), patch(
+            "service_sidecar_paths.xbmc.executeJSONRPC", return_value=response
+        ), patch(
+            "service_sidecar_paths.xbmcvfs.exists", return_value=True
+        ), patch(
+            "service_sidecar_paths.xbmcvfs.Stat",
+            return_value=types.SimpleNamespace(st_mtime=lambda: 7, st_size=lambda: 42),
+        ) as stat:
+            sig = _sidecar_signature("/media/show.mkv")
+        stat.assert_called_once_with("/media/show.edl")
+        self.assertEqual(sig, (("/media/show.edl", 7, 42),))
+
+
 if __name__ == "__main__":
     unittest.main()
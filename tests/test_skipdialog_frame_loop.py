@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Skip dialog progress loop: settings snapshot, frame pacing, dirty checks, frame budget."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+from skip_dialog_appearance import DictSettingsReader
+
+
+class _FakeClock:
+    def __init__(self, start=1000.0):
+        self.now = start
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _dialog(settings, clock, *, frame_cost=0.0):
+    from segment_item import SegmentItem
+    from skipdialog import SkipDialog
+
+    dlg = SkipDialog.__new__(SkipDialog)
+    dlg.segment = SegmentItem(10.0, 12.0, "intro")
+    dlg._frame_settings = DictSettingsReader(settings)
+    dlg._closing = False
+    dlg._minimal_mode = False
+    dlg._combined_mode = False
+    dlg._total_duration = 2.0
+    dlg._start_time = clock.monotonic()
+    dlg._skip_progress_bar_width = 400
+    dlg._refresh_countdown_label = MagicMock()
+    dlg._refresh_skip_duration_label = MagicMock()
+    dlg._set_smooth_bar_window_visible = MagicMock()
+    dlg._finish_dialog = MagicMock()
+    dlg.setProperty = MagicMock()
+    dlg.getControl = MagicMock()
+
+    start = clock.now
+
+    def get_time():
+        clock.now += frame_cost
+        return 10.0 + (clock.now - start)
+
+    dlg.player = MagicMock()
+    dlg.player.isPlaying.return_value = True
+    dlg.player.getTime.side_effect = get_time
+    return dlg
+
+
+class SkipDialogFrameLoopTests(unittest.TestCase):
+    def _run(self, dlg, clock):
+        with patch("skipdialog.time.monotonic", clock.monotonic), patch(
+            "skipdialog.time.sleep", clock.sleep
+        ), patch("skipdialog.addon_get_setting_text") as read_text, patch(
+            "skipdialog.log"
+        ):
+            dlg._monitor_segment_end()
+        return read_text
+
+    @patch("skipdialog.xbmcgui")
+    def test_frames_read_the_snapshot_not_the_addon(self, _gui):
+        clock = _FakeClock()
+        dlg = _dialog({"show_progress_bar": "true"}, clock)
+        read_text = self._run(dlg, clock)
+        read_text.assert_not_called()
+        dlg._finish_dialog.assert_called_once_with(False)
+        self.assertTrue(dlg.getControl.return_value.setPercent.called)
+
+    @patch("skipdialog.xbmcgui")
+    def test_frame_work_is_subtracted_from_the_sleep(self, _gui):
+        clock = _FakeClock()
+        dlg = _dialog({"show_progress_bar": "true"}, clock, frame_cost=0.1)
+        self._run(dlg, clock)
+        self.assertTrue(clock.sleeps)
+        for seconds in clock.sleeps:
+            self.assertAlmostEqual(seconds, 0.15, places=6)
+
+    @patch("skipdialog.xbmcgui")
+    def test_late_frame_does_not_sleep_or_burst(self, _gui):
+        clock = _FakeClock()
+        settings = {
+            "show_progress_bar": "true",
+            "smooth_progress_bar": "true",
+            "progress_bar_updates_per_second": "20",
+        }
+        dlg = _dialog(settings, clock, frame_cost=0.08)
+        self._run(dlg, clock)
+        # 50 ms frames that take 80 ms: never sleep, never try to catch up.
+        self.assertEqual(clock.sleeps, [])
+        self.assertTrue(dlg.getControl.return_value.setWidth.called)
+
+    @patch("skipdialog.xbmcgui")
+    def test_snapshot_taken_lazily_when_oninit_skipped(self, _gui):
+        from skipdialog import SkipDialog
+
+        dlg = SkipDialog.__new__(SkipDialog)
+        addon = MagicMock()
+        with patch("skipdialog.get_addon", return_value=addon), patch(
+            "skipdialog.addon_get_setting_text",
+            side_effect=lambda _a, key, default="": "true" if key == "progress_bar_countdown" else "",
+        ):
+            settings = dlg._frame_settings_reader()
+        self.assertTrue(settings.get_bool("progress_bar_countdown", False))
+        self.assertEqual(settings.get_int("progress_bar_updates_per_second", 4), 4)
+        self.assertIs(dlg._frame_settings_reader(), settings)
+
+
+class SkipDialogDirtyCheckTests(unittest.TestCase):
+    def _run(self, dlg, clock):
+        with patch("skipdialog.time.monotonic", clock.monotonic), patch(
+            "skipdialog.time.sleep", clock.sleep
+        ), patch("skipdialog.log"):
+            dlg._monitor_segment_end()
+
+    @patch("skipdialog.xbmcgui")
+    def test_unchanged_frames_push_nothing(self, _gui):
+        clock = _FakeClock()
+        dlg = _dialog({"show_progress_bar": "true"}, clock)
+        dlg.player.getTime.side_effect = None
+        dlg.player.getTime.return_value = 10.5
+        dlg.player.isPlaying.side_effect = [True] * 6 + [False]
+        self._run(dlg, clock)
+
+        progress = dlg.getControl.return_value
+        self.assertEqual(progress.setPercent.call_count, 1)
+        self.assertEqual(progress.setVisible.call_count, 1)
+        countdown_sets = [c for c in dlg.setProperty.call_args_list if c.args[0] == "countdown"]
+        self.assertEqual(len(countdown_sets), 1)
+        dlg._refresh_countdown_label.assert_called_once_with("00:01")
+
+    @patch("skipdialog.xbmcgui")
+    def test_control_handles_are_looked_up_once(self, _gui):
+        clock = _FakeClock()
+        dlg = _dialog({"show_progress_bar": "true", "smooth_progress_bar": "true"}, clock)
+        self._run(dlg, clock)
+        looked_up = [c.args[0] for c in dlg.getControl.call_args_list]
+        self.assertEqual(sorted(looked_up), sorted(set(looked_up)))
+        self.assertGreater(dlg._frames_rendered, 1)
+
+    @patch("skipdialog.xbmcgui")
+    def test_countdown_label_skips_identical_text(self, _gui):
+        from skipdialog import SkipDialog
+
+        dlg = SkipDialog.__new__(SkipDialog)
+        dlg._minimal_mode = False
+        dlg.getProperty = MagicMock(side_effect=lambda key: "Ends in" if key == "ending_text" else "")
+        label = MagicMock()
+        dlg.getControl = MagicMock(return_value=label)
+        dlg._refresh_countdown_label("00:05")
+        dlg._refresh_countdown_label("00:05")
+        dlg._refresh_countdown_label("00:04")
+        self.assertEqual(dlg.getControl.call_count, 1)
+        pushed = [c for c in label.method_calls if c[0] == "setLabel"]
+        self.assertEqual(len(pushed), 2)
+
+
+class SkipDialogFrameBudgetTests(unittest.TestCase):
+    def _run(self, dlg, clock):
+        with patch("skipdialog.time.monotonic", clock.monotonic), patch(
+            "skipdialog.time.sleep", clock.sleep
+        ), patch("skipdialog.log") as log:
+            dlg._monitor_segment_end()
+        return log
+
+    @patch("skipdialog.xbmcgui")
+    def test_frames_within_budget_drop_nothing(self, _gui):
+        clock = _FakeClock()
+        dlg = _dialog({"show_progress_bar": "true"}, clock, frame_cost=0.1)
+        log = self._run(dlg, clock)
+        self.assertEqual(dlg._frames_dropped, 0)
+        self.assertIn("0 dropped", log.call_args_list[-1].args[0])
+
+    @patch("skipdialog.xbmcgui")
+    def test_overrunning_frames_are_counted(self, _gui):
+        clock = _FakeClock()
+        settings = {
+            "show_progress_bar": "true",
+            "smooth_progress_bar": "true",
+            "progress_bar_updates_per_second": "20",
+        }
+        dlg = _dialog(settings, clock, frame_cost=0.12)
+        self._run(dlg, clock)
+        # 120 ms of work against a 50 ms budget misses two slots per frame.
+        self.assertGreater(dlg._frames_rendered, 0)
+        self.assertEqual(dlg._frames_dropped, 2 * dlg._frames_rendered)
+
+
+if __name__ == "__main__":
+    unittest.main()
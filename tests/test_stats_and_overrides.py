@@ -85,6 +85,46 @@ class StatisticsTests(_ProfileTempDir):
         self.assertEqual(skippy_stats.load_statistics()["skips"]["total"], 0)
 
 
+class StatisticsWriteBehindTests(_ProfileTempDir):
+    def _stats_file(self):
+        return skippy_profile_store.profile_path(skippy_stats.STATS_FILENAME)
+
+    def test_events_are_not_written_until_flushed(self):
+        skippy_stats.record_skip("Intro", 10.0)
+        skippy_stats.record_online_segment_uploaded()
+        self.assertFalse(os.path.exists(self._stats_file()))
+
+        self.assertTrue(skippy_stats.flush_statistics())
+        self.assertFalse(skippy_stats.flush_statistics())
+        on_disk = skippy_profile_store.read_json(self._stats_file())
+        self.assertEqual(on_disk["skips"]["total"], 1)
+        self.assertEqual(on_disk["online"]["segments_uploaded"], 1)
+
+    def test_timer_flushes_after_delay(self):
+        with patch.object(skippy_stats, "FLUSH_DELAY_S", 0.05):
+            skippy_stats.record_skip("Intro", 10.0)
+            skippy_stats.record_skip("Recap", 5.0)
+            timer = skippy_stats._flush_timer
+        self.assertIsNotNone(timer)
+        timer.join(2.0)
+        self.assertIsNone(skippy_stats._flush_timer)
+        on_disk = skippy_profile_store.read_json(self._stats_file())
+        self.assertEqual(on_disk["skips"]["total"], 2)
+
+    def test_failed_write_stays_pending(self):
+        skippy_stats.record_skip("Intro", 10.0)
+        with patch.object(skippy_stats, "write_json", return_value=False):
+            self.assertFalse(skippy_stats.flush_statistics())
+        self.assertTrue(skippy_stats.flush_statistics())
+
+    def test_reset_is_written_immediately(self):
+        skippy_stats.record_skip("Intro", 10.0)
+        skippy_stats.reset_statistics()
+        self.assertIsNone(skippy_stats._flush_timer)
+        on_disk = skippy_profile_store.read_json(self._stats_file())
+        self.assertEqual(on_disk["skips"]["total"], 0)
+
+
 class StatisticsTextTests(_ProfileTempDir):
     def test_saved_time_units(self):
         addon = None
@@ -207,17 +247,88 @@ class OverrideStoreTests(_ProfileTempDir):
             },
         )
 
-    def test_one_file_per_title(self):
+    def test_all_titles_share_one_file(self):
         per_show_overrides.save_override(
             "tv_tmdb_1396", "Intro", per_show_overrides.MODE_AUTO
         )
         per_show_overrides.save_override(
             "movie_tmdb_603", "Intro", per_show_overrides.MODE_AUTO
         )
-        files = [
-            os.path.basename(p) for p in per_show_overrides.stored_override_files()
-        ]
-        self.assertEqual(files, ["movie_tmdb_603.json", "tv_tmdb_1396.json"])
+        files = per_show_overrides.stored_override_files()
+        self.assertEqual([os.path.basename(p) for p in files], ["show_overrides.json"])
+        stored = skippy_profile_store.read_json(files[0])
+        self.assertEqual(sorted(stored["titles"]), ["movie_tmdb_603", "tv_tmdb_1396"])
+
+    def test_legacy_per_title_files_are_migrated(self):
+        legacy_dir = os.path.join(self._tmp.name, per_show_overrides.LEGACY_DIRNAME)
+        os.makedirs(legacy_dir)
+        skippy_profile_store.write_json(
+            os.path.join(legacy_dir, "tv_tmdb_1396.json"),
+            {
+                "schema": per_show_overrides.SCHEMA,
+                "key": "tv_tmdb_1396",
+                "segments": {"Intro": "auto", "Recap": "declined"},
+                "title": "Friends",
+            },
+        )
+        skippy_profile_store.write_json(
+            os.path.join(legacy_dir, "movie_tmdb_603.json"), {"segments": {"credits": "auto"}}
+        )
+
+        self.assertEqual(per_show_overrides.load_override_store(), 2)
+        self.assertFalse(os.path.exists(legacy_dir))
+        per_show_overrides.clear_cache()
+        self.assertEqual(
+            per_show_overrides.load_overrides("tv_tmdb_1396"),
+            {"intro": "auto", "recap": "declined"},
+        )
+        self.assertEqual(
+            [e["title"] for e in per_show_overrides.list_title_entries()],
+            ["Friends", "Movie · TMDB 603"],
+        )
+
+    def test_rewrite_by_another_process_is_picked_up(self):
+        per_show_overrides.save_override(
+            "tv_tmdb_1396", "Intro", per_show_overrides.MODE_AUTO
+        )
+        path = per_show_overrides.stored_override_files()[0]
+        skippy_profile_store.write_json(
+            path, {"schema": per_show_overrides.STORE_SCHEMA, "titles": {}}
+        )
+        with patch.object(per_show_overrides, "STORE_CHECK_INTERVAL_S", 0.0):
+            self.assertIsNone(
+                per_show_overrides.lookup_override("tv_tmdb_1396", "Intro")
+            )
+
+    def test_failed_write_leaves_memory_unchanged(self):
+        per_show_overrides.save_override(
+            "tv_tmdb_1396", "Intro", per_show_overrides.MODE_AUTO
+        )
+        with patch.object(per_show_overrides, "write_json", return_value=False):
+            self.assertFalse(
+                per_show_overrides.save_override(
+                    "tv_tmdb_1396", "Recap", per_show_overrides.MODE_AUTO
+                )
+            )
+            self.assertFalse(per_show_overrides.delete_override("tv_tmdb_1396"))
+        self.assertEqual(per_show_overrides.load_overrides("tv_tmdb_1396"), {"intro": "auto"})
+
+    def test_backup_merge_writes_once(self):
+        incoming = {
+            "tv_tmdb_%d" % i: {"segments": {"Intro": "auto"}, "title": "Show %d" % i}
+            for i in range(25)
+        }
+        with patch.object(
+            per_show_overrides, "write_json", wraps=skippy_profile_store.write_json
+        ) as writer:
+            self.assertEqual(
+                per_show_overrides.merge_overrides_from_backup(incoming), (25, 25, 0)
+            )
+            self.assertEqual(
+                per_show_overrides.merge_overrides_from_backup(incoming), (0, 0, 0)
+            )
+        self.assertEqual(writer.call_count, 1)
+        self.assertEqual(len(per_show_overrides.export_all_overrides()), 25)
 
     def test_path_traversal_keys_are_refused(self):
         self.assertFalse(
@@ -233,7 +344,7 @@ class OverrideStoreTests(_ProfileTempDir):
         )
         self.assertEqual(per_show_overrides.stored_override_files(), [])
 
-    def test_clear_all_removes_every_file(self):
+    def test_clear_all_forgets_every_title(self):
         per_show_overrides.save_override(
             "tv_tmdb_1396", "Intro", per_show_overrides.MODE_AUTO
         )
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""TV prefetch lookahead: multi-entry store, handoff without discarding, rate-limited worker."""
+
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from tests.kodi_stubs import install_kodi_stubs
+
+install_kodi_stubs()
+
+import prefetch_segment_cache as store
+import remote_lookup
+import service_segment_prefetch as prefetch
+
+
+def _seg(source="theintrodb"):
+    return SimpleNamespace(source=source, start_seconds=0.0, end_seconds=30.0)
+
+
+class _Monitor:
+    def __init__(self, path="/tv/S01E01.mkv"):
+        self.prefetch_tv_scheduled_path = path
+        self.prefetch_tv_lock = threading.Lock()
+        self.prefetch_tv_result = prefetch._PREFETCH_RUNNING
+        self.prefetch_tv_cancel = None
+
+
+class PrefetchStoreTests(unittest.TestCase):
+    def setUp(self):
+        store.clear_prefetch_segment_cache()
+        self.addCleanup(store.clear_prefetch_segment_cache)
+
+    def test_store_keeps_several_episodes_and_evicts_least_recent(self):
+        for i in range(store.MAX_ENTRIES + 2):
+            store.set_tv_segment_prefetch("/tv/E%02d.mkv" % i, [_seg()], "k%d" % i)
+        keys = store.prefetched_cache_keys()
+        self.assertEqual(len(keys), store.MAX_ENTRIES)
+        self.assertNotIn("k0", keys)
+        self.assertEqual(store.peek_tv_prefetch_for_playing_path("/tv/E03.mkv")["cache_key"], "k3")
+
+    def test_consumed_entry_stays_and_becomes_most_recent(self):
+        store.set_tv_segment_prefetch("/tv/E01.mkv", [_seg()], "k1")
+        store.set_tv_segment_prefetch("/tv/E02.mkv", [_seg()], "k2")
+        store.consume_tv_prefetch_entry("k1")
+        self.assertEqual(store.prefetched_cache_keys(), ["k2", "k1"])
+        self.assertTrue(store.has_tv_prefetch("k1"))
+
+
+class PrefetchHandoffTests(unittest.TestCase):
+    def setUp(self):
+        store.clear_prefetch_segment_cache()
+        self.addCleanup(store.clear_prefetch_segment_cache)
+        store.set_tv_segment_prefetch("/tv/E01.mkv", [_seg()], "k1")
+
+    def _handoff(self, key):
+        cache = {}
+        with patch.object(remote_lookup, "build_tv_episode_context", return_value={"x": 1}), patch.object(
+            remote_lookup, "build_tv_cache_key", return_value=key
+        ):
+            out = remote_lookup._try_tv_prefetch_handoff({"file": "/tv/E01.mkv"}, cache)
+        return out, cache
+
+    def test_match_hands_off_and_keeps_the_entry(self):
+        out, cache = self._handoff("k1")
+        self.assertEqual(len(out), 1)
+        self.assertIn("k1", cache)
+        self.assertTrue(store.has_tv_prefetch("k1"))
+        self.assertEqual(len(self._handoff("k1")[0]), 1)
+
+    def test_mismatch_does_not_discard_the_entry(self):
+        out, cache = self._handoff("other")
+        self.assertIsNone(out)
+        self.assertEqual(cache, {})
+        self.assertTrue(store.has_tv_prefetch("k1"))
+
+
+class PrefetchWorkerTests(unittest.TestCase):
+    def setUp(self):
+        store.clear_prefetch_segment_cache()
+        self.addCleanup(store.clear_prefetch_segment_cache)
+        self.window = [
+            {"type": "episode", "id": 100 + e, "season": 1, "episode": e, "file": "/tv/E%02d.mkv" % e}
+            for e in (2, 3, 4)
+        ]
+        self.fetched = []
+        patches = (
+            ("get_enriched_item_for_path", {"return_value": {"type": "episode", "id": 101}}),
+            ("resolve_tv_library_lookahead_episode_items", {"side_effect": self._window}),
+            ("build_tv_episode_context", {"side_effect": lambda item: {"id": item["id"]}}),
+            ("build_tv_cache_key", {"side_effect": lambda ctx: "k%d" % ctx["id"]}),
+            ("episode_runtime_seconds_for_prefetch", {"return_value": 1500.0}),
+            ("fetch_remote_tv_segments_core", {"side_effect": self._fetch}),
+            ("PREFETCH_REQUEST_INTERVAL_S", {"new": 0.0}),
+        )
+        for name, kwargs in patches:
+            patcher = patch.object(prefetch, name, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.on_fetch = None
+
+    def _window(self, _item, count):
+        return self.window[:count]
+
+    def _fetch(self, item, _total, _cache):
+        self.fetched.append(item["id"])
+        if self.on_fetch:
+            self.on_fetch()
+        return [_seg()]
+
+    def test_window_is_fetched_in_order_and_stored_entries_are_skipped(self):
+        store.set_tv_segment_prefetch("/tv/E03.mkv", [_seg()], "k103")
+        monitor = _Monitor()
+        prefetch._prefetch_worker(monitor, monitor.prefetch_tv_scheduled_path, 3)
+        self.assertEqual(self.fetched, [102, 104])
+        self.assertEqual(set(store.prefetched_cache_keys()), {"k102", "k103", "k104"})
+        self.assertEqual(monitor.prefetch_tv_result, "done")
+
+    def test_cancel_stops_the_window(self):
+        monitor = _Monitor()
+        cancel = threading.Event()
+        self.on_fetch = cancel.set
+        prefetch._prefetch_worker(monitor, monitor.prefetch_tv_scheduled_path, 3, cancel)
+        self.assertEqual(self.fetched, [102])
+        self.assertEqual(store.prefetched_cache_keys(), ["k102"])
+
+    def test_clearing_thread_state_cancels_the_worker(self):
+        monitor = _Monitor()
+        monitor.prefetch_tv_cancel = threading.Event()
+        prefetch.clear_tv_prefetch_thread_state(monitor)
+        self.assertTrue(monitor.prefetch_tv_cancel.is_set())
+        self.assertIsNone(monitor.prefetch_tv_scheduled_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
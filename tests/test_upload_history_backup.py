@@ -176,5 +176,113 @@ class ProfileDataBackupFileTests(unittest.TestCase):
             self.assertFalse(summary["stats_merged"])
 
 
+class UploadHistoryIndexTests(unittest.TestCase):
+    def setUp(self):
+        import online_segment_upload
+
+        self.mod = online_segment_upload
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.hist_path = os.path.join(tmp.name, "online_upload_submissions.json")
+        patcher = patch.object(online_segment_upload, "_history_path", return_value=self.hist_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        online_segment_upload.clear_history_cache()
+        self.addCleanup(online_segment_upload.clear_history_cache)
+        stats = patch.object(online_segment_upload, "record_online_segment_uploaded")
+        self.recorded = stats.start()
+        self.addCleanup(stats.stop)
+
+    def _on_disk(self):
+        with open(self.hist_path, encoding="utf-8") as fp:
+            return json.load(fp)
+
+    def test_lookups_do_not_reparse_the_file(self):
+        self.mod._history_record("theintrodb", "fp1")
+        with patch.object(self.mod, "_load_history", side_effect=AssertionError("reloaded")):
+            for _ in range(50):
+                self.assertTrue(self.mod._history_contains("theintrodb", "fp1"))
+                self.assertFalse(self.mod._history_contains("introdb", "fp1"))
+        self.assertEqual(self._on_disk()["theintrodb"], ["fp1"])
+        self.recorded.assert_called_once_with()
+
+    def test_deferred_block_writes_once(self):
+        with patch.object(self.mod, "write_json", wraps=self.mod.write_json) as writer:
+            with self.mod._deferred_history_writes():
+                for i in range(20):
+                    self.mod._history_record("introdb", "fp%d" % i)
+                self.mod._history_record("introdb", "fp0")
+                self.assertTrue(self.mod._history_contains("introdb", "fp19"))
+                writer.assert_not_called()
+        writer.assert_called_once()
+        self.assertEqual(len(self._on_disk()["introdb"]), 20)
+        self.assertEqual(self.recorded.call_count, 20)
+
+    def test_external_rewrite_is_reloaded(self):
+        self.mod._history_record("theintrodb", "fp1")
+        with open(self.hist_path, "w", encoding="utf-8") as fp:
+            json.dump({"v": 1, "theintrodb": ["fp1", "restored-from-backup"], "introdb": []}, fp)
+        self.assertTrue(self.mod._history_contains("theintrodb", "restored-from-backup"))
+
+    def test_history_is_trimmed_to_newest_entries(self):
+        with patch.object(self.mod, "_MAX_HISTORY_ENTRIES_PER_API", 3):
+            with self.mod._deferred_history_writes():
+                for i in range(5):
+                    self.mod._history_record("theintrodb", "fp%d" % i)
+        self.assertEqual(self._on_disk()["theintrodb"], ["fp2", "fp3", "fp4"])
+        self.assertFalse(self.mod._history_contains("theintrodb", "fp0"))
+
+
+class UploadStatisticsFlushTests(unittest.TestCase):
+    """The editor uploads from a RunScript process, which can exit before the stats timer."""
+
+    def setUp(self):
+        import online_segment_upload
+        import skippy_profile_store
+        import skippy_stats
+
+        self.mod = online_segment_upload
+        self.stats = skippy_stats
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.profile = tmp.name
+        addon = MagicMock()
+        addon.getSetting.side_effect = lambda key: (
+            "tidb-key" if key == "online_upload_theintrodb_api_key" else ""
+        )
+        for target, name, kwargs in (
+            (skippy_profile_store, "profile_dir", {"return_value": tmp.name}),
+            (
+                online_segment_upload,
+                "_history_path",
+                {"return_value": os.path.join(tmp.name, "online_upload_submissions.json")},
+            ),
+            (online_segment_upload.xbmcaddon, "Addon", {"return_value": addon}),
+            (online_segment_upload, "get_enriched_item_for_path", {"return_value": {}}),
+            (online_segment_upload, "build_upload_context", {"return_value": {"tmdb_id": 1}}),
+            (online_segment_upload, "playback_duration_seconds_for_upload", {"return_value": None}),
+            (online_segment_upload, "_submit_theintrodb", {"return_value": (True, None)}),
+            (online_segment_upload, "show_editor_ok", {}),
+            (online_segment_upload.xbmc, "sleep", {"create": True}),
+        ):
+            patcher = patch.object(target, name, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        skippy_stats.clear_cache()
+        self.addCleanup(skippy_stats.clear_cache)
+        online_segment_upload.clear_history_cache()
+        self.addCleanup(online_segment_upload.clear_history_cache)
+
+    def test_upload_count_is_on_disk_when_upload_returns(self):
+        from segment_item import SegmentItem
+
+        segments = [SegmentItem(0.0, 60.0, "intro"), SegmentItem(1200.0, 1290.0, "credits")]
+        self.mod.upload_segments_subset(
+            "/tv/show/s01e01.mkv", segments, self.mod.TARGET_THEINTRODB, show_result=False
+        )
+        with open(os.path.join(self.profile, self.stats.STATS_FILENAME), encoding="utf-8") as fp:
+            self.assertEqual(json.load(fp)["online"]["segments_uploaded"], 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark: Matroska chapter parse time and peak allocation.
+
+Builds synthetic MKV headers (EBML + Segment + SeekHead + padding Void + Chapters)
+with N chapter atoms and reports, per N, the mean parse time and the tracemalloc
+peak above the input buffer. With the memoryview walker the peak stays near the
+size of the produced rows; a walker that slices ``bytes`` at every nesting level
+allocates several copies of the Chapters payload (and of the whole buffer when it
+slices the Segment).
+
+Usage (from the repo root)::
+
+    python tools/bench_mkv_chapter_parse.py [--pad-mib 8] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from mkv_chapter_parse import parse_matroska_chapters_from_bytes  # noqa: E402
+
+CHAPTER_COUNTS = (10, 100, 300, 1000)
+
+
+def _size_vint(n: int) -> bytes:
+    return b"\x01" + n.to_bytes(7, "big")
+
+
+def _elem(eid: bytes, payload: bytes) -> bytes:
+    return eid + _size_vint(len(payload)) + payload
+
+
+def _atom(index: int) -> bytes:
+    start_ns = index * 30 * 10**9
+    display = _elem(b"\x80", _elem(b"\x85", ("Chapter %04d" % index).encode("utf-8")))
+    return _elem(
+        b"\xb6",
+        _elem(b"\x91", start_ns.to_bytes(8, "big"))
+        + _elem(b"\x92", (start_ns + 29 * 10**9).to_bytes(8, "big"))
+        + display,
+    )
+
+
+def build_mkv_header(chapter_count: int, pad_bytes: int) -> bytes:
+    atoms = b"".join(_atom(i) for i in range(chapter_count))
+    chapters = _elem(b"\x10\x43\xa7\x70", _elem(b"\x45\xb9", atoms))
+    void = _elem(b"\xec", b"\x00" * pad_bytes)
+    ebml = _elem(b"\x1a\x45\xdf\xa3", _elem(b"\x42\x86", b"\x01"))
+    return ebml + _elem(b"\x18\x53\x80\x67", void + chapters)
+
+
+def bench(chapter_count: int, pad_bytes: int, repeat: int):
+    buf = build_mkv_header(chapter_count, pad_bytes)
+    rows = parse_matroska_chapters_from_bytes(buf)
+    assert len(rows) == chapter_count, (len(rows), chapter_count)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        parse_matroska_chapters_from_bytes(buf)
+    mean_ms = (time.perf_counter() - started) * 1000.0 / repeat
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    parse_matroska_chapters_from_bytes(buf)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(buf), mean_ms, peak
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pad-mib", type=float, default=8.0, help="Void padding before Chapters")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    pad_bytes = int(args.pad_mib * 1024 * 1024)
+
+    print("%8s %12s %10s %14s" % ("chapters", "buffer", "mean ms", "peak alloc"))
+    for count in CHAPTER_COUNTS:
+        size, mean_ms, peak = bench(count, pad_bytes, args.repeat)
+        print("%8d %10.1fKiB %10.3f %12.1fKiB" % (count, size / 1024.0, mean_ms, peak / 1024.0))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -271,6 +271,19 @@ def main():
         True,
         en=[("tv_use_online_segment_lookup", "true")],
     )
+    int_setting(
+        g,
+        "tv_prefetch_episode_count",
+        3,
+        "31015",
+        "31016",
+        2,
+        minimum=1,
+        maximum=5,
+        step=1,
+        slider=True,
+        en=[("tv_prefetch_next_episode", "true")],
+    )
 
     # ---- 30001 playback ----
     cat = ET.SubElement(section, "category", id="playback", label="30001")
@@ -592,6 +605,7 @@ def main():
         minimum=0,
         maximum=3600,
     )
+    bool_setting(g, "remote_cache_stale_while_revalidate", 3, "38022", "38023", True)
     bool_setting(g, "pause_during_online_lookup", 1, "38015", "38016", False)
     g = ET.SubElement(cat, "group", id="g_tv1", label="32059")
     bool_setting(g, "tv_use_local_chapter_edl", 0, "32028", "32061", True)
@@ -1049,6 +1063,18 @@ def main():
         enum_a("Errors only|Normal|All detail", "ErrorOnly|Normal|All"),
         en=[("enable_verbose_logging", "true")],
     )
+    bool_setting(
+        g, "buffered_log_sink", 3, "34004", "34005", False, en=[("enable_verbose_logging", "true")]
+    )
+    action_setting(
+        g,
+        "settings_action_dump_log_buffer",
+        3,
+        "34006",
+        "34007",
+        "RunScript(service.skippy,dump_log_buffer)",
+        vis=[("buffered_log_sink", "true")],
+    )
 
     ET.indent(root, space="    ")
     out_path = os.path.join(